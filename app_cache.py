@@ -0,0 +1,15 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# app_cache.py
+import os
+
+# Diretório base dos caches persistentes da aplicação (pode ser alterado pela variável VOXLOG_CACHE_DIR)
+CACHE_ROOT = os.environ.get("VOXLOG_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".voxlog"))
+
+def get_cache_dir(name):
+    """Retorna (criando se necessário) o subdiretório de cache 'name'."""
+    path = os.path.join(CACHE_ROOT, name)
+    os.makedirs(path, exist_ok=True)
+    return path
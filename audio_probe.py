@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# audio_probe.py
+# Informações de um arquivo de áudio obtidas sem decodificá-lo (usadas pela transcrição da
+# interface e pela transcrição em lote).
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def probe_duration(audio_path):
+    """
+    Duração do áudio em segundos, lida do cabeçalho do contêiner (sem decodificar).
+    Se não for possível, estima pelo tamanho do arquivo (~128 kbps).
+    """
+    try:
+        import av
+        with av.open(audio_path) as container:
+            if container.duration:
+                return container.duration / 1_000_000
+    except Exception as e:
+        logger.debug(f"[audio_probe] Não foi possível ler a duração de '{audio_path}': {e}")
+    return os.path.getsize(audio_path) / 16000
@@ -11,9 +11,28 @@ import logging
 from tkinter import messagebox
 
 from utils_instalador import instalar_pacote
+from whisper_model_pool import WhisperModelPool
+import parallel_transcriber
+from output_writers.transcript_writer import StreamingTranscriptWriter
+from file_fingerprint import hash_file_cached
+from transcription_cache import TranscriptionCache, make_settings
+from transcription_checkpoint import CheckpointWriter, load_checkpoint, remove_checkpoint
+import whisper_tuning
+from audio_probe import probe_duration
+from transcription_process import TranscriptionWorkerProcess, TranscriptionCancelled, TranscriptionProcessError
 
 logger = logging.getLogger(__name__)
 
+# Tempo limite da transcrição: no mínimo MIN_TIMEOUT_SECONDS, ou TIMEOUT_REALTIME_FACTOR vezes a duração do áudio
+MIN_TIMEOUT_SECONDS = int(os.environ.get("TRANSCRIPTION_MIN_TIMEOUT_SECONDS", "1200"))
+TIMEOUT_REALTIME_FACTOR = float(os.environ.get("TRANSCRIPTION_TIMEOUT_FACTOR", "3"))
+
+# Transcrições da interface no processo filho (padrão): cancelamento e timeout o encerram na hora,
+# mas o modelo vive no pool do filho e é recarregado depois de cada cancelamento ou queda.
+# Com "0", a interface transcreve no próprio processo, usando model_pool (modelo sempre quente,
+# mas um cancelamento só é atendido entre segmentos).
+ISOLATE_PROCESS = os.environ.get("TRANSCRIPTION_ISOLATE_PROCESS", "1") != "0"
+
 def importar_dependencias():
     try:
         from faster_whisper import WhisperModel
@@ -49,15 +68,139 @@ def importar_dependencias():
 
 WhisperModel, torch = importar_dependencias()
 
+def _load_whisper_model(model_size, device, compute_type, **load_kwargs):
+    return WhisperModel(model_size, device=device, compute_type=compute_type, **load_kwargs)
+
+# Pool de modelos compartilhado pelo processo: transcrições consecutivas reutilizam o modelo já carregado.
+# Na interface só é usado com ISOLATE_PROCESS desativado; com ele ativo, o filho mantém um pool próprio.
+model_pool = WhisperModelPool(_load_whisper_model)
+
+# Processo filho para transcrições isoladas (use_subprocess=True): pode ser encerrado à força em cancelamentos e timeouts.
+transcription_worker = TranscriptionWorkerProcess()
+
+# Cache persistente de transcrições: reprocessar o mesmo áudio com os mesmos parâmetros não decodifica de novo.
+transcription_cache = TranscriptionCache()
+
+def resolve_device(use_gpu):
+    return "cuda" if use_gpu and torch is not None and torch.cuda.is_available() else "cpu"
+
+def preload_model(model_size, use_gpu, compute_type, use_subprocess=False):
+    """
+    Carrega (ou reaproveita) o modelo no pool sem transcrever nada.
+    Usado pela interface para aquecer o modelo enquanto o usuário configura a execução.
+    Com use_subprocess=True, o modelo é carregado no processo filho de transcrição.
+    """
+    if WhisperModel is None or torch is None:
+        return False
+    try:
+        device = resolve_device(use_gpu)
+        compute_type = whisper_tuning.resolve_compute_type(compute_type, device)
+        load_kwargs = whisper_tuning.model_load_kwargs(device)
+        if use_subprocess:
+            transcription_worker.preload(model_size, device, compute_type, load_kwargs)
+        else:
+            model_pool.acquire(model_size, device, compute_type, **load_kwargs)
+            model_pool.release(model_size, device, compute_type, **load_kwargs)
+        return True
+    except Exception as e:
+        logger.warning(f"[audio_transcriber] Falha ao pré-carregar o modelo '{model_size}': {e}")
+        return False
+
+def _join_segments_text(segments):
+    return " ".join(seg["text"] for seg in segments if seg["text"]).strip()
+
+def lookup_cached_transcription(audio_path, model_size, beam_size, compute_type, use_gpu=False):
+    """
+    Consulta o cache de transcrições pelo hash do áudio e pelos parâmetros de decodificação.
+    Retorna o texto transcrito ou None se não houver entrada (ou o arquivo não existir).
+    """
+    if not os.path.exists(audio_path):
+        return None
+    try:
+        compute_type = whisper_tuning.resolve_compute_type(compute_type, resolve_device(use_gpu))
+        segments = transcription_cache.get(hash_file_cached(audio_path), make_settings(model_size, beam_size, compute_type))
+    except Exception as e:
+        logger.warning(f"[audio_transcriber] Falha ao consultar o cache de transcrições: {e}")
+        return None
+    if segments is None:
+        return None
+    return _join_segments_text(segments)
+
+def _segment_record(start, end, text, audio_duration):
+    return {
+        "start": start,
+        "end": end,
+        "text": text.strip(),
+        "progress": (end / audio_duration) * 100 if audio_duration else 100.0,
+        "duration": audio_duration,
+    }
+
+def iter_transcription(audio_path, model_size, use_gpu=False, beam_size=5, compute_type="auto",
+                       start_at=0.0, initial_prompt=None, use_subprocess=False, stop_event=None):
+    """
+    Transcreve o áudio produzindo os segmentos à medida que são decodificados, como dicts
+    {"start", "end", "text", "progress", "duration"} (progress em % da duração do áudio).
+    compute_type="auto" usa o tipo mais rápido para a máquina (ver whisper_tuning).
+    Permite que etapas seguintes (ex: problem_analyzer) consumam a transcrição antes do fim.
+    O modelo é emprestado do pool e devolvido quando o gerador termina ou é fechado.
+    start_at (segundos) pula o início do áudio, para retomar uma transcrição interrompida;
+    initial_prompt é o texto que precede esse ponto, usado como contexto pelo modelo.
+    Com use_subprocess=True, a decodificação roda no processo filho (transcription_process): se
+    stop_event for acionado, o filho é encerrado na hora e TranscriptionCancelled é lançada; se o
+    filho morrer por conta própria, TranscriptionProcessError é lançada com o código de saída.
+    """
+    if WhisperModel is None or torch is None:
+        raise ImportError("Faster Whisper e/ou Torch não estão disponíveis. Não é possível transcrever.")
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"O arquivo de áudio '{audio_path}' não foi encontrado.")
+
+    device = resolve_device(use_gpu)
+    compute_type = whisper_tuning.resolve_compute_type(compute_type, device)
+    load_kwargs = whisper_tuning.model_load_kwargs(device)
+    transcribe_kwargs = {}
+    if start_at > 0:
+        transcribe_kwargs["clip_timestamps"] = [float(start_at)]
+        if initial_prompt:
+            transcribe_kwargs["initial_prompt"] = initial_prompt
+
+    if use_subprocess:
+        for audio_duration, segment in transcription_worker.iter_segments(
+                audio_path, model_size, device, compute_type, beam_size,
+                load_kwargs=load_kwargs, transcribe_kwargs=transcribe_kwargs, stop_event=stop_event):
+            yield _segment_record(segment["start"], segment["end"], segment["text"], audio_duration)
+        return
+
+    with model_pool.borrow(model_size, device, compute_type, **load_kwargs) as model:
+        logger.info(f"[audio_transcriber] Modelo Whisper pronto: {model_size}")
+        segments_generator, info = model.transcribe(audio_path, beam_size=beam_size, **transcribe_kwargs)
+        audio_duration = info.duration
+        logger.info(f"[audio_transcriber] Duração do áudio: {audio_duration:.2f} segundos. Transcrição iniciada.")
+
+        for segment in segments_generator:
+            yield _segment_record(segment.start, segment.end, segment.text, audio_duration)
+
+def transcribe_to_text(audio_path, model_size="small", use_gpu=False, beam_size=5, compute_type="auto"):
+    """
+    Transcrição sem interface (ex: anexos de áudio de um e-mail), com os mesmos ajustes escolhidos
+    na tela: consulta o cache, transcreve se necessário e retorna o texto completo.
+    """
+    cached = lookup_cached_transcription(audio_path, model_size, beam_size, compute_type, use_gpu)
+    if cached is not None:
+        return cached
+    compute_type = whisper_tuning.resolve_compute_type(compute_type, resolve_device(use_gpu))
+    segments = list(iter_transcription(audio_path, model_size, use_gpu, beam_size, compute_type))
+    transcription_cache.put(hash_file_cached(audio_path), make_settings(model_size, beam_size, compute_type), segments)
+    return _join_segments_text(segments)
+
 def _transcribe_worker(audio_path, model_size, use_gpu, output_path,
                       progress_label_callback, progress_bar_callback, stop_event,
-                      result_holder, beam_size, compute_type):
+                      result_holder, beam_size, compute_type, use_subprocess=False):
     try:
         if WhisperModel is None or torch is None:
             logger.error("[audio_transcriber] Dependências ausentes. Não é possível transcrever.")
             raise ImportError("Faster Whisper e/ou Torch não estão disponíveis. Não é possível transcrever.")
 
-        device = "cuda" if use_gpu and torch.cuda.is_available() else "cpu"
+        device = resolve_device(use_gpu)
         logger.info(f"[audio_transcriber] Dispositivo selecionado: {device}")
 
         if use_gpu and not torch.cuda.is_available():
@@ -67,39 +210,136 @@ def _transcribe_worker(audio_path, model_size, use_gpu, output_path,
         logger.info(f"[audio_transcriber] Tipo de computação: {compute_type}")
         logger.info(f"[audio_transcriber] beam_size configurado: {beam_size}")
 
-        model = WhisperModel(model_size, device=device, compute_type=compute_type)
-        logger.info(f"[audio_transcriber] Modelo Whisper carregado: {model_size}")
-
         if not os.path.exists(audio_path):
             messagebox.showerror("Erro de Arquivo", f"O arquivo de áudio '{audio_path}' não foi encontrado.")
             logger.error(f"[audio_transcriber] Arquivo de áudio não encontrado: {audio_path}")
             result_holder["value"] = None
             return
 
-        segments_generator, info = model.transcribe(audio_path, beam_size=beam_size)
-        logger.info(f"[audio_transcriber] Duração do áudio: {info.duration:.2f} segundos. Transcrição iniciada.")
+        # Retoma do checkpoint se uma execução anterior com o mesmo áudio e parâmetros foi interrompida
+        settings = make_settings(model_size, beam_size, compute_type)
+        audio_hash = hash_file_cached(audio_path)
+        previous_segments = load_checkpoint(output_path, audio_hash, settings) or []
+        transcribed_segments = list(previous_segments)
+        resume_at = previous_segments[-1]["end"] if previous_segments else 0.0
+        if resume_at > 0:
+            logger.info(f"[audio_transcriber] Retomando transcrição a partir de {resume_at:.1f}s ({len(previous_segments)} segmentos recuperados).")
+            if progress_label_callback:
+                progress_label_callback(f"Retomando transcrição a partir de {int(resume_at // 60):02}:{int(resume_at % 60):02}...")
 
-        transcribed_text_segments = []
-        audio_duration = info.duration
+        start_time = time.time()
+        segments = iter_transcription(audio_path, model_size, use_gpu, beam_size, compute_type,
+                                      start_at=resume_at,
+                                      initial_prompt=_join_segments_text(previous_segments[-5:]),
+                                      use_subprocess=use_subprocess, stop_event=stop_event)
 
-        for segment in segments_generator:
-            if stop_event and stop_event.is_set():
+        # Cada segmento vai para o disco (saída e checkpoint) assim que é decodificado: um cancelamento,
+        # timeout ou falha preserva a transcrição parcial e permite retomá-la numa nova execução.
+        with StreamingTranscriptWriter(output_path) as writer, \
+                CheckpointWriter(output_path, audio_hash, settings, resume=bool(previous_segments)) as checkpoint:
+            for segment in previous_segments:
+                writer.write_segment(segment["text"])
+            cancelled = False
+            process_error = None
+            try:
+                for segment in segments:
+                    if stop_event and stop_event.is_set():
+                        segments.close()
+                        cancelled = True
+                        break
+
+                    text = segment["text"]
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"[audio_transcriber] Segmento transcrito: start={segment['start']:.2f}, end={segment['end']:.2f}, texto='{text}'")
+                    writer.write_segment(text)
+                    checkpoint.add_segment(segment)
+                    transcribed_segments.append(segment)
+
+                    if progress_label_callback and progress_bar_callback:
+                        progress_percentage = segment["progress"]
+                        progress_bar_callback(progress_percentage)
+                        progress_label_callback(f"Progresso Transcrição: {int(progress_percentage)}%\n[{text}]")
+            except TranscriptionCancelled:
+                cancelled = True
+            except TranscriptionProcessError as e:
+                process_error = e
+
+        if process_error is not None:
+            logger.error(f"[audio_transcriber] {process_error} Transcrição parcial mantida em: {output_path}")
+            messagebox.showerror("Erro de Transcrição",
+                                 f"{process_error}\nA transcrição parcial foi mantida em '{output_path}'.")
+            result_holder["value"] = None
+            return
+
+        if cancelled:
+            # No timeout o aviso é dado por transcribe_audio
+            if not result_holder.get("timed_out"):
                 messagebox.showinfo("Transcrição Cancelada", "A transcrição foi cancelada pelo usuário.")
-                logger.info("[audio_transcriber] Transcrição cancelada pelo usuário (interrupção detectada).")
-                result_holder["value"] = None
-                return
+            logger.info(f"[audio_transcriber] Transcrição cancelada (interrupção detectada). Transcrição parcial mantida em: {output_path}")
+            result_holder["value"] = None
+            return
+
+        remove_checkpoint(output_path)
+        transcription_cache.put(audio_hash, settings, transcribed_segments)
+        if resume_at == 0 and len(transcribed_segments) > 0:
+            whisper_tuning.record_rtf(model_size, compute_type, device,
+                                      transcribed_segments[-1]["duration"], time.time() - start_time)
+        full_transcription = _join_segments_text(transcribed_segments)
+        messagebox.showinfo("Sucesso da Transcrição", f"Transcrição concluída e salva em '{output_path}'")
+        logger.info("[audio_transcriber] Transcrição salva com sucesso.")
+        result_holder["value"] = full_transcription
+
+    except ImportError as ie:
+        logger.error(f"[audio_transcriber] Erro de importação: {ie}. Verifique as dependências.")
+        messagebox.showerror("Erro de Dependência", f"Erro crítico de dependência para transcrição: {ie}. Verifique o log.")
+        result_holder["value"] = None
+    except Exception as e:
+        logger.error(f"[audio_transcriber] Erro inesperado durante transcrição: {e}", exc_info=True)
+        messagebox.showerror("Erro de Transcrição", f"Ocorreu um erro durante a transcrição: {e}")
+        result_holder["value"] = None
+    finally:
+        logger.info("[audio_transcriber] Processo de transcrição (worker) finalizado.")
+
+def _transcribe_parallel_worker(audio_path, model_size, use_gpu, output_path,
+                               progress_label_callback, progress_bar_callback, stop_event,
+                               result_holder, beam_size, compute_type, max_workers):
+    """
+    Variante de _transcribe_worker para gravações longas: divide o áudio em janelas
+    e as transcreve em paralelo em vários processos (ver parallel_transcriber).
+    """
+    try:
+        if WhisperModel is None or torch is None:
+            logger.error("[audio_transcriber] Dependências ausentes. Não é possível transcrever.")
+            raise ImportError("Faster Whisper e/ou Torch não estão disponíveis. Não é possível transcrever.")
 
-            text = segment.text.strip()
-            logger.debug(f"[audio_transcriber] Segmento transcrito: start={segment.start:.2f}, end={segment.end:.2f}, texto='{text}'")
-            transcribed_text_segments.append(text)
+        if not os.path.exists(audio_path):
+            messagebox.showerror("Erro de Arquivo", f"O arquivo de áudio '{audio_path}' não foi encontrado.")
+            logger.error(f"[audio_transcriber] Arquivo de áudio não encontrado: {audio_path}")
+            result_holder["value"] = None
+            return
+
+        device = resolve_device(use_gpu)
+        logger.info(f"[audio_transcriber] Transcrição paralela: dispositivo={device}, compute_type={compute_type}, beam_size={beam_size}")
 
+        def on_progress(progress_percentage, text):
             if progress_label_callback and progress_bar_callback:
-                progress_percentage = (segment.end / audio_duration) * 100
                 progress_bar_callback(progress_percentage)
-                progress_label_callback(f"Progresso Transcrição: {int(progress_percentage)}%\n[{text}]")
-                logger.debug(f"[audio_transcriber] Progresso atualizado para {progress_percentage:.2f}%.")
+                progress_label_callback(f"Progresso Transcrição (paralela): {int(progress_percentage)}%\n[{text}]")
 
-        full_transcription = " ".join(transcribed_text_segments).strip()
+        segments = parallel_transcriber.transcribe_parallel(
+            audio_path, model_size, device, compute_type,
+            beam_size=beam_size, max_workers=max_workers,
+            progress_callback=on_progress, stop_event=stop_event
+        )
+        if segments is None:
+            if not result_holder.get("timed_out"):
+                messagebox.showinfo("Transcrição Cancelada", "A transcrição foi cancelada pelo usuário.")
+            logger.info("[audio_transcriber] Transcrição paralela cancelada.")
+            result_holder["value"] = None
+            return
+
+        transcription_cache.put(hash_file_cached(audio_path), make_settings(model_size, beam_size, compute_type), segments)
+        full_transcription = _join_segments_text(segments)
         logger.info(f"[audio_transcriber] Transcrição completa. Salvando em: {output_path}")
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(full_transcription)
@@ -113,36 +353,75 @@ def _transcribe_worker(audio_path, model_size, use_gpu, output_path,
         messagebox.showerror("Erro de Dependência", f"Erro crítico de dependência para transcrição: {ie}. Verifique o log.")
         result_holder["value"] = None
     except Exception as e:
-        logger.error(f"[audio_transcriber] Erro inesperado durante transcrição: {e}", exc_info=True)
+        logger.error(f"[audio_transcriber] Erro inesperado durante transcrição paralela: {e}", exc_info=True)
         messagebox.showerror("Erro de Transcrição", f"Ocorreu um erro durante a transcrição: {e}")
         result_holder["value"] = None
     finally:
-        logger.info("[audio_transcriber] Processo de transcrição (worker) finalizado.")
+        logger.info("[audio_transcriber] Processo de transcrição paralela (worker) finalizado.")
+
+def scaled_timeout(audio_path):
+    """Tempo limite proporcional à duração do áudio (lida do cabeçalho, sem decodificar)."""
+    try:
+        duration = probe_duration(audio_path)
+    except OSError:
+        return MIN_TIMEOUT_SECONDS
+    return max(MIN_TIMEOUT_SECONDS, int(duration * TIMEOUT_REALTIME_FACTOR))
 
 def transcribe_audio(audio_path, model_size, use_gpu, output_path,
                      progress_label_callback, progress_bar_callback, stop_event,
-                     timeout_seconds=1200, beam_size=5, compute_type="float16"):
+                     timeout_seconds=None, beam_size=5, compute_type="auto",
+                     parallel=False, max_workers=None, isolate_process=False):
     """
     Realiza a transcrição de um arquivo de áudio usando Faster Whisper.
     Parâmetros configuráveis: timeout_seconds, beam_size, compute_type.
+    Sem timeout_seconds, o limite acompanha a duração do áudio (ver scaled_timeout).
+    compute_type="auto" escolhe o tipo mais rápido suportado pela máquina (ex: int8 na CPU).
+    Com parallel=True, o áudio é dividido em janelas (VAD) transcritas em paralelo
+    por até max_workers processos (padrão: número de núcleos).
+    Com isolate_process=True, a decodificação roda num processo filho que é encerrado à força
+    em cancelamento ou timeout, liberando CPU e memória imediatamente.
     """
-    logger.info(f"[audio_transcriber] Iniciando transcrição: arquivo='{audio_path}', modelo='{model_size}', usar_gpu={use_gpu}, timeout={timeout_seconds}s, beam_size={beam_size}, compute_type={compute_type}")
+    compute_type = whisper_tuning.resolve_compute_type(compute_type, resolve_device(use_gpu))
+    if timeout_seconds is None:
+        timeout_seconds = scaled_timeout(audio_path)
+    logger.info(f"[audio_transcriber] Iniciando transcrição: arquivo='{audio_path}', modelo='{model_size}', usar_gpu={use_gpu}, timeout={timeout_seconds}s, beam_size={beam_size}, compute_type={compute_type}, paralela={parallel}")
+    cached_transcription = lookup_cached_transcription(audio_path, model_size, beam_size, compute_type, use_gpu)
+    if cached_transcription is not None:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(cached_transcription)
+        if progress_label_callback and progress_bar_callback:
+            progress_bar_callback(100)
+            progress_label_callback("Transcrição recuperada do cache.")
+        logger.info(f"[audio_transcriber] Transcrição recuperada do cache e salva em: {output_path}")
+        messagebox.showinfo("Sucesso da Transcrição", f"Transcrição recuperada do cache e salva em '{output_path}'")
+        return cached_transcription
+
     result_holder = {"value": None}
-    worker_thread = threading.Thread(
-        target=_transcribe_worker,
-        args=(audio_path, model_size, use_gpu, output_path,
-              progress_label_callback, progress_bar_callback, stop_event, result_holder,
-              beam_size, compute_type),
-        daemon=True
-    )
+    kwargs = {}
+    if parallel:
+        target = _transcribe_parallel_worker
+        args = (audio_path, model_size, use_gpu, output_path,
+                progress_label_callback, progress_bar_callback, stop_event, result_holder,
+                beam_size, compute_type, max_workers)
+    else:
+        target = _transcribe_worker
+        args = (audio_path, model_size, use_gpu, output_path,
+                progress_label_callback, progress_bar_callback, stop_event, result_holder,
+                beam_size, compute_type)
+        if isolate_process:
+            kwargs = {"use_subprocess": True}
+    worker_thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
     start_time = time.time()
     worker_thread.start()
     worker_thread.join(timeout_seconds)
 
     if worker_thread.is_alive():
         logger.error(f"[audio_transcriber] Timeout atingido ({timeout_seconds}s). Encerrando transcrição do arquivo '{audio_path}'.")
+        result_holder["timed_out"] = True
         if stop_event:
             stop_event.set()
+        if isolate_process:
+            transcription_worker.terminate()
         messagebox.showerror(
             "Timeout de Transcrição",
             f"A transcrição excedeu o tempo limite de {timeout_seconds//60} minutos e foi cancelada automaticamente.\n"
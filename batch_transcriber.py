@@ -0,0 +1,217 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# batch_transcriber.py
+# Transcrição em lote de muitos arquivos de áudio (ex: pastas noturnas de gravações de chamadas).
+#
+# Uso:
+#   python batch_transcriber.py "C:\gravacoes\2025-06-01" --output-dir transcricoes --model small
+#   python batch_transcriber.py "gravacoes/**/*.mp3" --workers 4
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from audio_probe import probe_duration
+from file_fingerprint import hash_file_cached
+from output_writers.transcript_writer import StreamingTranscriptWriter
+from text_readers import registry
+from transcription_cache import TranscriptionCache, make_settings
+import whisper_tuning
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTS = tuple(registry.extensions("audio"))
+
+# Modelo carregado uma única vez em cada processo do pool (ver _init_worker)
+_worker_model = None
+
+
+def collect_audio_files(source, recursive=False):
+    """
+    Lista os arquivos de áudio de um diretório ou de um padrão glob (ex: 'gravacoes/**/*.mp3').
+    """
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*") if recursive else os.path.join(source, "*")
+        candidates = glob.glob(pattern, recursive=recursive)
+    else:
+        candidates = glob.glob(source, recursive=True)
+    return sorted(p for p in candidates if os.path.isfile(p) and os.path.splitext(p)[1].lower() in AUDIO_EXTS)
+
+
+def plan_output_paths(files, output_dir):
+    """
+    Caminho do .txt de cada áudio: o caminho relativo à raiz comum dos arquivos é espelhado em
+    output_dir (a/reuniao.wav -> output_dir/a/reuniao.txt), para que nomes iguais em pastas
+    diferentes não se sobrescrevam. Áudios de mesmo nome e extensões diferentes na mesma pasta
+    mantêm a extensão no nome da saída (reuniao.mp3.txt).
+    """
+    if not files:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in files])
+    outputs = {}
+    used = set()
+    for audio_path in files:
+        relative = os.path.relpath(os.path.abspath(audio_path), root)
+        output_path = os.path.join(output_dir, os.path.splitext(relative)[0] + ".txt")
+        if os.path.normcase(output_path) in used:
+            output_path = os.path.join(output_dir, relative + ".txt")
+        used.add(os.path.normcase(output_path))
+        outputs[audio_path] = output_path
+    return outputs
+
+
+def _init_worker(model_size, device, compute_type, cpu_threads):
+    global _worker_model
+    from faster_whisper import WhisperModel
+    _worker_model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _transcribe_file(audio_path, output_path, beam_size):
+    start_time = time.time()
+    segments_generator, info = _worker_model.transcribe(audio_path, beam_size=beam_size)
+    segments = []
+    with StreamingTranscriptWriter(output_path) as writer:
+        for segment in segments_generator:
+            text = segment.text.strip()
+            writer.write_segment(text)
+            segments.append({"start": segment.start, "end": segment.end, "text": text})
+    return {"segments": segments, "duration": info.duration, "elapsed": time.time() - start_time}
+
+
+def default_worker_count():
+    # Cada processo mantém um modelo na memória e usa alguns núcleos; poucos processos com
+    # várias threads rendem mais que um processo por núcleo.
+    cores = whisper_tuning.get_profile()["physical_cores"]
+    return max(1, min(4, cores // 2))
+
+
+def transcribe_batch(source, output_dir, model_size="small", use_gpu=False, beam_size=5, compute_type="auto",
+                     max_workers=None, recursive=False, overwrite=False, cache=None):
+    """
+    Transcreve todos os áudios de 'source' (diretório ou glob), gravando um .txt por arquivo em output_dir
+    (com as subpastas de origem espelhadas, ver plan_output_paths).
+    Os arquivos são distribuídos num pool de processos (cada um com seu modelo carregado),
+    dos mais longos para os mais curtos. Arquivos já transcritos (saída existente) ou presentes
+    no cache de transcrições não ocupam os workers.
+
+    Retorna um resumo com os resultados por arquivo e a vazão agregada em
+    horas de áudio por hora de relógio.
+    """
+    wall_start = time.time()
+    os.makedirs(output_dir, exist_ok=True)
+    device = "cuda" if use_gpu and whisper_tuning.get_profile()["supported_compute_types"].get("cuda") else "cpu"
+    compute_type = whisper_tuning.resolve_compute_type(compute_type, device)
+    settings = make_settings(model_size, beam_size, compute_type)
+    cache = cache if cache is not None else TranscriptionCache()
+
+    files = collect_audio_files(source, recursive)
+    logger.info(f"[batch_transcriber] {len(files)} arquivos de áudio encontrados em '{source}'.")
+
+    output_paths = plan_output_paths(files, output_dir)
+    results = []
+    pending = []
+    for audio_path in files:
+        output_path = output_paths[audio_path]
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if os.path.exists(output_path) and not overwrite:
+            results.append({"audio_path": audio_path, "output_path": output_path, "status": "skipped"})
+            continue
+        cached_segments = cache.get(hash_file_cached(audio_path), settings)
+        if cached_segments is not None:
+            with StreamingTranscriptWriter(output_path) as writer:
+                for seg in cached_segments:
+                    writer.write_segment(seg["text"])
+            results.append({"audio_path": audio_path, "output_path": output_path, "status": "cached"})
+            continue
+        pending.append((probe_duration(audio_path), audio_path, output_path))
+
+    # Mais longos primeiro: o último arquivo a terminar é curto e o pool não fica ocioso no final
+    pending.sort(reverse=True)
+
+    audio_seconds = 0.0
+    if pending:
+        workers = max(1, min(max_workers or default_worker_count(), len(pending)))
+        if device == "cuda":
+            workers = 1
+        cores = whisper_tuning.get_profile()["physical_cores"]
+        cpu_threads = max(1, cores // workers)
+        logger.info(f"[batch_transcriber] Transcrevendo {len(pending)} arquivos com {workers} processos x {cpu_threads} threads (modelo={model_size}, compute_type={compute_type}).")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_size, device, compute_type, cpu_threads)) as executor:
+            futures = {
+                executor.submit(_transcribe_file, audio_path, output_path, beam_size): (audio_path, output_path)
+                for _, audio_path, output_path in pending
+            }
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                audio_path, output_path = futures[future]
+                try:
+                    outcome = future.result()
+                    cache.put(hash_file_cached(audio_path), settings, outcome["segments"])
+                    audio_seconds += outcome["duration"]
+                    results.append({
+                        "audio_path": audio_path, "output_path": output_path, "status": "success",
+                        "duration": outcome["duration"], "elapsed": outcome["elapsed"],
+                    })
+                    logger.info(f"[batch_transcriber] ({done_count}/{len(pending)}) {os.path.basename(audio_path)}: {outcome['duration']:.0f}s de áudio em {outcome['elapsed']:.0f}s.")
+                except Exception as e:
+                    logger.error(f"[batch_transcriber] Falha ao transcrever '{audio_path}': {e}", exc_info=True)
+                    results.append({"audio_path": audio_path, "output_path": output_path, "status": "error", "error": str(e)})
+
+    wall_seconds = time.time() - wall_start
+    summary = {
+        "files": len(files),
+        "transcribed": sum(1 for r in results if r["status"] == "success"),
+        "cached": sum(1 for r in results if r["status"] == "cached"),
+        "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+        "audio_hours": audio_seconds / 3600,
+        "wall_clock_hours": wall_seconds / 3600,
+        "throughput_audio_hours_per_hour": audio_seconds / wall_seconds if wall_seconds > 0 else 0.0,
+        "results": results,
+    }
+    logger.info(
+        f"[batch_transcriber] Lote concluído: {summary['transcribed']} transcritos, {summary['cached']} do cache, "
+        f"{summary['skipped']} ignorados, {summary['errors']} com erro. "
+        f"Vazão: {summary['throughput_audio_hours_per_hour']:.2f} h de áudio por hora."
+    )
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcrição em lote de arquivos de áudio (VoxLog).")
+    parser.add_argument("source", help="Diretório ou padrão glob com os arquivos de áudio")
+    parser.add_argument("--output-dir", default="transcricoes", help="Diretório das transcrições (.txt)")
+    parser.add_argument("--model", default="small", help="Modelo Whisper (tiny, base, small, medium, large)")
+    parser.add_argument("--compute-type", default="auto", help="Tipo de computação (auto, int8, float16, float32)")
+    parser.add_argument("--beam-size", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos (padrão: automático)")
+    parser.add_argument("--gpu", action="store_true", help="Usar GPU (CUDA), se disponível")
+    parser.add_argument("--recursive", action="store_true", help="Incluir subdiretórios")
+    parser.add_argument("--overwrite", action="store_true", help="Refazer arquivos que já possuem transcrição")
+    parser.add_argument("--summary", default=None, help="Salvar o resumo do lote neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    summary = transcribe_batch(
+        args.source, args.output_dir, model_size=args.model, use_gpu=args.gpu, beam_size=args.beam_size,
+        compute_type=args.compute_type, max_workers=args.workers, recursive=args.recursive, overwrite=args.overwrite
+    )
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"Arquivos: {summary['files']} | Transcritos: {summary['transcribed']} | Cache: {summary['cached']} | "
+          f"Ignorados: {summary['skipped']} | Erros: {summary['errors']}")
+    print(f"Áudio: {summary['audio_hours']:.2f} h | Tempo: {summary['wall_clock_hours']:.2f} h | "
+          f"Vazão: {summary['throughput_audio_hours_per_hour']:.2f} h de áudio/h")
+    return 0 if summary["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(processName)s - %(message)s")
+    sys.exit(main())
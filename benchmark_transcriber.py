@@ -0,0 +1,244 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# benchmark_transcriber.py
+# Mede o desempenho do caminho de transcrição (audio_transcriber) em uma matriz de parâmetros.
+#
+# Uso:
+#   python benchmark_transcriber.py --models tiny small --beam-sizes 1 5 --compute-types int8 float32 --duration 120
+#
+# Para cada combinação (fixture x modelo x beam_size x compute_type) é medido, num processo novo:
+#   - tempo de carregamento do modelo
+#   - tempo até o primeiro segmento
+#   - tempo total e RTF (tempo de processamento / duração do áudio)
+#   - pico de memória residente (RSS) do processo
+# Os resultados são gravados em JSON e CSV no diretório de saída.
+import argparse
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import sys
+import time
+import wave
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FIXTURE_KINDS = ("tones", "speech_like", "silence_gaps")
+CSV_FIELDS = [
+    "fixture", "audio_seconds", "model_size", "beam_size", "compute_type", "use_gpu", "status",
+    "model_load_seconds", "time_to_first_segment_seconds", "transcribe_seconds", "rtf",
+    "peak_rss_mb", "segments", "error",
+]
+
+# Intervalo (s) entre verificações de que o processo do caso ainda está vivo enquanto se espera o resultado
+POLL_INTERVAL_SECONDS = 1.0
+
+
+def _speech_like(n_samples, rng):
+    """Ruído com envelope silábico (~4 Hz) e harmônicos de uma frequência fundamental variável."""
+    import numpy as np
+
+    t = np.arange(n_samples) / SAMPLE_RATE
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, 2 * np.pi)), 0, None) ** 2
+    phrases = 0.5 + 0.5 * np.sin(2 * np.pi * 0.3 * t)
+    pitch = 150 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 10))
+    return syllables * phrases * (0.6 * voiced + 0.2 * rng.standard_normal(n_samples))
+
+
+def synthesize_fixture(kind, duration_seconds, seed=0):
+    """Gera o sinal (float32, 16 kHz, mono) de uma fixture sintética."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    n_samples = int(duration_seconds * SAMPLE_RATE)
+    if kind == "tones":
+        t = np.arange(n_samples) / SAMPLE_RATE
+        # sequência de tons de 1 s entre 200 Hz e 2 kHz
+        freqs = 200 + 1800 * rng.random(int(duration_seconds) + 1)
+        signal = np.sin(2 * np.pi * freqs[t.astype(int)] * t)
+    elif kind == "speech_like":
+        signal = _speech_like(n_samples, rng)
+    elif kind == "silence_gaps":
+        signal = np.zeros(n_samples)
+        pos = 0
+        while pos < n_samples:
+            burst = int(rng.uniform(3, 8) * SAMPLE_RATE)
+            end = min(n_samples, pos + burst)
+            signal[pos:end] = _speech_like(end - pos, rng)
+            pos = end + int(rng.uniform(1, 3) * SAMPLE_RATE)
+    else:
+        raise ValueError(f"Tipo de fixture desconhecido: {kind}")
+    peak = float(np.max(np.abs(signal))) or 1.0
+    return (0.5 * signal / peak).astype(np.float32)
+
+
+def write_wav(path, signal):
+    import numpy as np
+
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes())
+
+
+def generate_fixtures(fixtures_dir, duration_seconds, kinds=FIXTURE_KINDS):
+    """Gera (ou reaproveita) os arquivos .wav das fixtures. Retorna {nome: caminho}."""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    fixtures = {}
+    for kind in kinds:
+        path = os.path.join(fixtures_dir, f"{kind}_{int(duration_seconds)}s.wav")
+        if not os.path.exists(path):
+            write_wav(path, synthesize_fixture(kind, duration_seconds))
+            logger.info(f"[benchmark] Fixture gerada: {path}")
+        fixtures[kind] = path
+    return fixtures
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB; macOS em bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _run_case(case, result_queue):
+    """Executa um caso do benchmark; roda em um processo novo para que carga e pico de memória sejam isolados."""
+    result = dict(case, status="ok", error="")
+    try:
+        import audio_transcriber
+
+        start = time.perf_counter()
+        if not audio_transcriber.preload_model(case["model_size"], case["use_gpu"], case["compute_type"]):
+            raise RuntimeError("Não foi possível carregar o modelo.")
+        result["model_load_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        segments = 0
+        for segment in audio_transcriber.iter_transcription(
+                case["audio_path"], case["model_size"], case["use_gpu"], case["beam_size"], case["compute_type"]):
+            if segments == 0:
+                result["time_to_first_segment_seconds"] = time.perf_counter() - start
+            segments += 1
+        result["transcribe_seconds"] = time.perf_counter() - start
+        result["segments"] = segments
+        result["rtf"] = result["transcribe_seconds"] / case["audio_seconds"]
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result_queue.put(result)
+
+
+def _wait_for_result(case, process, result_queue, timeout_seconds, poll_seconds=POLL_INTERVAL_SECONDS):
+    """
+    Espera o resultado do caso em intervalos curtos: se o processo morrer sem publicá-lo (falta de
+    memória, falha nativa), o caso é registrado como "crash" na hora, sem esperar todo o timeout.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return dict(case, status="timeout", error=f"Tempo limite de {timeout_seconds}s excedido.")
+        try:
+            return result_queue.get(timeout=min(poll_seconds, remaining))
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            try:
+                # O resultado pode ter sido publicado logo antes de o processo terminar
+                return result_queue.get(timeout=poll_seconds)
+            except queue.Empty:
+                return dict(case, status="crash",
+                            error=f"O processo do caso terminou sem resultado (código de saída: {process.exitcode}).")
+
+
+def run_benchmark(fixtures, model_sizes, beam_sizes, compute_types, use_gpu=False, timeout_seconds=3600):
+    """Roda todas as combinações da matriz e retorna a lista de resultados."""
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    matrix = list(itertools.product(fixtures.items(), model_sizes, beam_sizes, compute_types))
+    for index, ((fixture, audio_path), model_size, beam_size, compute_type) in enumerate(matrix, start=1):
+        with wave.open(audio_path, "rb") as wav:
+            audio_seconds = wav.getnframes() / wav.getframerate()
+        case = {
+            "fixture": fixture, "audio_path": audio_path, "audio_seconds": audio_seconds,
+            "model_size": model_size, "beam_size": beam_size, "compute_type": compute_type, "use_gpu": use_gpu,
+        }
+        logger.info(f"[benchmark] ({index}/{len(matrix)}) {fixture} | modelo={model_size} beam={beam_size} compute_type={compute_type}")
+        result_queue = ctx.Queue()
+        process = ctx.Process(target=_run_case, args=(case, result_queue))
+        process.start()
+        result = _wait_for_result(case, process, result_queue, timeout_seconds)
+        process.join(5)
+        if process.is_alive():
+            process.terminate()
+        results.append(result)
+        if result["status"] == "ok":
+            logger.info(f"[benchmark]   RTF={result['rtf']:.3f} carga={result['model_load_seconds']:.1f}s "
+                        f"1º segmento={result.get('time_to_first_segment_seconds', float('nan')):.1f}s pico RSS={result['peak_rss_mb']:.0f} MB")
+        else:
+            logger.warning(f"[benchmark]   {result['status']}: {result['error']}")
+    return results
+
+
+def save_results(results, output_dir):
+    """Grava os resultados em benchmark_<data>.json e .csv. Retorna os dois caminhos."""
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d%H%M%S")
+    json_path = os.path.join(output_dir, f"benchmark_{stamp}.json")
+    csv_path = os.path.join(output_dir, f"benchmark_{stamp}.csv")
+    report = {
+        "created_at": stamp,
+        "host": {"platform": platform.platform(), "processor": platform.processor(), "cpu_count": os.cpu_count()},
+        "results": results,
+    }
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    return json_path, csv_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de RTF do caminho de transcrição (VoxLog).")
+    parser.add_argument("--models", nargs="+", default=["tiny", "small"])
+    parser.add_argument("--beam-sizes", nargs="+", type=int, default=[1, 5])
+    parser.add_argument("--compute-types", nargs="+", default=["auto", "int8", "float32"])
+    parser.add_argument("--fixtures", nargs="+", default=list(FIXTURE_KINDS), choices=FIXTURE_KINDS)
+    parser.add_argument("--duration", type=float, default=60, help="Duração de cada fixture em segundos")
+    parser.add_argument("--gpu", action="store_true", help="Usar GPU (CUDA), se disponível")
+    parser.add_argument("--fixtures-dir", default=os.path.join("benchmark_results", "fixtures"))
+    parser.add_argument("--output-dir", default="benchmark_results")
+    args = parser.parse_args(argv)
+
+    fixtures = generate_fixtures(args.fixtures_dir, args.duration, args.fixtures)
+    results = run_benchmark(fixtures, args.models, args.beam_sizes, args.compute_types, use_gpu=args.gpu)
+    json_path, csv_path = save_results(results, args.output_dir)
+    print(f"Resultados salvos em: {json_path} e {csv_path}")
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(main())
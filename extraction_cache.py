@@ -0,0 +1,176 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# extraction_cache.py
+# Cache do texto extraído de documentos (PDF, Word, HTML, ...), para que prévia, processamento
+# e novas execuções sobre o mesmo arquivo não repitam o parser. O nível em disco guarda o texto
+# de documentos possivelmente confidenciais e por isso só é usado se EXTRACTION_CACHE_DISK=1.
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from app_cache import get_cache_dir
+from file_fingerprint import hash_file_cached
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_MAX_MB = int(os.environ.get("EXTRACTION_CACHE_MEMORY_MB", "64"))
+DEFAULT_DISK_MAX_MB = int(os.environ.get("EXTRACTION_CACHE_MAX_MB", "500"))
+DISK_CACHE_ENABLED = os.environ.get("EXTRACTION_CACHE_DISK", "0") == "1"
+
+# Incrementar quando a forma de extrair texto mudar, invalidando as entradas em disco
+EXTRACTOR_VERSION = 5
+
+class ExtractionCache:
+    """
+    Dois níveis:
+    - memória: LRU limitado por tamanho, chaveado por (caminho, tamanho, mtime, hash do conteúdo);
+    - disco (opcional, desligado por padrão): um .txt por documento, chaveado pelo hash do conteúdo,
+      de modo que cópias ou arquivos renomeados também são encontrados. Remoção LRU pelo mtime,
+      como no cache de transcrições.
+    Extrações em andamento são registradas (claim/release): quem pede o mesmo documento enquanto
+    outra thread o extrai espera por ela em vez de rodar o parser de novo.
+    """
+    def __init__(self, memory_max_mb=DEFAULT_MEMORY_MAX_MB, cache_dir=None, disk_max_mb=DEFAULT_DISK_MAX_MB,
+                 use_disk=DISK_CACHE_ENABLED):
+        self.memory_max_chars = memory_max_mb * 1024 * 1024
+        self.disk_max_bytes = disk_max_mb * 1024 * 1024
+        self.cache_dir = (cache_dir or get_cache_dir("extractions")) if use_disk else None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self._memory = OrderedDict()
+        self._memory_chars = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_entry_chars(self):
+        """Documentos maiores que isto não são guardados (evita acumular textos enormes na leitura)."""
+        return self.memory_max_chars // 2
+
+    @staticmethod
+    def make_key(file_path, variant=""):
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, hash_file_cached(file_path), variant)
+
+    @staticmethod
+    def _disk_name(key):
+        ext = os.path.splitext(key[0])[1].lower()
+        payload = f"{key[3]}|{ext}|{EXTRACTOR_VERSION}|{key[4]}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest() + ".txt"
+
+    def get(self, file_path, variant=""):
+        """
+        Retorna o texto extraído em cache ou None. 'variant' distingue extrações do mesmo arquivo
+        com ajustes diferentes (ex: e-mail com áudio anexado transcrito com outro modelo).
+        """
+        key = self.make_key(file_path, variant)
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                return text
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, self._disk_name(key))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[extraction_cache] Entrada de cache ilegível '{path}': {e}. Descartando.")
+            self._remove(path)
+            return None
+        logger.info(f"[extraction_cache] Texto de '{os.path.basename(file_path)}' encontrado no cache em disco.")
+        self._remember(key, text)
+        return text
+
+    def put(self, file_path, text, variant=""):
+        if len(text) > self.max_entry_chars:
+            return
+        key = self.make_key(file_path, variant)
+        self._remember(key, text)
+        if not self.cache_dir:
+            return
+        path = os.path.join(self.cache_dir, self._disk_name(key))
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"[extraction_cache] Não foi possível gravar o cache: {e}")
+            self._remove(tmp_path)
+            return
+        self._evict_disk()
+
+    def claim(self, file_path, variant=""):
+        """
+        Registra a extração de file_path como em andamento. Retorna (chave, None) se coube a quem
+        chamou extrair o documento (que deve chamar release(chave) ao terminar, com ou sem sucesso),
+        ou (chave, evento) se outra thread já o está extraindo; o evento é acionado quando ela terminar.
+        """
+        key = self.make_key(file_path, variant)
+        with self._lock:
+            event = self._in_flight.get(key)
+            if event is not None:
+                return key, event
+            self._in_flight[key] = threading.Event()
+            return key, None
+
+    def release(self, key):
+        with self._lock:
+            event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _remember(self, key, text):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_chars -= len(previous)
+            self._memory[key] = text
+            self._memory_chars += len(text)
+            while self._memory_chars > self.memory_max_chars and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_chars -= len(evicted)
+
+    def _evict_disk(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".txt"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.disk_max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_chars = 0
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".txt"):
+                    self._remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,44 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# file_fingerprint.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+HASH_CHUNK_SIZE = 1024 * 1024
+MAX_MEMOIZED_HASHES = 256
+
+_hash_memo = OrderedDict()
+_hash_memo_lock = threading.Lock()
+
+def hash_file(file_path, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Calcula o hash (BLAKE2b) do conteúdo do arquivo lendo-o em blocos,
+    sem carregar o arquivo inteiro na memória. Retorna a string hexadecimal.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_file_cached(file_path):
+    """
+    Igual a hash_file, mas memoriza o resultado por (caminho, tamanho, mtime):
+    etapas diferentes que precisam do hash do mesmo arquivo o leem do disco uma única vez.
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _hash_memo_lock:
+        if key in _hash_memo:
+            _hash_memo.move_to_end(key)
+            return _hash_memo[key]
+    digest = hash_file(file_path)
+    with _hash_memo_lock:
+        _hash_memo[key] = digest
+        while len(_hash_memo) > MAX_MEMOIZED_HASHES:
+            _hash_memo.popitem(last=False)
+    return digest
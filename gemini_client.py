@@ -0,0 +1,138 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# gemini_client.py
+# Cliente Gemini compartilhado pelo analisador e pelos módulos de solução.
+# A biblioteca é configurada uma única vez (genai.configure descarta as conexões abertas a cada
+# chamada) e cada modelo é criado uma vez por nome: o objeto guarda o cliente da API, cujo canal
+# (gRPC por padrão) permanece aberto entre as chamadas, sem novo handshake TLS a cada pedido.
+# generate_text consulta antes o cache persistente de respostas (response_cache.py) e, na chamada à
+# API, respeita a cota compartilhada e repete erros transitórios (rate_limiter.py).
+import logging
+import os
+import threading
+
+from rate_limiter import RateLimiter, RetryCancelled, call_with_retry
+from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    logger.critical("Erro Fatal: google.generativeai não pôde ser importado. As funções da GEM não funcionarão. Verifique a instalação.")
+    genai = None
+
+DEFAULT_MODEL = os.environ.get("GEMINI_MODEL", "models/gemini-1.5-flash")
+
+# "grpc" (padrão da biblioteca) ou "rest"
+TRANSPORT = os.environ.get("GEMINI_TRANSPORT") or None
+
+# Cota compartilhada por todas as chamadas do processo (0 desativa o limite)
+REQUESTS_PER_MINUTE = int(os.environ.get("GEMINI_REQUESTS_PER_MIN", "15"))
+TOKENS_PER_MINUTE = int(os.environ.get("GEMINI_TOKENS_PER_MIN", "1000000"))
+MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", "5"))
+RETRY_BASE_SECONDS = float(os.environ.get("GEMINI_RETRY_BASE_SECONDS", "2"))
+RETRY_MAX_SECONDS = float(os.environ.get("GEMINI_RETRY_MAX_SECONDS", "60"))
+# Teto para o Retry-After pedido pelo servidor
+RETRY_AFTER_MAX_SECONDS = float(os.environ.get("GEMINI_RETRY_AFTER_MAX_SECONDS", "600"))
+
+rate_limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+
+# Respostas já obtidas para o mesmo modelo, prompt e configuração de geração
+response_cache = ResponseCache()
+
+_lock = threading.Lock()
+_configured = False
+_configured_key = None
+_models = {}
+
+
+class GeminiUnavailableError(RuntimeError):
+    """A biblioteca google.generativeai não está instalada."""
+
+
+def is_available():
+    return genai is not None
+
+
+def configure(api_key=None):
+    """
+    Configura a biblioteca, uma única vez por chave. Sem chave, usa GEMINI_API_KEY (ou
+    GOOGLE_API_KEY); se já configurada, mantém a configuração atual.
+    """
+    global _configured, _configured_key
+    if genai is None:
+        raise GeminiUnavailableError("A biblioteca 'google.generativeai' não está disponível.")
+    with _lock:
+        if _configured and (api_key is None or api_key == _configured_key):
+            return
+        key = api_key or os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+        options = {}
+        if key:
+            options["api_key"] = key
+        if TRANSPORT:
+            options["transport"] = TRANSPORT
+        genai.configure(**options)
+        # Modelos criados com a configuração anterior guardam o cliente antigo
+        _models.clear()
+        _configured = True
+        _configured_key = key
+        logger.info(f"[gemini_client] Cliente Gemini configurado (transporte: {TRANSPORT or 'padrão'}).")
+
+
+def get_model(model_name=DEFAULT_MODEL, api_key=None):
+    """Modelo Gemini compartilhado (criado uma vez por nome e reutilizado entre chamadas e threads)."""
+    configure(api_key)
+    with _lock:
+        model = _models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            _models[model_name] = model
+        return model
+
+
+def generate_content(prompt, model_name=DEFAULT_MODEL, api_key=None, stop_event=None, **kwargs):
+    """
+    Chamada direta ao modelo (sem cache). Cada tentativa aguarda a cota compartilhada (pedidos e
+    tokens por minuto); erros 429/5xx são repetidos com espera exponencial aleatorizada, respeitando
+    o Retry-After (até RETRY_AFTER_MAX_SECONDS). Os demais erros, e os transitórios após MAX_RETRIES,
+    são propagados. Se stop_event for acionado durante a espera pela cota ou por nova tentativa,
+    RetryCancelled é lançada.
+    """
+    model = get_model(model_name, api_key)
+
+    def attempt():
+        rate_limiter.acquire(prompt if isinstance(prompt, str) else str(prompt), stop_event)
+        return model.generate_content(prompt, **kwargs)
+
+    return call_with_retry(attempt, MAX_RETRIES, RETRY_BASE_SECONDS, RETRY_MAX_SECONDS,
+                           description=f"Chamada à GEM ({model_name})", stop_event=stop_event,
+                           max_retry_after=RETRY_AFTER_MAX_SECONDS)
+
+
+def generate_text(prompt, model_name=DEFAULT_MODEL, api_key=None, generation_config=None, use_cache=True,
+                  stop_event=None):
+    """
+    Texto da resposta do modelo ao prompt. Com use_cache (padrão), uma resposta igual já obtida é
+    devolvida sem chamar a API; use_cache=False força uma nova geração (que substitui a do cache).
+    Erros da API nunca vão para o cache.
+    """
+    if use_cache:
+        cached = response_cache.get(model_name, prompt, generation_config)
+        if cached is not None:
+            return cached
+    options = {"generation_config": generation_config} if generation_config else {}
+    text = generate_content(prompt, model_name, api_key, stop_event=stop_event, **options).text
+    response_cache.put(model_name, prompt, text, generation_config)
+    return text
+
+
+def reset():
+    """Descarta a configuração e os modelos (a próxima chamada configura de novo)."""
+    global _configured, _configured_key
+    with _lock:
+        _models.clear()
+        _configured = False
+        _configured_key = None
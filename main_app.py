@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, scrolledtext
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 import os
 import time
@@ -17,43 +18,48 @@ try:
 except ImportError:
     pass
 
-import audio_transcriber
-import problem_analyzer
-import solution_generator
-import text_file_reader
-from utils_instalador import instalar_multiplos_pacotes, DEPENDENCIAS_TEXTO
-
-LOG_FILE = "voxLOG.txt"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(threadName)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Processos filhos criados com "spawn" (páginas de PDF, transcrição paralela e isolada) reimportam
+# este arquivo como __mp_main__. Neles nada do que segue é necessário: os módulos da aplicação (com
+# torch e Whisper), o log em arquivo e a verificação da chave da API ficam só no processo principal.
+_SPAWNED_CHILD = __name__ == "__mp_main__"
+
 logger = logging.getLogger(__name__)
 
 API_KEY = os.environ.get("GEMINI_API_KEY")
 
-if not API_KEY or API_KEY.strip() == "":
-    logger.critical("API Key do Gemini NÃO encontrada. Defina a variável de ambiente GEMINI_API_KEY ou crie um arquivo .env com a linha: GEMINI_API_KEY=SUACHAVEAQUI")
-    messagebox.showerror(
-        "Chave de API não encontrada",
-        "A chave de API do Gemini não foi encontrada!\n\n"
-        "Por favor, crie um arquivo .env na mesma pasta do programa com o conteúdo:\n\n"
-        "GEMINI_API_KEY=SUACHAVEAQUI\n\n"
-        "Ou defina a variável de ambiente GEMINI_API_KEY no seu sistema.\n"
-        "O programa será encerrado."
+if not _SPAWNED_CHILD:
+    import audio_transcriber
+    import gemini_client
+    import problem_analyzer
+    import solution_generator
+    import text_file_reader
+    from progress_channel import ProgressChannel, poll_into_tk
+    from text_readers import registry as text_registry
+    from utils_instalador import instalar_multiplos_pacotes
+
+    LOG_FILE = "voxLOG.txt"
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(threadName)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE, encoding='utf-8'),
+            logging.StreamHandler(sys.stdout)
+        ]
     )
-    sys.exit(1)
-else:
-    logger.info("API Key do Gemini carregada com sucesso de variável de ambiente ou .env.")
-
-instalar_multiplos_pacotes(DEPENDENCIAS_TEXTO)
 
-AUDIO_EXTS = ['.mp3', '.wav', '.m4a', '.flac']
-TEXT_EXTS = ['.txt', '.md', '.doc', '.docx', '.rtf', '.eml', '.pdf', '.html']
+    if not API_KEY or API_KEY.strip() == "":
+        logger.critical("API Key do Gemini NÃO encontrada. Defina a variável de ambiente GEMINI_API_KEY ou crie um arquivo .env com a linha: GEMINI_API_KEY=SUACHAVEAQUI")
+        messagebox.showerror(
+            "Chave de API não encontrada",
+            "A chave de API do Gemini não foi encontrada!\n\n"
+            "Por favor, crie um arquivo .env na mesma pasta do programa com o conteúdo:\n\n"
+            "GEMINI_API_KEY=SUACHAVEAQUI\n\n"
+            "Ou defina a variável de ambiente GEMINI_API_KEY no seu sistema.\n"
+            "O programa será encerrado."
+        )
+        sys.exit(1)
+    else:
+        logger.info("API Key do Gemini carregada com sucesso de variável de ambiente ou .env.")
 
 class TranscriptionApp:
     def __init__(self, master):
@@ -76,9 +82,11 @@ class TranscriptionApp:
         self.text_file_selected = False
 
         self.beam_size_var = tk.IntVar(value=5)
-        self.compute_type_var = tk.StringVar(value="float32")
+        self.compute_type_var = tk.StringVar(value="auto")
+        self.parallel_var = tk.BooleanVar(value=False)
 
         self.stop_transcription_event = threading.Event()
+        self.progress_channel = ProgressChannel()
 
         self.start_time = None
         self.elapsed_seconds = 0
@@ -88,6 +96,23 @@ class TranscriptionApp:
         master.columnconfigure(1, weight=3)
 
         self.create_widgets()
+        poll_into_tk(master, self.progress_channel,
+                     lambda message: self.progress_label.config(text=message),
+                     self.progress_value.set,
+                     apply_dialog=lambda kind, title, message: getattr(messagebox, kind)(title, message))
+        # Depois que a janela aparece: instala o que faltar e pré-carrega os parsers mais usados
+        master.after(500, self.prepare_text_parsers)
+
+    def prepare_text_parsers(self):
+        threading.Thread(target=self._prepare_text_parsers_worker, name="ParserSetup", daemon=True).start()
+
+    def _prepare_text_parsers_worker(self):
+        missing = text_registry.missing_packages()
+        if missing:
+            logger.info(f"Bibliotecas de leitura de documentos ausentes: {missing}. Instalando em segundo plano.")
+            instalar_multiplos_pacotes(missing)
+        loaded = text_registry.prewarm()
+        logger.info(f"Parsers de documentos pré-carregados: {loaded}")
 
     def toggle_cloud_platform_dropdown(self):
         if self.solution_var.get():
@@ -167,7 +192,8 @@ class TranscriptionApp:
         tk.Label(params_frame, text="Beam Size:").pack(side=tk.LEFT, padx=(0,5))
         ttk.Spinbox(params_frame, from_=1, to=10, textvariable=self.beam_size_var, width=5).pack(side=tk.LEFT, padx=(0,12))
         tk.Label(params_frame, text="Compute Type:").pack(side=tk.LEFT, padx=(0,5))
-        ttk.OptionMenu(params_frame, self.compute_type_var, self.compute_type_var.get(), "float16", "int8", "float32").pack(side=tk.LEFT)
+        ttk.OptionMenu(params_frame, self.compute_type_var, self.compute_type_var.get(), "auto", "float16", "int8", "float32").pack(side=tk.LEFT)
+        ttk.Checkbutton(params_frame, text="Paralelo (áudios longos)", variable=self.parallel_var).pack(side=tk.LEFT, padx=(12,0))
         row_idx += 1
 
         tk.Label(self.master, text="").grid(row=row_idx, column=0, columnspan=2)
@@ -260,8 +286,8 @@ class TranscriptionApp:
         self.timer_running = False
 
     def browse_input_file(self):
-        AUDIO_TYPES = [("Áudio", "*.mp3 *.wav *.m4a *.flac")]
-        TEXT_TYPES = [("Texto", "*.txt *.md *.doc *.docx *.rtf *.eml *.pdf *.html")]
+        AUDIO_TYPES = [("Áudio", " ".join(f"*{ext}" for ext in text_registry.extensions("audio")))]
+        TEXT_TYPES = [("Texto", " ".join(f"*{ext}" for ext in text_registry.extensions("text")))]
         ALL_TYPES = AUDIO_TYPES + TEXT_TYPES + [("Todos os Arquivos", "*.*")]
         file_path = filedialog.askopenfilename(
             title="Selecionar Arquivo de Áudio ou Texto",
@@ -269,22 +295,24 @@ class TranscriptionApp:
         )
         if file_path:
             self.input_file_path.set(file_path)
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext in AUDIO_EXTS:
+            # Tipo detectado pelo conteúdo (cabeçalho do arquivo), não só pela extensão
+            kind = text_registry.detect_kind(file_path)
+            if kind == "audio":
                 self.file_type_label_var.set("Áudio")
                 self.text_file_selected = False
                 self.visualizar_link.pack_forget()
                 self.main_button_text.set("Transcrever")
                 self.update_progress_label("Arquivo de áudio detectado e pronto para transcrição.")
-            elif ext in TEXT_EXTS:
+                self.prewarm_whisper_model()
+            elif kind == "text":
                 self.file_type_label_var.set("Texto")
                 self.text_file_selected = True
                 self.visualizar_link.pack(side=tk.RIGHT)
                 self.main_button_text.set("Processar")
                 try:
-                    content = text_file_reader.read_text_file(file_path)
-                    self.text_preview = content[:3000]
+                    self.text_preview = text_file_reader.read_preview(file_path, 3000)
                     self.update_progress_label("Arquivo de texto detectado e pronto para análise/processamento.")
+                    self.prewarm_text_extraction()
                 except Exception as e:
                     self.text_preview = None
                     self.update_progress_label(f"Erro ao ler arquivo de texto para preview: {e}")
@@ -296,16 +324,58 @@ class TranscriptionApp:
                 self.main_button_text.set("Transcrever/Processar")
                 self.update_progress_label("Arquivo selecionado com tipo não suportado.")
 
+    def prewarm_whisper_model(self):
+        """Carrega o modelo Whisper em segundo plano para que a transcrição comece sem esperar o carregamento."""
+        threading.Thread(
+            target=self._prewarm_whisper_model_worker,
+            args=(self.input_file_path.get(), self.model_var.get(), self.gpu_var.get(),
+                  self.beam_size_var.get(), self.compute_type_var.get()),
+            name="WhisperPrewarm",
+            daemon=True
+        ).start()
+
+    def prewarm_text_extraction(self):
+        """
+        Extrai o documento inteiro em segundo plano para o cache, para que 'Processar' não repita o parser.
+        Formatos que dependem dos ajustes de transcrição (e-mails com áudio anexado) não são pré-extraídos:
+        a transcrição dos anexos rodaria escondida, sem possibilidade de cancelamento.
+        """
+        file_path = self.input_file_path.get()
+        spec = text_registry.detect_format(file_path)
+        if spec is None or spec.get("options"):
+            return
+        threading.Thread(
+            target=self._prewarm_text_extraction_worker,
+            args=(file_path,),
+            name="TextExtractionPrewarm",
+            daemon=True
+        ).start()
+
+    def _prewarm_text_extraction_worker(self, file_path):
+        try:
+            for _ in text_file_reader.iter_text_chunks(file_path):
+                pass
+        except Exception as e:
+            logger.warning(f"Pré-extração do documento falhou (será refeita no processamento): {e}")
+
+    def _prewarm_whisper_model_worker(self, audio_path, model_size, use_gpu, beam_size, compute_type):
+        # Se a transcrição já está em cache, o modelo não será necessário
+        if audio_transcriber.lookup_cached_transcription(audio_path, model_size, beam_size, compute_type, use_gpu) is not None:
+            self.update_progress_label("Transcrição deste áudio já disponível em cache.")
+            return
+        audio_transcriber.preload_model(model_size, use_gpu, compute_type,
+                                        use_subprocess=audio_transcriber.ISOLATE_PROCESS)
+
     def suggest_output_filename(self, *args):
         input_path = self.input_file_path.get()
         if input_path:
             base_name = os.path.basename(input_path)
             file_name_without_ext = os.path.splitext(base_name)[0]
             data_str = datetime.now().strftime("%Y%m%d%H%M%S")
-            ext = os.path.splitext(base_name)[1].lower()
-            if ext in AUDIO_EXTS:
+            kind = text_registry.detect_kind(input_path)
+            if kind == "audio":
                 prefix = "Transcrição Áudio"
-            elif ext in TEXT_EXTS:
+            elif kind == "text":
                 prefix = "Transcrição Texto"
             else:
                 prefix = "Transcrição"
@@ -326,10 +396,14 @@ class TranscriptionApp:
             self.output_file_path.set(file_path)
 
     def update_progress_label(self, message):
-        self.master.after(0, lambda: self.progress_label.config(text=message))
+        self.progress_channel.set_label(message)
 
     def update_progress_bar_value(self, value):
-        self.master.after(0, lambda: self.progress_value.set(value))
+        self.progress_channel.set_bar(value)
+
+    def show_dialog(self, kind, title, message):
+        # Pode ser chamada de qualquer thread: o diálogo é aberto pela thread da interface
+        self.progress_channel.post_dialog(kind, title, message)
 
     def clear_input_fields(self):
         self.input_file_path.set("")
@@ -346,8 +420,9 @@ class TranscriptionApp:
 
         input_path = self.input_file_path.get()
         ext = os.path.splitext(input_path)[1].lower()
-        is_audio = ext in AUDIO_EXTS
-        is_text = ext in TEXT_EXTS
+        kind = text_registry.detect_kind(input_path) if input_path else None
+        is_audio = kind == "audio"
+        is_text = kind == "text"
 
         model_size = self.model_var.get()
         use_gpu = self.gpu_var.get()
@@ -358,6 +433,7 @@ class TranscriptionApp:
 
         beam_size = self.beam_size_var.get()
         compute_type = self.compute_type_var.get()
+        parallel = self.parallel_var.get()
 
         if not input_path:
             messagebox.showwarning("Entrada Ausente", "Por favor, selecione um arquivo de entrada (áudio ou texto).")
@@ -395,7 +471,7 @@ class TranscriptionApp:
             args=(input_path, ext, is_audio, is_text, model_size, use_gpu, output_path, generate_analysis_option,
                   generate_solution_option, selected_cloud_platform,
                   self.update_progress_label, self.update_progress_bar_value, self.stop_transcription_event,
-                  self.clear_input_fields, beam_size, compute_type)
+                  self.clear_input_fields, beam_size, compute_type, parallel)
         )
         processing_thread.start()
 
@@ -418,9 +494,50 @@ class TranscriptionApp:
             self.stop_timer()
             logger.info("Thread de processamento finalizada e botões reativados.")
 
+    def _run_analysis_module(self, transcribed_text, output_dir, file_name_without_ext, progress_label_callback,
+                             stop_event=None):
+        # ANÁLISE CONCENTRADA
+        if not transcribed_text or not isinstance(transcribed_text, str) or not transcribed_text.strip():
+            logger.warning("Transcrição ausente ou vazia. Análise não será executada.")
+            progress_label_callback("Transcrição ausente ou vazia. Análise não será executada.")
+            return
+        logger.info(f"Texto transcrito recebido para análise (primeiros 500 chars): {repr(transcribed_text[:500])}")
+        progress_label_callback("Módulo 2/4: Gerando Análise Concentrada (GEM)...")
+        analysis_output = problem_analyzer.analyze_full_text(
+            transcribed_text,
+            progress_callback=lambda done, total: progress_label_callback(
+                f"Módulo 2/4: Análise Concentrada (GEM) - trecho {done}/{total} analisado..."),
+            stop_event=stop_event
+        )
+        if analysis_output:
+            analysis_output_path = os.path.join(output_dir, f"GEM - Análise {file_name_without_ext}.txt")
+            with open(analysis_output_path, "w", encoding="utf-8") as f:
+                f.write(analysis_output)
+            self.show_dialog("showinfo", "Análise Concluída", f"Análise da GEM gerada e salva em '{analysis_output_path}'")
+            logger.info("Análise da GEM salva com sucesso.")
+        else:
+            logger.warning("Análise da GEM não foi gerada ou retornou vazia.")
+
+    def _run_solution_module(self, transcribed_text, selected_cloud_platform, output_dir, file_name_without_ext,
+                             progress_label_callback, stop_event=None):
+        # MÓDULO SOLUÇÃO TÉCNICA
+        progress_label_callback("Módulo 3/4: Gerando Proposta de Solução (GEM)...")
+        solution_text, plantuml_diagrams, terraform_files = solution_generator.generate_solution(
+            transcribed_text, selected_cloud_platform, API_KEY, output_dir, file_name_without_ext,
+            stop_event=stop_event
+        )
+        if solution_text:
+            self.show_dialog("showinfo", "Proposta de Solução Gerada",
+                             f"A proposta de solução principal (texto) para {selected_cloud_platform} foi gerada e salva com sucesso. "
+                             "Verifique também os arquivos PlantUML e Terraform.")
+            logger.info(f"Proposta de Solução principal (texto) gerada e salva para {selected_cloud_platform}.")
+        else:
+            logger.warning(f"Solução técnica da GEM para {selected_cloud_platform} não foi gerada ou retornou vazia.")
+
     def _run_all_modules(self, input_path, ext, is_audio, is_text, model_size, use_gpu, output_path, generate_analysis_option,
                          generate_solution_option, selected_cloud_platform,
-                         progress_label_callback, progress_bar_callback, stop_event, clear_fields_callback, beam_size, compute_type):
+                         progress_label_callback, progress_bar_callback, stop_event, clear_fields_callback, beam_size, compute_type,
+                         parallel=False):
         transcribed_text = None
         base_name = os.path.basename(output_path)
         file_name_without_ext = os.path.splitext(base_name)[0]
@@ -437,9 +554,10 @@ class TranscriptionApp:
                     progress_label_callback,
                     progress_bar_callback,
                     stop_event,
-                    timeout_seconds=1200,
                     beam_size=beam_size,
-                    compute_type=compute_type
+                    compute_type=compute_type,
+                    parallel=parallel,
+                    isolate_process=audio_transcriber.ISOLATE_PROCESS
                 )
                 if transcribed_text is None:
                     logger.info("Transcrição não concluída. Abortando processos subsequentes.")
@@ -448,9 +566,18 @@ class TranscriptionApp:
             elif is_text:
                 progress_label_callback("Módulo 1/4: Lendo arquivo de texto...")
                 try:
-                    transcribed_text = text_file_reader.read_text_file(input_path)
+                    # Cópia em blocos: o arquivo de saída é gravado à medida que o documento é lido
+                    chunks = []
                     with open(output_path, "w", encoding="utf-8") as f:
-                        f.write(transcribed_text)
+                        transcription = {"model_size": model_size, "use_gpu": use_gpu,
+                                         "beam_size": beam_size, "compute_type": compute_type}
+                        for chunk in text_file_reader.iter_text_chunks(input_path, transcription=transcription,
+                                                                       stop_event=stop_event):
+                            if stop_event.is_set():
+                                break
+                            f.write(chunk)
+                            chunks.append(chunk)
+                    transcribed_text = "".join(chunks)
                     logger.info(f"Arquivo de texto salvo em {output_path}")
                     progress_label_callback("Arquivo de texto lido e salvo com sucesso.")
                 except Exception as e:
@@ -463,41 +590,48 @@ class TranscriptionApp:
                 self.stop_timer()
                 return
 
-            # ANÁLISE CONCENTRADA
-            if generate_analysis_option:
-                if not transcribed_text or not isinstance(transcribed_text, str) or not transcribed_text.strip():
-                    logger.warning("Transcrição ausente ou vazia. Análise não será executada.")
-                    progress_label_callback("Transcrição ausente ou vazia. Análise não será executada.")
-                else:
-                    logger.info(f"Texto transcrito recebido para análise (primeiros 500 chars): {repr(transcribed_text[:500])}")
-                    progress_label_callback("Módulo 2/4: Gerando Análise Concentrada (GEM)...")
-                    analysis_output = problem_analyzer.analyze_full_text(transcribed_text)
-                    if analysis_output:
-                        analysis_output_path = os.path.join(output_dir, f"GEM - Análise {file_name_without_ext}.txt")
-                        with open(analysis_output_path, "w", encoding="utf-8") as f:
-                            f.write(analysis_output)
-                        messagebox.showinfo("Análise Concluída", f"Análise da GEM gerada e salva em '{analysis_output_path}'")
-                        logger.info("Análise da GEM salva com sucesso.")
-                    else:
-                        logger.warning("Análise da GEM não foi gerada ou retornou vazia.")
-            else:
-                logger.info("Opção 'Gerar Análise' não selecionada. Pulando Módulo de Análise.")
+            # MÓDULOS GEM: análise e solução partem da mesma transcrição e não dependem uma da outra,
+            # então as duas chamadas rodam ao mesmo tempo; cada resultado é gravado assim que chega
+            if stop_event.is_set():
+                logger.info("Cancelamento solicitado. Módulos da GEM não serão executados.")
+                return
 
-            # MÓDULO SOLUÇÃO TÉCNICA
-            if generate_solution_option:
-                progress_label_callback("Módulo 3/4: Gerando Proposta de Solução (GEM)...")
-                solution_text, plantuml_diagrams, terraform_files = solution_generator.generate_solution(
-                    transcribed_text, selected_cloud_platform, API_KEY, output_dir, file_name_without_ext
-                )
-                if solution_text:
-                    messagebox.showinfo("Proposta de Solução Gerada",
-                                       f"A proposta de solução principal (texto) para {selected_cloud_platform} foi gerada e salva com sucesso. "
-                                       "Verifique também os arquivos PlantUML e Terraform.")
-                    logger.info(f"Proposta de Solução principal (texto) gerada e salva para {selected_cloud_platform}.")
+            # Cada módulo publica sua própria linha de progresso; o rótulo mostra as duas juntas
+            module_status = {}
+            status_lock = threading.Lock()
+
+            def module_label_callback(module_name):
+                def update(message):
+                    with status_lock:
+                        module_status[module_name] = message
+                        combined = "\n".join(module_status.values())
+                    progress_label_callback(combined)
+                return update
+
+            gem_tasks = {}
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="GEM") as executor:
+                if generate_analysis_option:
+                    gem_tasks[executor.submit(self._run_analysis_module, transcribed_text, output_dir,
+                                              file_name_without_ext, module_label_callback("Análise"),
+                                              stop_event)] = "Análise"
                 else:
-                    logger.warning(f"Solução técnica da GEM para {selected_cloud_platform} não foi gerada ou retornou vazia.")
-            else:
-                logger.info("Opção 'Gerar Solução' não selecionada. Pulando Módulo de Solução.")
+                    logger.info("Opção 'Gerar Análise' não selecionada. Pulando Módulo de Análise.")
+                if generate_solution_option:
+                    gem_tasks[executor.submit(self._run_solution_module, transcribed_text, selected_cloud_platform,
+                                              output_dir, file_name_without_ext, module_label_callback("Solução"),
+                                              stop_event)] = "Solução"
+                else:
+                    logger.info("Opção 'Gerar Solução' não selecionada. Pulando Módulo de Solução.")
+                for future in as_completed(gem_tasks):
+                    try:
+                        future.result()
+                    except gemini_client.RetryCancelled:
+                        logger.info(f"Módulo de {gem_tasks[future]} da GEM cancelado pelo usuário.")
+                    except Exception as e:
+                        # Falha de um módulo não interrompe o outro
+                        logger.error(f"Erro no módulo de {gem_tasks[future]} da GEM: {e}", exc_info=True)
+                        self.show_dialog("showerror", f"Erro no Módulo de {gem_tasks[future]}",
+                                         f"Ocorreu um erro ao gerar a {gem_tasks[future].lower()} da GEM: {e}")
 
         except Exception as e:
             logger.error(f"Ocorreu um erro crítico no processo modular: {e}", exc_info=True)
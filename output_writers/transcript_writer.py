@@ -0,0 +1,77 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+class StreamingTranscriptWriter:
+    """
+    Grava os segmentos da transcrição no arquivo de saída à medida que chegam.
+    O buffer é descarregado a cada segmento e um fsync é feito periodicamente,
+    de modo que um cancelamento, timeout ou queda preserva tudo o que já foi transcrito.
+
+    Uso:
+        with StreamingTranscriptWriter(output_path) as writer:
+            for segment in segments:
+                writer.write_segment(segment["text"])
+    """
+    def __init__(self, output_path: str, fsync_interval_seconds: float = 5.0, fsync_every_segments: int = 50,
+                 separator: str = " "):
+        self.output_path = output_path
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.fsync_every_segments = fsync_every_segments
+        self.separator = separator
+        self.segments_written = 0
+        self._needs_separator = False
+        self._file = None
+        self._pending_since_sync = 0
+        self._last_sync = 0.0
+
+    def open(self):
+        self._file = open(self.output_path, "w", encoding="utf-8")
+        self._needs_separator = False
+        self._last_sync = time.time()
+        logger.info(f"[Transcript Writer] Gravação incremental iniciada em: {self.output_path}")
+        return self
+
+    def write_segment(self, text: str):
+        """Acrescenta um segmento ao arquivo. Segmentos vazios são ignorados."""
+        if not text:
+            return
+        if self._needs_separator:
+            self._file.write(self.separator)
+        self._file.write(text)
+        self._needs_separator = True
+        self._file.flush()
+        self.segments_written += 1
+        self._pending_since_sync += 1
+        if (self._pending_since_sync >= self.fsync_every_segments
+                or time.time() - self._last_sync >= self.fsync_interval_seconds):
+            self.sync()
+
+    def sync(self):
+        """Força a gravação em disco do que já foi escrito."""
+        if self._file is None or self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending_since_sync = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        if self._file is None or self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+        logger.info(f"[Transcript Writer] {self.segments_written} segmentos gravados em: {self.output_path}")
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
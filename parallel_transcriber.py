@@ -0,0 +1,245 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# parallel_transcriber.py
+# Transcrição de gravações longas em janelas sobrepostas, processadas em paralelo por vários processos.
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+DEFAULT_WINDOW_SECONDS = 300
+DEFAULT_OVERLAP_SECONDS = 5.0
+
+# Janelas enviadas ao pool além das em execução: só essas fatias de áudio ficam serializadas na fila
+MAX_PENDING_PER_WORKER = int(os.environ.get("PARALLEL_MAX_PENDING_PER_WORKER", "2"))
+
+# Parâmetros da detecção de silêncio por energia (usada quando o VAD do faster-whisper não está disponível)
+ENERGY_FRAME_SECONDS = 0.03
+ENERGY_THRESHOLD_RATIO = 0.1
+MIN_SILENCE_SECONDS = 0.5
+
+# Modelo carregado uma única vez em cada processo do pool (ver _init_worker)
+_worker_model = None
+
+
+def detect_speech_regions(audio):
+    """
+    Retorna a lista de trechos com fala [(inicio_s, fim_s), ...].
+    Usa o VAD Silero embutido no faster-whisper; na falta dele, usa detecção de silêncio por energia.
+    """
+    try:
+        from faster_whisper.vad import get_speech_timestamps, VadOptions
+        timestamps = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+        return [(t["start"] / SAMPLE_RATE, t["end"] / SAMPLE_RATE) for t in timestamps]
+    except Exception as e:
+        logger.warning(f"[parallel_transcriber] VAD indisponível ({e}). Usando detecção de silêncio por energia.")
+        return _detect_speech_by_energy(audio)
+
+
+def _detect_speech_by_energy(audio):
+    import numpy as np
+
+    frame = int(ENERGY_FRAME_SECONDS * SAMPLE_RATE)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+    rms = np.sqrt(np.mean(np.square(audio[:n_frames * frame].reshape(n_frames, frame)), axis=1))
+    threshold = max(float(np.percentile(rms, 95)) * ENERGY_THRESHOLD_RATIO, 1e-4)
+    voiced = rms > threshold
+
+    regions = []
+    start = None
+    silence_frames = 0
+    min_silence_frames = int(MIN_SILENCE_SECONDS / ENERGY_FRAME_SECONDS)
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced:
+            if start is None:
+                start = i
+            silence_frames = 0
+        elif start is not None:
+            silence_frames += 1
+            if silence_frames >= min_silence_frames:
+                regions.append((start * ENERGY_FRAME_SECONDS, (i - silence_frames + 1) * ENERGY_FRAME_SECONDS))
+                start = None
+                silence_frames = 0
+    if start is not None:
+        regions.append((start * ENERGY_FRAME_SECONDS, (n_frames - silence_frames) * ENERGY_FRAME_SECONDS))
+    return regions
+
+
+def plan_windows(speech_regions, duration, window_seconds=DEFAULT_WINDOW_SECONDS, overlap_seconds=DEFAULT_OVERLAP_SECONDS):
+    """
+    Divide o áudio em janelas de até window_seconds, cortando preferencialmente no meio dos silêncios.
+    Trechos de fala maiores que a janela são cortados à força.
+
+    Retorna uma lista de dicts com:
+        core_start/core_end: intervalo pelo qual a janela é "dona" dos segmentos (sem sobreposição)
+        start/end: intervalo efetivamente transcrito (core + overlap_seconds de cada lado)
+    """
+    if not speech_regions:
+        # Sem fala detectada: janelas fixas sobre o áudio inteiro
+        speech_regions = [(0.0, duration)]
+    cuts = [0.0]
+    window_start = 0.0
+    previous_end = 0.0
+    for region_start, region_end in speech_regions:
+        if region_end - window_start > window_seconds and region_start > window_start:
+            # corta no meio do silêncio anterior a este trecho
+            cut = (previous_end + region_start) / 2 if previous_end > window_start else region_start
+            cuts.append(cut)
+            window_start = cut
+        while region_end - window_start > window_seconds:
+            window_start += window_seconds
+            cuts.append(window_start)
+        previous_end = region_end
+    cuts.append(duration)
+
+    windows = []
+    for core_start, core_end in zip(cuts, cuts[1:]):
+        if core_end - core_start <= 0:
+            continue
+        windows.append({
+            "core_start": core_start,
+            "core_end": core_end,
+            "start": max(0.0, core_start - overlap_seconds),
+            "end": min(duration, core_end + overlap_seconds),
+        })
+    # Janelas sem nenhum trecho de fala não precisam ser transcritas
+    return [w for w in windows if any(s < w["end"] and e > w["start"] for s, e in speech_regions)]
+
+
+def _normalize_text(text):
+    return re.sub(r"\W+", " ", text.lower()).strip()
+
+
+def stitch_segments(window_results):
+    """
+    Une os segmentos de todas as janelas em ordem de tempo.
+    Cada segmento é mantido apenas pela janela que contém seu ponto médio no intervalo core,
+    eliminando as duplicatas geradas pela sobreposição; repetições literais adjacentes também são descartadas.
+    """
+    kept = []
+    for window, segments in window_results:
+        for seg in segments:
+            midpoint = (seg["start"] + seg["end"]) / 2
+            if window["core_start"] <= midpoint < window["core_end"]:
+                kept.append(seg)
+    kept.sort(key=lambda s: (s["start"], s["end"]))
+
+    stitched = []
+    for seg in kept:
+        if stitched:
+            last = stitched[-1]
+            if seg["start"] < last["end"] and _normalize_text(seg["text"]) == _normalize_text(last["text"]):
+                continue
+        stitched.append(seg)
+    return stitched
+
+
+def _init_worker(model_size, device, compute_type, cpu_threads):
+    global _worker_model
+    from faster_whisper import WhisperModel
+    _worker_model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _transcribe_window(audio_slice, offset, beam_size, language):
+    segments, _ = _worker_model.transcribe(audio_slice, beam_size=beam_size, language=language)
+    return [
+        {"start": seg.start + offset, "end": seg.end + offset, "text": seg.text.strip()}
+        for seg in segments
+    ]
+
+
+def default_worker_count(device="cpu"):
+    # Na GPU, vários processos disputariam a mesma memória de vídeo
+    if device == "cuda":
+        return 1
+    return max(1, min(os.cpu_count() or 1, 8))
+
+
+def _terminate_workers(executor):
+    """Encerra à força os processos do pool (shutdown não interrompe uma janela em decodificação)."""
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except Exception as e:
+            logger.warning(f"[parallel_transcriber] Não foi possível encerrar o processo {process.pid}: {e}")
+
+
+def transcribe_parallel(audio_path, model_size, device, compute_type, beam_size=5, language=None,
+                        max_workers=None, window_seconds=DEFAULT_WINDOW_SECONDS,
+                        overlap_seconds=DEFAULT_OVERLAP_SECONDS, progress_callback=None, stop_event=None):
+    """
+    Transcreve o áudio dividindo-o em janelas sobrepostas (via VAD) e distribuindo-as em um ProcessPoolExecutor.
+    Retorna a lista de segmentos [{"start", "end", "text"}] em ordem, ou None se cancelado.
+    progress_callback(percentual, texto) é chamado a cada janela concluída.
+    """
+    from faster_whisper import decode_audio
+
+    audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+    duration = len(audio) / SAMPLE_RATE
+    speech_regions = detect_speech_regions(audio)
+    windows = plan_windows(speech_regions, duration, window_seconds, overlap_seconds)
+
+    max_workers = max_workers or default_worker_count(device)
+    max_workers = max(1, min(max_workers, len(windows) or 1))
+    cpu_threads = max(1, (os.cpu_count() or 1) // max_workers)
+    logger.info(f"[parallel_transcriber] Duração: {duration:.1f}s, {len(speech_regions)} trechos de fala, {len(windows)} janelas, {max_workers} processos x {cpu_threads} threads.")
+
+    start_time = time.time()
+    results = []
+    done_seconds = 0.0
+    planned_seconds = sum(w["core_end"] - w["core_start"] for w in windows)
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(model_size, device, compute_type, cpu_threads)
+    )
+    finished = False
+    try:
+        # Janelas mais longas primeiro, para que a última a terminar seja curta. Apenas
+        # MAX_PENDING_PER_WORKER janelas por processo são enviadas de cada vez: as fatias de
+        # áudio são copiadas e serializadas só quando há um processo prestes a recebê-las.
+        queue = sorted(windows, key=lambda w: w["end"] - w["start"])      # pop() tira a mais longa
+        max_pending = max_workers * max(1, MAX_PENDING_PER_WORKER)
+        pending = {}
+
+        def submit_next():
+            while queue and len(pending) < max_pending:
+                window = queue.pop()
+                audio_slice = audio[int(window["start"] * SAMPLE_RATE):int(window["end"] * SAMPLE_RATE)]
+                future = executor.submit(_transcribe_window, audio_slice, window["start"], beam_size, language)
+                pending[future] = window
+
+        submit_next()
+        while pending:
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            if stop_event is not None and stop_event.is_set():
+                logger.info("[parallel_transcriber] Cancelamento detectado. Encerrando os processos do pool.")
+                return None
+            for future in done:
+                window = pending.pop(future)
+                segments = future.result()
+                results.append((window, segments))
+                done_seconds += window["core_end"] - window["core_start"]
+                if progress_callback and planned_seconds > 0:
+                    last_text = segments[-1]["text"] if segments else ""
+                    progress_callback(min(100.0, done_seconds / planned_seconds * 100), last_text)
+            submit_next()
+        finished = True
+    finally:
+        del audio
+        if not finished:
+            _terminate_workers(executor)
+        executor.shutdown(wait=finished, cancel_futures=True)
+
+    stitched = stitch_segments(results)
+    elapsed = time.time() - start_time
+    logger.info(f"[parallel_transcriber] {len(stitched)} segmentos em {elapsed:.1f}s (RTF={elapsed / duration if duration else 0:.3f}).")
+    return stitched
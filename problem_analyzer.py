@@ -4,7 +4,21 @@
 
 import logging
 import os
-import google.generativeai as genai
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import gemini_client
+
+# Transcrições maiores que CHUNK_CHARS são analisadas em trechos (map) e consolidadas (reduce)
+CHUNK_CHARS = int(os.environ.get("ANALYZER_CHUNK_CHARS", "60000"))
+# Contexto repetido do fim de um trecho no início do seguinte
+CHUNK_OVERLAP_CHARS = int(os.environ.get("ANALYZER_CHUNK_OVERLAP", "2000"))
+# Chamadas simultâneas ao Gemini durante a análise dos trechos
+MAX_CONCURRENT_CHUNKS = int(os.environ.get("ANALYZER_MAX_WORKERS", "4"))
+
+# Fronteiras preferidas para dividir o texto: parágrafo > linha (segmento) > frase > palavra
+_BOUNDARIES = (re.compile(r"\n\s*\n"), re.compile(r"\n"), re.compile(r"(?<=[.!?…])\s+"), re.compile(r"\s+"))
 
 def load_prompt_analyzer():
     PROMPT_ANALYZER_PATH = os.environ.get("PROMPT_ANALYZER_PATH", "prompt_analyzer.txt")
@@ -16,6 +30,16 @@ def load_prompt_analyzer():
         logging.error(f"Erro ao carregar o prompt do analisador: {e}")
         return None
 
+def load_prompt_reducer():
+    PROMPT_REDUCER_PATH = os.environ.get("PROMPT_REDUCER_PATH", "prompt_analyzer_reduce.txt")
+    logging.info(f"Carregando prompt de consolidação do caminho: {PROMPT_REDUCER_PATH}")
+    try:
+        with open(PROMPT_REDUCER_PATH, "r", encoding="utf-8") as f:
+            return f.read()
+    except Exception as e:
+        logging.error(f"Erro ao carregar o prompt de consolidação: {e}")
+        return None
+
 def is_valid_model_name(model_name):
     modelos_validos = [
         "models/gemini-1.5-flash",
@@ -35,9 +59,112 @@ def is_valid_model_name(model_name):
         return True
     return False
 
-def analyze_full_text(transcription, model="models/gemini-1.5-flash"):
+def _split_units(text, limit, level=0):
+    """Divide o texto em unidades de até 'limit' caracteres, cortando na fronteira mais forte possível."""
+    if len(text) <= limit:
+        return [text]
+    if level >= len(_BOUNDARIES):
+        return [text[i:i + limit] for i in range(0, len(text), limit)]
+    units = []
+    pos = 0
+    for match in _BOUNDARIES[level].finditer(text):
+        units.append(text[pos:match.end()])
+        pos = match.end()
+    units.append(text[pos:])
+    result = []
+    for unit in units:
+        if unit:
+            result.extend(_split_units(unit, limit, level + 1) if len(unit) > limit else [unit])
+    return result
+
+def split_transcription(text, chunk_chars=CHUNK_CHARS, overlap_chars=CHUNK_OVERLAP_CHARS):
+    """
+    Divide a transcrição em trechos de até chunk_chars caracteres, em fronteiras de parágrafo,
+    linha ou frase. Cada trecho começa com as últimas unidades do anterior (até overlap_chars),
+    para que assuntos divididos entre dois trechos não percam o contexto.
+    """
+    overlap_chars = max(0, min(overlap_chars, chunk_chars // 2))
+    units = _split_units(text, max(1, chunk_chars - overlap_chars))
+    chunks = []
+    current = []
+    size = 0
+    for unit in units:
+        if current and size + len(unit) > chunk_chars:
+            chunks.append("".join(current).strip())
+            tail = []
+            tail_size = 0
+            for previous in reversed(current):
+                if tail_size + len(previous) > overlap_chars:
+                    break
+                tail.insert(0, previous)
+                tail_size += len(previous)
+            current, size = tail, tail_size
+        current.append(unit)
+        size += len(unit)
+    if current:
+        chunks.append("".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+def _generate(model, prompt, use_cache=True, stop_event=None):
+    """Uma chamada ao Gemini no formato dos resultados de extract_joined_text (cancelamentos são propagados)."""
+    try:
+        return {"status": "success",
+                "text": gemini_client.generate_text(prompt, model, use_cache=use_cache, stop_event=stop_event)}
+    except gemini_client.RetryCancelled:
+        raise
+    except Exception as e:
+        logging.error(f"Erro na chamada ao Gemini: {e}")
+        return {"status": "error", "error": str(e)}
+
+def analyze_chunks(chunks, prompt_analyzer, model, max_workers=MAX_CONCURRENT_CHUNKS, progress_callback=None,
+                   use_cache=True, stop_event=None):
+    """
+    Etapa map: analisa cada trecho em paralelo (no máximo max_workers chamadas simultâneas).
+    Retorna {"results": [...]} na ordem dos trechos, com "status" e "text"/"error" em cada item.
+    progress_callback(concluídos, total) recebe quantos trechos já terminaram, em qualquer ordem.
+    """
+    total = len(chunks)
+    done = 0
+    done_lock = threading.Lock()
+
+    def analyze(index):
+        header = f"[Trecho {index + 1} de {total} da transcrição]\n"
+        result = _generate(model, prompt_analyzer.replace("{transcricao}", header + chunks[index]), use_cache,
+                           stop_event)
+        result["chunk"] = index + 1
+        logging.info(f"Trecho {index + 1}/{total} analisado: {result['status']}")
+        if progress_callback:
+            nonlocal done
+            with done_lock:
+                done += 1
+                progress_callback(done, total)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total)), thread_name_prefix="AnalyzerChunk") as executor:
+        return {"results": list(executor.map(analyze, range(total)))}
+
+def reduce_analyses(result_struct, model, use_cache=True, stop_event=None):
+    """Etapa reduce: consolida as análises parciais numa análise única da transcrição inteira."""
+    joined = extract_joined_text(result_struct)
+    prompt_reducer = load_prompt_reducer()
+    if not prompt_reducer:
+        logging.warning("Prompt de consolidação indisponível. Retornando as análises parciais concatenadas.")
+        return joined
+    result = _generate(model, prompt_reducer.replace("{analises}", joined), use_cache, stop_event)
+    if result["status"] == "error":
+        logging.warning("Falha na consolidação. Retornando as análises parciais concatenadas.")
+        return joined
+    return result["text"]
+
+def analyze_full_text(transcription, model=gemini_client.DEFAULT_MODEL, chunk_chars=CHUNK_CHARS,
+                      overlap_chars=CHUNK_OVERLAP_CHARS, max_workers=MAX_CONCURRENT_CHUNKS, progress_callback=None,
+                      use_cache=True, stop_event=None):
     """
     Analisa a transcrição completa usando IA Gemini e retorna a análise única e concentrada.
+    Transcrições maiores que chunk_chars são divididas em trechos analisados em paralelo e
+    consolidados numa chamada final; progress_callback(concluídos, total) acompanha os trechos.
+    use_cache=False ignora as respostas guardadas em cache e força uma nova análise.
+    Se stop_event for acionado enquanto uma chamada espera nova tentativa, RetryCancelled é propagada.
     """
     logging.info(f"Modelo Gemini solicitado: {repr(model)}")
     if not is_valid_model_name(model):
@@ -51,20 +178,27 @@ def analyze_full_text(transcription, model="models/gemini-1.5-flash"):
         logging.error("Transcrição inválida para análise do problema.")
         return "Erro: Transcrição inválida para análise do problema."
 
+    if len(transcription) > chunk_chars:
+        chunks = split_transcription(transcription, chunk_chars, overlap_chars)
+        logging.info(f"Transcrição com {len(transcription)} caracteres: análise em {len(chunks)} trechos.")
+        result_struct = analyze_chunks(chunks, prompt_analyzer, model, max_workers, progress_callback, use_cache,
+                                       stop_event)
+        if not any(r["status"] in ("success", "warning") for r in result_struct["results"]):
+            error = result_struct["results"][0].get("error", "")
+            return f"Erro ao analisar o texto completo: {error}"
+        analysis = reduce_analyses(result_struct, model, use_cache, stop_event)
+        logging.info("Análise concentrada (por trechos) processada com sucesso.")
+        return analysis
+
     prompt = prompt_analyzer.replace("{transcricao}", transcription)
     logging.info(f"Prompt enviado ao Gemini (primeiros 300 chars): {prompt[:300]!r}")
 
-    try:
-        response = genai.GenerativeModel(model).generate_content(prompt)
-        if hasattr(response, "text"):
-            logging.info("Análise concentrada processada com sucesso.")
-            return response.text
-        else:
-            logging.warning("Resposta da IA sem campo .text.")
-            return str(response)
-    except Exception as e:
-        logging.error(f"Erro ao analisar o texto completo: {e}")
-        return f"Erro ao analisar o texto completo: {str(e)}"
+    result = _generate(model, prompt, use_cache, stop_event)
+    if result["status"] == "error":
+        logging.error(f"Erro ao analisar o texto completo: {result['error']}")
+        return f"Erro ao analisar o texto completo: {result['error']}"
+    logging.info("Análise concentrada processada com sucesso.")
+    return result["text"]
 
 def extract_joined_text(result_struct, error_placeholder="<<ERRO AO ANALISAR TRECHO>>"):
     if not isinstance(result_struct, dict):
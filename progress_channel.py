@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# progress_channel.py
+import collections
+import threading
+
+# Taxa de atualização da interface (quadros por segundo)
+DEFAULT_FPS = 10
+
+class ProgressChannel:
+    """
+    Canal de progresso entre as threads de trabalho e a interface Tk.
+    As threads publicam quantas atualizações quiserem; o canal guarda apenas o valor mais
+    recente de cada campo (texto e barra). A interface consome o canal em um único
+    'after' periódico, de modo que o custo na fila de eventos do Tk é constante,
+    independentemente da quantidade de segmentos por segundo.
+    Diálogos (messagebox) pedidos pelas threads também passam pelo canal, em fila: o Tk não é
+    thread-safe e eles só podem ser abertos na thread da interface.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._label = None
+        self._bar = None
+        self._dialogs = collections.deque()
+
+    def set_label(self, message):
+        """Publica um novo texto de progresso (substitui o anterior ainda não exibido)."""
+        with self._lock:
+            self._label = message
+
+    def set_bar(self, value):
+        """Publica um novo valor da barra de progresso (substitui o anterior ainda não exibido)."""
+        with self._lock:
+            self._bar = value
+
+    def post_dialog(self, kind, title, message):
+        """Enfileira um diálogo (kind: nome da função do messagebox, ex: "showinfo")."""
+        with self._lock:
+            self._dialogs.append((kind, title, message))
+
+    def next_dialog(self):
+        """Retorna o próximo diálogo pendente (kind, título, mensagem) ou None."""
+        with self._lock:
+            return self._dialogs.popleft() if self._dialogs else None
+
+    def drain(self):
+        """Retorna (texto, valor_barra) pendentes e limpa o canal. Campos sem atualização vêm como None."""
+        with self._lock:
+            label, bar = self._label, self._bar
+            self._label = None
+            self._bar = None
+        return label, bar
+
+def poll_into_tk(master, channel, apply_label, apply_bar, fps=DEFAULT_FPS, apply_dialog=None):
+    """
+    Agenda no Tk a leitura periódica do canal (fps vezes por segundo), aplicando apenas
+    os valores mais recentes. Deve ser chamada na thread da interface.
+    Com apply_dialog(kind, título, mensagem), os diálogos enfileirados são abertos um de cada vez;
+    o progresso continua sendo atualizado enquanto um diálogo modal está aberto.
+    """
+    interval_ms = max(1, int(1000 / fps))
+    showing_dialog = False
+
+    def poll():
+        nonlocal showing_dialog
+        label, bar = channel.drain()
+        if label is not None:
+            apply_label(label)
+        if bar is not None:
+            apply_bar(bar)
+        master.after(interval_ms, poll)
+        if apply_dialog is None or showing_dialog:
+            return
+        dialog = channel.next_dialog()
+        if dialog is not None:
+            showing_dialog = True
+            try:
+                apply_dialog(*dialog)
+            finally:
+                showing_dialog = False
+
+    master.after(interval_ms, poll)
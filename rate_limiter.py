@@ -0,0 +1,176 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# rate_limiter.py
+# Controle de cota das chamadas à GEM: baldes de fichas (token bucket) para pedidos por minuto e
+# tokens por minuto, compartilhados por todas as threads do processo, e novas tentativas com espera
+# exponencial aleatorizada (jitter) para erros transitórios (429 e 5xx), respeitando o Retry-After.
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Estimativa usada no balde de tokens (a contagem exata exigiria outra chamada à API)
+CHARS_PER_TOKEN = 4
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Maior espera aceita de um Retry-After: um valor absurdo (ex: 86400) não prende uma thread por um dia
+MAX_RETRY_AFTER_SECONDS = 600
+
+# Nomes das exceções do google.api_core para os mesmos casos (o código nem sempre está disponível)
+_RETRYABLE_NAMES = {
+    "TooManyRequests", "ResourceExhausted", "InternalServerError", "ServiceUnavailable",
+    "BadGateway", "GatewayTimeout", "DeadlineExceeded", "RequestTimeout",
+}
+
+_RETRY_DELAY_PATTERNS = (
+    re.compile(r"retry[_ ]delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE),
+    re.compile(r"retry (?:in|after) ([\d.]+)\s*s", re.IGNORECASE),
+)
+
+
+class RetryCancelled(Exception):
+    """A espera pela cota ou por uma nova tentativa foi interrompida pelo stop_event (cancelamento pelo usuário)."""
+
+
+class TokenBucket:
+    """
+    Balde com capacidade 'capacity' reabastecido continuamente a 'rate_per_minute' fichas por minuto.
+    acquire(n) bloqueia até haver n fichas; pedidos maiores que a capacidade esperam o balde cheio.
+    Com stop_event, a espera termina assim que ele é acionado, com RetryCancelled.
+    """
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1, stop_event=None):
+        """Retira 'amount' fichas, esperando o reabastecimento se preciso. Retorna o tempo esperado."""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                wait = (amount - self._tokens) / self.rate
+            if stop_event is None:
+                self._sleep(wait)
+            elif stop_event.wait(wait):
+                raise RetryCancelled("Espera pela cota de chamadas à GEM cancelada.")
+            waited += wait
+
+
+class RateLimiter:
+    """Limite conjunto de pedidos por minuto e tokens (estimados) por minuto."""
+
+    def __init__(self, requests_per_minute, tokens_per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.requests = TokenBucket(requests_per_minute, clock=clock, sleep=sleep) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep) if tokens_per_minute > 0 else None
+
+    def acquire(self, prompt="", stop_event=None):
+        waited = 0.0
+        if self.requests:
+            waited += self.requests.acquire(1, stop_event)
+        if self.tokens:
+            waited += self.tokens.acquire(estimate_tokens(prompt), stop_event)
+        if waited:
+            logger.info(f"[rate_limiter] Chamada à GEM aguardou {waited:.1f}s pela cota.")
+        return waited
+
+
+def estimate_tokens(text):
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+def _status_code(exc):
+    code = getattr(exc, "code", None)
+    if callable(code):           # erros gRPC: code() retorna um StatusCode
+        return None
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc):
+    """Erros transitórios: limite de cota (429), falhas do servidor (5xx) e tempo esgotado."""
+    code = _status_code(exc)
+    if code is not None:
+        return code in RETRYABLE_STATUS
+    return any(cls.__name__ in _RETRYABLE_NAMES for cls in type(exc).__mro__)
+
+
+def retry_after_seconds(exc):
+    """Espera pedida pelo servidor: cabeçalho Retry-After, RetryInfo do gRPC ou o texto do erro."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass     # formato de data HTTP: ignorado, vale o backoff
+    for detail in getattr(exc, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return getattr(delay, "seconds", 0) + getattr(delay, "nanos", 0) / 1e9
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(str(exc))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt, base_delay, max_delay, retry_after=None, max_retry_after=MAX_RETRY_AFTER_SECONDS):
+    """
+    Espera antes da tentativa attempt+1: exponencial com jitter completo (limitada a max_delay), ou
+    pelo menos o Retry-After pedido pelo servidor (+ jitter), que só é encurtado acima de max_retry_after.
+    """
+    if retry_after is not None:
+        if retry_after > max_retry_after:
+            logger.warning(f"[rate_limiter] Retry-After de {retry_after:.0f}s acima do limite; "
+                           f"aguardando {max_retry_after:.0f}s.")
+            retry_after = max_retry_after
+        return retry_after + random.uniform(0, base_delay)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(func, max_retries, base_delay, max_delay, sleep=None, description="chamada", stop_event=None,
+                    max_retry_after=MAX_RETRY_AFTER_SECONDS):
+    """
+    Executa func(); erros transitórios são repetidos até max_retries vezes, os demais propagados.
+    Com stop_event, a espera entre tentativas termina assim que ele é acionado, com RetryCancelled.
+    """
+    sleep = sleep or time.sleep
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay, retry_after_seconds(e), max_retry_after)
+            attempt += 1
+            logger.warning(f"[rate_limiter] {description} falhou ({e.__class__.__name__}: {e}). "
+                           f"Tentativa {attempt}/{max_retries} em {delay:.1f}s.")
+            if stop_event is None:
+                sleep(delay)
+            elif stop_event.wait(delay):
+                raise RetryCancelled(f"{description} cancelada durante a espera para nova tentativa.") from e
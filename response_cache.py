@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# response_cache.py
+# Cache persistente das respostas da GEM, endereçado pelo modelo, pelo prompt (normalizado) e pela
+# configuração de geração. Refazer a análise ou a solução de uma mesma transcrição não repete a chamada.
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+
+from app_cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_MB = int(os.environ.get("LLM_CACHE_MAX_MB", "100"))
+# Respostas mais antigas que isso são descartadas (o modelo publicado por trás do nome muda com o tempo)
+DEFAULT_TTL_HOURS = float(os.environ.get("LLM_CACHE_TTL_HOURS", str(7 * 24)))
+CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") != "0"
+CACHE_VERSION = 1
+
+def normalize_prompt(prompt):
+    """Forma canônica do prompt: Unicode NFC, quebras de linha \\n e sem espaços no fim das linhas."""
+    text = unicodedata.normalize("NFC", prompt).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip()
+
+def prompt_hash(prompt):
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Guarda o texto de cada resposta em um arquivo JSON por chave, onde
+    chave = hash(modelo + hash do prompt normalizado + configuração de geração).
+    Entradas com mais de ttl_hours são descartadas na leitura; o uso mais recente é registrado no
+    mtime do arquivo e, quando o tamanho total passa de max_size_mb, as usadas há mais tempo são removidas.
+    """
+    def __init__(self, cache_dir=None, max_size_mb=DEFAULT_MAX_SIZE_MB, ttl_hours=DEFAULT_TTL_HOURS, enabled=CACHE_ENABLED):
+        self.enabled = enabled
+        self.cache_dir = cache_dir or get_cache_dir("llm_responses")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model, prompt, generation_config=None):
+        payload = json.dumps({
+            "model": model,
+            "prompt_hash": prompt_hash(prompt),
+            "generation_config": generation_config or {},
+            "version": CACHE_VERSION,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, model, prompt, generation_config=None):
+        """Retorna o texto da resposta em cache ou None."""
+        if not self.enabled:
+            return None
+        path = self._entry_path(self.make_key(model, prompt, generation_config))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[response_cache] Entrada de cache corrompida '{path}': {e}. Descartando.")
+            self._remove(path)
+            return None
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            logger.info(f"[response_cache] Resposta em cache expirada: {os.path.basename(path)[:12]}...")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        logger.info(f"[response_cache] Resposta da GEM encontrada em cache ({model}, {len(entry['text'])} caracteres).")
+        return entry["text"]
+
+    def put(self, model, prompt, text, generation_config=None):
+        if not self.enabled or not text:
+            return
+        key = self.make_key(model, prompt, generation_config)
+        path = self._entry_path(key)
+        entry = {
+            "version": CACHE_VERSION,
+            "model": model,
+            "generation_config": generation_config or {},
+            "created_at": time.time(),
+            "text": text,
+        }
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+            logger.info(f"[response_cache] Resposta armazenada em cache: {key[:12]}...")
+        except Exception as e:
+            logger.warning(f"[response_cache] Não foi possível gravar o cache: {e}")
+            self._remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                logger.info(f"[response_cache] Entrada removida por limite de tamanho (LRU): {os.path.basename(path)}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.cache_dir, name))
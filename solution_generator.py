@@ -7,6 +7,8 @@ import os
 import re
 from tkinter import messagebox
 
+import gemini_client
+
 # Importar os módulos específicos de geração de solução (azu, aws, gcp)
 try:
     from solution_modules import solution_generator_azu
@@ -93,7 +95,8 @@ def parse_solution_output(gem_output):
     return solution_text, plantuml_diagrams, terraform_files
 
 
-def generate_solution(transcription_text, cloud_platform, api_key, output_dir, file_name_without_ext):
+def generate_solution(transcription_text, cloud_platform, api_key, output_dir, file_name_without_ext, use_cache=True,
+                      stop_event=None):
     """
     Orquestra a geração da solução técnica para a plataforma cloud selecionada,
     chamando a GEM e os módulos de escrita de saída.
@@ -104,6 +107,9 @@ def generate_solution(transcription_text, cloud_platform, api_key, output_dir, f
         api_key (str): A chave da API do Google Gemini.
         output_dir (str): Diretório base para salvar os arquivos gerados.
         file_name_without_ext (str): Nome base do arquivo de áudio original para naming.
+        use_cache (bool): Se False, ignora a resposta da GEM guardada em cache e gera uma nova.
+        stop_event (threading.Event): Se acionado durante a espera por nova tentativa da GEM,
+               a geração é interrompida com gemini_client.RetryCancelled.
 
     Returns:
         tuple: (texto_solucao_principal, dict_plantuml_diagrams, dict_terraform_files)
@@ -151,7 +157,8 @@ def generate_solution(transcription_text, cloud_platform, api_key, output_dir, f
 
         # 2. Chamar a API da GEM usando a função específica
         logger.info(f"[Módulo Solução] Chamando a GEM para gerar a solução ({cloud_platform})...")
-        full_gem_solution_output = gem_caller_func(full_gem_prompt, "Geração de Solução", api_key)
+        full_gem_solution_output = gem_caller_func(full_gem_prompt, "Geração de Solução", api_key, use_cache=use_cache,
+                                                   stop_event=stop_event)
         
         if not full_gem_solution_output:
             logger.warning(f"[Módulo Solução] A GEM não retornou conteúdo para a solução em {cloud_platform}.")
@@ -188,6 +195,8 @@ def generate_solution(transcription_text, cloud_platform, api_key, output_dir, f
         logger.info(f"[Módulo Solução] Geração de solução para {cloud_platform} concluída.")
         return solution_text, plantuml_diagrams, terraform_files
 
+    except gemini_client.RetryCancelled:
+        raise
     except Exception as e:
         logger.error(f"[Módulo Solução] Ocorreu um erro durante a geração da solução: {e}", exc_info=True)
         messagebox.showerror("Erro na Geração de Solução", f"Ocorreu um erro ao gerar a solução técnica: {e}")
@@ -4,16 +4,10 @@
 
 import logging
 from tkinter import messagebox
-import google.generativeai as genai # Importar diretamente
 
-logger = logging.getLogger(__name__)
+import gemini_client
 
-# Tenta importar google.generativeai globalmente, essencial para a GEM
-try:
-    import google.generativeai as genai
-except ImportError:
-    logger.critical("Erro Fatal: google.generativeai não pôde ser importado. A geração de solução GCP não funcionará. Verifique a instalação.")
-    genai = None
+logger = logging.getLogger(__name__)
 
 def get_solution_prompt_gcp(transcription_text):
     """
@@ -180,25 +174,26 @@ def get_solution_prompt_gcp(transcription_text):
 
     return full_prompt
 
-def call_gemini_api_gcp(prompt_text, prompt_purpose, api_key):
+def call_gemini_api_gcp(prompt_text, prompt_purpose, api_key, use_cache=True, stop_event=None):
     """
     Chama o modelo Gemini com o texto do prompt fornecido, específico para GCP.
     """
     logger.info(f"[Módulo Solução GCP] Chamando o modelo Gemini para: {prompt_purpose}.")
-    if genai is None:
+    if not gemini_client.is_available():
         messagebox.showerror("Erro de Dependência", "A biblioteca 'google.generativeai' não está disponível. Não é possível gerar a solução GCP.")
         logger.error("google.generativeai não carregado. Geração de solução GCP abortada.")
         return None
 
-    genai.configure(api_key=api_key)
-
     try:
-        model = genai.GenerativeModel('models/gemini-1.5-flash')
         logger.debug(f"[Módulo Solução GCP] Prompt enviado para Gemini (primeiros 200 chars): {prompt_text[:200]}...")
         
-        response = model.generate_content(prompt_text)
+        # Cliente compartilhado; uma resposta idêntica já obtida vem do cache (use_cache=False força nova geração)
+        response_text = gemini_client.generate_text(prompt_text, 'models/gemini-1.5-flash', api_key, use_cache=use_cache,
+                                                    stop_event=stop_event)
         logger.info(f"[Módulo Solução GCP] Resposta da GEM para {prompt_purpose} recebida com sucesso.")
-        return response.text
+        return response_text
+    except gemini_client.RetryCancelled:
+        raise
     except Exception as e:
         logger.error(f"[Módulo Solução GCP] Erro ao chamar a API da GEM para {prompt_purpose}: {e}", exc_info=True)
         messagebox.showerror(f"Erro na GEM de Solução GCP", f"Não foi possível obter a resposta da GEM: {e}")
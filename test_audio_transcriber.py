@@ -5,8 +5,12 @@
 import unittest
 from unittest import mock
 import threading
+import os
+import tempfile
 
 import audio_transcriber
+import whisper_tuning
+from transcription_cache import TranscriptionCache
 
 class TestAudioTranscriber(unittest.TestCase):
 
@@ -15,6 +19,22 @@ class TestAudioTranscriber(unittest.TestCase):
         self.progress_label_callback = mock.Mock()
         self.progress_bar_callback = mock.Mock()
         self.stop_event = threading.Event()
+        # Garante que modelos (mocks) de um teste não sejam reaproveitados pelo pool em outro
+        audio_transcriber.model_pool.clear()
+        # Cache de transcrições isolado por teste
+        self.cache_dir = tempfile.TemporaryDirectory()
+        cache_patcher = mock.patch.object(audio_transcriber, "transcription_cache",
+                                          TranscriptionCache(self.cache_dir.name))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.addCleanup(self.cache_dir.cleanup)
+        # Perfil de desempenho isolado: os fatores de tempo real dos mocks não vão para o perfil real
+        profile_patcher = mock.patch.object(whisper_tuning, "_profile_path",
+                                            return_value=os.path.join(self.cache_dir.name, "whisper_profile.json"))
+        profile_patcher.start()
+        self.addCleanup(profile_patcher.stop)
+        whisper_tuning._profile = None
+        self.addCleanup(setattr, whisper_tuning, "_profile", None)
 
     def test_audio_file_not_found(self):
         # Simula transcrição de arquivo inexistente
@@ -138,5 +158,226 @@ class TestAudioTranscriber(unittest.TestCase):
         self.assertIn("Primeira parte.", result)
         self.assertIn("Segunda parte.", result)
 
+    @mock.patch("audio_transcriber.messagebox")
+    @mock.patch("audio_transcriber.WhisperModel")
+    @mock.patch("audio_transcriber.torch")
+    def test_partial_transcript_kept_on_cancel(self, mock_torch, mock_WhisperModel, mock_messagebox):
+        # Simula cancelamento no meio da transcrição: o que já foi transcrito deve estar no arquivo de saída
+        mock_torch.cuda.is_available.return_value = False
+        stop_event = self.stop_event
+
+        class DummyModel:
+            def transcribe(self, audio_path, beam_size):
+                class DummyInfo:
+                    duration = 10.0
+                def segments_gen():
+                    class Seg:
+                        def __init__(self, start, end, text):
+                            self.start = start
+                            self.end = end
+                            self.text = text
+                    yield Seg(0, 5, "Primeira parte.")
+                    stop_event.set()
+                    yield Seg(5, 10, "Segunda parte.")
+                return segments_gen(), DummyInfo()
+
+        mock_WhisperModel.return_value = DummyModel()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audio_path = os.path.join(tmp_dir, "audio.wav")
+            output_path = os.path.join(tmp_dir, "saida.txt")
+            open(audio_path, "wb").close()
+            result = audio_transcriber.transcribe_audio(
+                audio_path=audio_path,
+                model_size="small",
+                use_gpu=False,
+                output_path=output_path,
+                progress_label_callback=self.progress_label_callback,
+                progress_bar_callback=self.progress_bar_callback,
+                stop_event=stop_event,
+                timeout_seconds=5,
+                beam_size=5,
+                compute_type="float16"
+            )
+            with open(output_path, encoding="utf-8") as f:
+                partial = f.read()
+        self.assertIsNone(result, "Deve retornar None se a transcrição for cancelada.")
+        self.assertEqual(partial, "Primeira parte.")
+
+    @mock.patch("audio_transcriber.transcription_worker")
+    @mock.patch("audio_transcriber.messagebox")
+    @mock.patch("audio_transcriber.WhisperModel")
+    @mock.patch("audio_transcriber.torch")
+    def test_isolated_process_cancel(self, mock_torch, mock_WhisperModel, mock_messagebox, mock_worker):
+        # Com isolate_process=True os segmentos vêm do processo filho; o cancelamento o encerra
+        mock_torch.cuda.is_available.return_value = False
+
+        def iter_segments(*args, **kwargs):
+            yield 10.0, {"start": 0, "end": 5, "text": " Primeira parte."}
+            raise audio_transcriber.TranscriptionCancelled("Transcrição cancelada.")
+
+        mock_worker.iter_segments.side_effect = iter_segments
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audio_path = os.path.join(tmp_dir, "audio.wav")
+            output_path = os.path.join(tmp_dir, "saida.txt")
+            open(audio_path, "wb").close()
+            result = audio_transcriber.transcribe_audio(
+                audio_path=audio_path,
+                model_size="small",
+                use_gpu=False,
+                output_path=output_path,
+                progress_label_callback=self.progress_label_callback,
+                progress_bar_callback=self.progress_bar_callback,
+                stop_event=self.stop_event,
+                timeout_seconds=5,
+                beam_size=5,
+                compute_type="float16",
+                isolate_process=True
+            )
+            with open(output_path, encoding="utf-8") as f:
+                partial = f.read()
+        self.assertIsNone(result, "Deve retornar None se a transcrição for cancelada.")
+        self.assertEqual(partial, "Primeira parte.")
+        self.assertIs(mock_worker.iter_segments.call_args.kwargs["stop_event"], self.stop_event)
+        mock_WhisperModel.assert_not_called()
+
+    @mock.patch("audio_transcriber.transcription_worker")
+    @mock.patch("audio_transcriber.messagebox")
+    @mock.patch("audio_transcriber.WhisperModel")
+    @mock.patch("audio_transcriber.torch")
+    def test_isolated_process_crash_is_an_error(self, mock_torch, mock_WhisperModel, mock_messagebox, mock_worker):
+        # Queda do processo filho não é cancelamento: deve ser informada como erro, com o código de saída
+        mock_torch.cuda.is_available.return_value = False
+
+        def iter_segments(*args, **kwargs):
+            yield 10.0, {"start": 0, "end": 5, "text": " Primeira parte."}
+            raise audio_transcriber.TranscriptionProcessError(-9)
+
+        mock_worker.iter_segments.side_effect = iter_segments
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audio_path = os.path.join(tmp_dir, "audio.wav")
+            open(audio_path, "wb").close()
+            result = audio_transcriber.transcribe_audio(
+                audio_path=audio_path,
+                model_size="small",
+                use_gpu=False,
+                output_path=os.path.join(tmp_dir, "saida.txt"),
+                progress_label_callback=self.progress_label_callback,
+                progress_bar_callback=self.progress_bar_callback,
+                stop_event=self.stop_event,
+                timeout_seconds=5,
+                beam_size=5,
+                compute_type="float16",
+                isolate_process=True
+            )
+        self.assertIsNone(result)
+        mock_messagebox.showinfo.assert_not_called()
+        mock_messagebox.showerror.assert_called_once()
+        self.assertIn("-9", mock_messagebox.showerror.call_args.args[1])
+
+    def test_cancel_while_worker_busy_with_preload(self):
+        # A pré-carga do modelo ocupa o processo filho: o cancelamento não espera o fim do carregamento
+        worker = audio_transcriber.TranscriptionWorkerProcess()
+        worker._lock.acquire()
+        self.addCleanup(worker._lock.release)
+        self.stop_event.set()
+        segments = worker.iter_segments("audio.wav", "small", "cpu", "int8", 5, stop_event=self.stop_event)
+        with self.assertRaises(audio_transcriber.TranscriptionCancelled):
+            next(segments)
+        self.assertIsNone(worker._process)
+
+    @mock.patch("audio_transcriber.messagebox")
+    @mock.patch("audio_transcriber.WhisperModel")
+    @mock.patch("audio_transcriber.torch")
+    def test_resume_from_checkpoint(self, mock_torch, mock_WhisperModel, mock_messagebox):
+        # Primeira execução é cancelada após um segmento; a segunda deve continuar do ponto salvo
+        mock_torch.cuda.is_available.return_value = False
+        stop_event = self.stop_event
+        calls = []
+
+        class DummyModel:
+            def transcribe(self, audio_path, beam_size, **kwargs):
+                calls.append(kwargs)
+                class DummyInfo:
+                    duration = 10.0
+                class Seg:
+                    def __init__(self, start, end, text):
+                        self.start = start
+                        self.end = end
+                        self.text = text
+                def segments_gen():
+                    if "clip_timestamps" not in kwargs:
+                        yield Seg(0, 5, "Primeira parte.")
+                        stop_event.set()
+                    yield Seg(5, 10, "Segunda parte.")
+                return segments_gen(), DummyInfo()
+
+        mock_WhisperModel.return_value = DummyModel()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audio_path = os.path.join(tmp_dir, "audio.wav")
+            output_path = os.path.join(tmp_dir, "saida.txt")
+            with open(audio_path, "wb") as f:
+                f.write(b"audio")
+            kwargs = dict(
+                audio_path=audio_path, model_size="small", use_gpu=False, output_path=output_path,
+                progress_label_callback=self.progress_label_callback,
+                progress_bar_callback=self.progress_bar_callback,
+                stop_event=stop_event, timeout_seconds=5, beam_size=5, compute_type="float16"
+            )
+            self.assertIsNone(audio_transcriber.transcribe_audio(**kwargs))
+            self.assertTrue(os.path.exists(output_path + ".checkpoint.jsonl"))
+
+            stop_event.clear()
+            result = audio_transcriber.transcribe_audio(**kwargs)
+            with open(output_path, encoding="utf-8") as f:
+                saved = f.read()
+            checkpoint_left = os.path.exists(output_path + ".checkpoint.jsonl")
+
+        self.assertEqual(calls[1]["clip_timestamps"], [5.0])
+        self.assertEqual(result, "Primeira parte. Segunda parte.")
+        self.assertEqual(saved, "Primeira parte. Segunda parte.")
+        self.assertFalse(checkpoint_left, "Checkpoint deve ser removido ao concluir a transcrição.")
+
+    @mock.patch("audio_transcriber.messagebox")
+    @mock.patch("audio_transcriber.WhisperModel")
+    @mock.patch("audio_transcriber.torch")
+    def test_cached_transcription_skips_model(self, mock_torch, mock_WhisperModel, mock_messagebox):
+        # A segunda transcrição do mesmo áudio com os mesmos parâmetros deve vir do cache
+        mock_torch.cuda.is_available.return_value = False
+
+        class DummyModel:
+            def transcribe(self, audio_path, beam_size):
+                class DummyInfo:
+                    duration = 4.0
+                class Seg:
+                    start, end, text = 0, 4, " Texto em cache. "
+                return iter([Seg()]), DummyInfo()
+
+        mock_WhisperModel.return_value = DummyModel()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audio_path = os.path.join(tmp_dir, "audio.wav")
+            with open(audio_path, "wb") as f:
+                f.write(b"mesmo audio")
+            results = []
+            for name in ("primeira.txt", "segunda.txt"):
+                results.append(audio_transcriber.transcribe_audio(
+                    audio_path=audio_path, model_size="small", use_gpu=False,
+                    output_path=os.path.join(tmp_dir, name),
+                    progress_label_callback=self.progress_label_callback,
+                    progress_bar_callback=self.progress_bar_callback,
+                    stop_event=self.stop_event, timeout_seconds=5, beam_size=5, compute_type="float16"
+                ))
+                audio_transcriber.model_pool.clear()
+            with open(os.path.join(tmp_dir, "segunda.txt"), encoding="utf-8") as f:
+                second_output = f.read()
+
+        self.assertEqual(results, ["Texto em cache.", "Texto em cache."])
+        self.assertEqual(second_output, "Texto em cache.")
+        self.assertEqual(mock_WhisperModel.call_count, 1, "O modelo não deve ser carregado numa transcrição em cache.")
+
 if __name__ == "__main__":
     unittest.main()
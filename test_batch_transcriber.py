@@ -0,0 +1,48 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+
+import batch_transcriber
+
+class TestBatchTranscriber(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        root = self.tmp_dir.name
+        os.makedirs(os.path.join(root, "sub"))
+        for name in ("a.mp3", "b.WAV", "notas.txt", os.path.join("sub", "c.m4a")):
+            with open(os.path.join(root, name), "wb") as f:
+                f.write(b"x" * 10)
+
+    def test_collect_from_directory(self):
+        files = batch_transcriber.collect_audio_files(self.tmp_dir.name)
+        self.assertEqual([os.path.basename(f) for f in files], ["a.mp3", "b.WAV"])
+
+    def test_collect_recursive_and_glob(self):
+        recursive = batch_transcriber.collect_audio_files(self.tmp_dir.name, recursive=True)
+        self.assertEqual(len(recursive), 3)
+        by_glob = batch_transcriber.collect_audio_files(os.path.join(self.tmp_dir.name, "**", "*.m4a"))
+        self.assertEqual([os.path.basename(f) for f in by_glob], ["c.m4a"])
+
+    def test_probe_duration_falls_back_to_size(self):
+        # Arquivo inválido: duração estimada pelo tamanho, sem exceção
+        duration = batch_transcriber.probe_duration(os.path.join(self.tmp_dir.name, "a.mp3"))
+        self.assertGreater(duration, 0)
+
+    def test_output_paths_do_not_collide(self):
+        root = self.tmp_dir.name
+        files = [os.path.join(root, "a", "reuniao.wav"), os.path.join(root, "b", "reuniao.wav"),
+                 os.path.join(root, "a", "reuniao.mp3")]
+        out_dir = os.path.join(root, "saida")
+        outputs = batch_transcriber.plan_output_paths(files, out_dir)
+        self.assertEqual(outputs[files[0]], os.path.join(out_dir, "a", "reuniao.txt"))
+        self.assertEqual(outputs[files[1]], os.path.join(out_dir, "b", "reuniao.txt"))
+        self.assertEqual(outputs[files[2]], os.path.join(out_dir, "a", "reuniao.mp3.txt"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import csv
+import json
+import os
+import queue
+import tempfile
+import time
+import unittest
+import wave
+from unittest import mock
+
+import benchmark_transcriber
+
+class TestBenchmarkTranscriber(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_generate_fixtures_writes_and_reuses_wavs(self):
+        fixtures_dir = os.path.join(self.tmp_dir.name, "fixtures")
+        fixtures = benchmark_transcriber.generate_fixtures(fixtures_dir, 2)
+        self.assertEqual(set(fixtures), set(benchmark_transcriber.FIXTURE_KINDS))
+        for path in fixtures.values():
+            with wave.open(path, "rb") as wav:
+                self.assertEqual((wav.getnchannels(), wav.getsampwidth()), (1, 2))
+                self.assertEqual(wav.getframerate(), benchmark_transcriber.SAMPLE_RATE)
+                self.assertEqual(wav.getnframes(), 2 * benchmark_transcriber.SAMPLE_RATE)
+
+        # Fixtures existentes são reaproveitadas, não sintetizadas de novo
+        with mock.patch.object(benchmark_transcriber, "synthesize_fixture") as mock_synthesize:
+            self.assertEqual(benchmark_transcriber.generate_fixtures(fixtures_dir, 2), fixtures)
+        mock_synthesize.assert_not_called()
+
+    def test_synthesize_rejects_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            benchmark_transcriber.synthesize_fixture("musica", 1)
+
+    def test_save_results_json_and_csv(self):
+        results = [
+            {"fixture": "tones", "audio_path": "tones.wav", "audio_seconds": 60.0, "model_size": "tiny",
+             "beam_size": 1, "compute_type": "int8", "use_gpu": False, "status": "ok", "error": "",
+             "model_load_seconds": 1.5, "time_to_first_segment_seconds": 0.4, "transcribe_seconds": 6.0,
+             "rtf": 0.1, "peak_rss_mb": 350.0, "segments": 12},
+            {"fixture": "silence_gaps", "audio_path": "gaps.wav", "audio_seconds": 60.0, "model_size": "small",
+             "beam_size": 5, "compute_type": "float32", "use_gpu": False, "status": "timeout",
+             "error": "Tempo limite de 10s excedido."},
+        ]
+        json_path, csv_path = benchmark_transcriber.save_results(results, os.path.join(self.tmp_dir.name, "saida"))
+
+        with open(json_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(report["results"], results)
+        self.assertIn("cpu_count", report["host"])
+
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), benchmark_transcriber.CSV_FIELDS)
+        self.assertEqual((rows[0]["rtf"], rows[0]["segments"]), ("0.1", "12"))
+        self.assertEqual((rows[1]["status"], rows[1]["rtf"]), ("timeout", ""))
+
+    def test_dead_process_does_not_wait_for_timeout(self):
+        process = mock.Mock(exitcode=-9, **{"is_alive.return_value": False})
+        start = time.monotonic()
+        result = benchmark_transcriber._wait_for_result({"fixture": "tones"}, process, queue.Queue(),
+                                                        timeout_seconds=600, poll_seconds=0.05)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(result["status"], "crash")
+        self.assertIn("-9", result["error"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import struct
+import tempfile
+import unittest
+
+from text_readers import doc_reader, rtf_reader
+
+SECTOR = 512
+END_OF_CHAIN = 0xFFFFFFFE
+FREE = 0xFFFFFFFF
+
+def _dir_entry(name, entry_type, start, size):
+    encoded = name.encode("utf-16-le") + b"\x00\x00"
+    entry = bytearray(128)
+    entry[:len(encoded)] = encoded
+    struct.pack_into("<HB", entry, 0x40, len(encoded), entry_type)
+    struct.pack_into("<III", entry, 0x44, FREE, FREE, FREE)
+    struct.pack_into("<II", entry, 0x74, start, size)
+    return bytes(entry)
+
+def build_compound_file(streams):
+    """Monta um Compound File v3 mínimo (fluxos >= 4096 bytes, sem mini stream)."""
+    fat = [0xFFFFFFFD, END_OF_CHAIN]          # setor 0: FAT; setor 1: diretório
+    directory = _dir_entry("Root Entry", 5, END_OF_CHAIN, 0)
+    body = b""
+    next_sector = 2
+    for name, data in streams.items():
+        data = data.ljust(max(4096, -(-len(data) // SECTOR) * SECTOR), b"\x00")
+        count = len(data) // SECTOR
+        fat.extend(list(range(next_sector + 1, next_sector + count)) + [END_OF_CHAIN])
+        directory += _dir_entry(name, 2, next_sector, len(data))
+        body += data
+        next_sector += count
+    header = bytearray(SECTOR)
+    header[:8] = doc_reader.OLE2_SIGNATURE
+    struct.pack_into("<HHHH", header, 0x18, 0x3E, 3, 0xFFFE, 9)
+    struct.pack_into("<H", header, 0x20, 6)
+    struct.pack_into("<IIIIIIII", header, 0x2C, 1, 1, 0, 4096, END_OF_CHAIN, 0, END_OF_CHAIN, 0)
+    struct.pack_into("<109I", header, 0x4C, 0, *([FREE] * 108))
+    fat_sector = struct.pack(f"<{len(fat)}I", *fat).ljust(SECTOR, b"\xff")
+    return bytes(header) + fat_sector + directory.ljust(SECTOR, b"\x00") + body
+
+def build_doc(pieces):
+    """pieces: lista de (texto, comprimido). Texto comprimido em cp1252, demais em UTF-16."""
+    word = bytearray(0x1000)
+    struct.pack_into("<H", word, 0, 0xA5EC)
+    cps = [0]
+    descriptors = b""
+    offset = 0x800
+    for text, compressed in pieces:
+        raw = text.encode("cp1252" if compressed else "utf-16-le")
+        word[offset:offset + len(raw)] = raw
+        fc = (offset * 2) | 0x40000000 if compressed else offset
+        descriptors += struct.pack("<HIH", 0, fc, 0)
+        cps.append(cps[-1] + len(text))
+        offset += len(raw) + 16
+    struct.pack_into("<I", word, 0x4C, cps[-1])
+    plc = struct.pack(f"<{len(cps)}I", *cps) + descriptors
+    clx = b"\x02" + struct.pack("<I", len(plc)) + plc
+    struct.pack_into("<II", word, 0x01A2, 0, len(clx))
+    return build_compound_file({"WordDocument": bytes(word), "0Table": clx})
+
+class TestDocAndRtfReaders(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_doc_pieces_and_fields(self):
+        path = self._write("legado.doc", build_doc([
+            ('Ação \x13 HYPERLINK "http://x" \x14site\x15 pronta\r', True),
+            ("Célula\x07€ item\r", False),
+        ]))
+        self.assertEqual("".join(doc_reader.iter_doc_text(path)), "Ação site pronta\nCélula\t€ item\n")
+
+    def test_doc_rejects_non_ole_file(self):
+        path = self._write("falso.doc", b"PK\x03\x04 nao e ole")
+        with self.assertRaises(doc_reader.DocFormatError):
+            list(doc_reader.iter_doc_text(path))
+
+    def test_rtf_tokenizer_streaming(self):
+        backslash = chr(92)
+        source = (
+            "{" + backslash + "rtf1" + backslash + "ansi" + backslash + "ansicpg1252"
+            "{" + backslash + "fonttbl{" + backslash + "f0 Arial;}}"
+            "{" + backslash + "*" + backslash + "generator Riched20;}"
+            + backslash + "pard Requisito: a" + backslash + "'e7" + backslash + "'e3o" + backslash + "par\r\n"
+            "Pre" + backslash + "u8364?o {" + backslash + "b final}" + backslash + "tab " + backslash + "{x" + backslash + "}}"
+        )
+        path = self._write("spec.rtf", source.encode("latin-1"))
+        expected = "Requisito: ação\nPre€o final\t{x}"
+        self.assertEqual("".join(rtf_reader.iter_rtf_text(path)), expected)
+        # Blocos minúsculos: tokens cortados entre blocos são recompostos
+        self.assertEqual("".join(rtf_reader.iter_rtf_text(path, read_bytes=3)), expected)
+
+    def test_rtf_unknown_codepage_falls_back_to_cp1252(self):
+        for codepage in ("10000", "99999"):
+            with self.subTest(codepage=codepage):
+                source = "{\\rtf1\\ansi\\ansicpg" + codepage + " a\\'e7\\'e3o}"
+                path = self._write("mac.rtf", source.encode("ascii"))
+                self.assertEqual("".join(rtf_reader.iter_rtf_text(path)), "ação")
+        self.assertEqual(rtf_reader.codepage_encoding("1251"), "cp1251")
+
+    def test_rtf_double_byte_codepage(self):
+        # Cada caractere japonês vem em dois \'hh consecutivos (primeiro e segundo byte)
+        hex_text = "".join(f"\\'{byte:02x}" for byte in "会議".encode("cp932"))
+        source = "{\\rtf1\\ansi\\ansicpg932 " + hex_text + "\\par fim}"
+        path = self._write("ata.rtf", source.encode("ascii"))
+        for read_bytes in (rtf_reader.READ_BYTES, 3):
+            with self.subTest(read_bytes=read_bytes):
+                self.assertEqual("".join(rtf_reader.iter_rtf_text(path, read_bytes=read_bytes)), "会議\nfim")
+
+    def test_rtf_bin_payload_is_skipped(self):
+        payload = b"\x00{\\}\xff" * 4
+        source = (b"{\\rtf1\\ansi antes {\\*\\blipuid x}{\\pict\\bin" + str(len(payload)).encode() + b" "
+                  + payload + b"}depois}")
+        path = self._write("imagem.rtf", source)
+        for read_bytes in (rtf_reader.READ_BYTES, 5):
+            with self.subTest(read_bytes=read_bytes):
+                self.assertEqual("".join(rtf_reader.iter_rtf_text(path, read_bytes=read_bytes)), "antes depois")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import text_file_reader
+from extraction_cache import ExtractionCache
+from text_readers import docx_reader
+
+NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+      'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"')
+
+def _p(*runs):
+    return "<w:p><w:pPr><w:tabs><w:tab w:val=\"left\"/></w:tabs></w:pPr>" + "".join(f"<w:r>{r}</w:r>" for r in runs) + "</w:p>"
+
+def _t(text):
+    return f"<w:t xml:space=\"preserve\">{text}</w:t>"
+
+def _row(*cells):
+    return "<w:tr>" + "".join(f"<w:tc>{''.join(_p(_t(c)) for c in cell)}</w:tc>" for cell in cells) + "</w:tr>"
+
+DOCUMENT = (
+    f"<w:document {NS}><w:body>"
+    + _p(_t("Requisitos"))
+    + _p(_t("Item"), "<w:tab/>", _t("um"), "<w:br/>", _t("segunda linha"))
+    + "<w:tbl>" + _row(["ID"], ["Descrição"]) + _row(["R1"], ["Login via", "SSO"]) + "</w:tbl>"
+    + _p(_t("Texto "), "<w:delText>removido</w:delText>", _t("final"))
+    + _p("<mc:AlternateContent><mc:Choice>" + _t("caixa") + "</mc:Choice><mc:Fallback>" + _t("caixa") + "</mc:Fallback></mc:AlternateContent>")
+    + "</w:body></w:document>"
+)
+
+class TestDocxReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "spec.docx")
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", "<Types/>")
+            archive.writestr("word/document.xml", DOCUMENT)
+            archive.writestr("word/header1.xml", f"<w:hdr {NS}>{_p(_t('Confidencial'))}</w:hdr>")
+            archive.writestr("word/header2.xml", f"<w:hdr {NS}>{_p(_t('Confidencial'))}</w:hdr>")
+            archive.writestr("word/footer1.xml", f"<w:ftr {NS}>{_p(_t('Página'))}</w:ftr>")
+
+    def test_document_order_with_tables_headers_and_footers(self):
+        self.assertEqual(list(docx_reader.iter_docx_lines(self.path)), [
+            "Confidencial",
+            "Requisitos",
+            "Item\tum\nsegunda linha",
+            "ID | Descrição",
+            "R1 | Login via SSO",
+            "Texto final",
+            "caixa",
+            "Página",
+        ])
+
+    def test_read_text_file_uses_streaming_reader(self):
+        with mock.patch.object(text_file_reader, "extraction_cache", ExtractionCache(use_disk=False)):
+            text = text_file_reader.read_text_file(self.path)
+        self.assertIn("R1 | Login via SSO\nTexto final", text)
+
+if __name__ == "__main__":
+    unittest.main()
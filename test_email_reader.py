@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+from email.message import EmailMessage
+from unittest import mock
+
+import text_file_reader
+from extraction_cache import ExtractionCache
+from text_readers import email_reader
+
+def _message(subject, body, html=None):
+    msg = EmailMessage()
+    msg["From"] = "ana@example.com"
+    msg["To"] = "time@example.com"
+    msg["Subject"] = subject
+    msg.set_content(body)
+    if html:
+        msg.add_alternative(html, subtype="html")
+    return msg
+
+class TestEmailReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "reuniao.eml")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, msg):
+        with open(self.path, "wb") as f:
+            f.write(bytes(msg))
+
+    def _thread_message(self):
+        msg = _message("Ata da reunião", "Segue a ata.", html="<p>Segue a <b>ata</b>.</p>")
+        msg.add_attachment(b"Pauta: migracao\n", maintype="text", subtype="plain", filename="pauta.txt")
+        forwarded = _message("Re: Orçamento", "Orçamento aprovado.")
+        msg.add_attachment(forwarded)
+        msg.add_attachment(b"%PDF-1.4 ...", maintype="application", subtype="pdf", filename="contrato.pdf")
+        return msg
+
+    def test_sections_in_order(self):
+        self._write(self._thread_message())
+        read = []
+
+        def read_part(path):
+            read.append(os.path.basename(path))
+            with open(path, "rb") as f:
+                return f"<{f.read().decode('latin-1').strip()}>"
+
+        text = "".join(email_reader.iter_email_sections(self.path, read_part))
+
+        self.assertTrue(text.startswith("De: ana@example.com\nPara: time@example.com\nAssunto: Ata da reunião"))
+        order = ["Segue a ata.", "--- Anexo: pauta.txt ---", "<Pauta: migracao>",
+                 "--- Mensagem encaminhada ---", "Assunto: Re: Orçamento", "Orçamento aprovado.",
+                 "--- Anexo: contrato.pdf ---", "<%PDF-1.4 ...>"]
+        positions = [text.index(part) for part in order]
+        self.assertEqual(positions, sorted(positions))
+        # Versão HTML alternativa do corpo não é lida quando há texto puro
+        self.assertNotIn("<b>", text)
+        self.assertEqual(sorted(read), ["001_pauta.txt", "002_contrato.pdf"])
+
+    def test_html_only_body_goes_through_reader(self):
+        msg = EmailMessage()
+        msg["Subject"] = "Somente HTML"
+        msg.set_content("<p>Olá</p>", subtype="html")
+        self._write(msg)
+
+        text = "".join(email_reader.iter_email_sections(self.path, lambda path: "Olá convertido"))
+
+        self.assertIn("Olá convertido", text)
+        self.assertNotIn("<p>", text)
+
+    def test_failed_and_unsupported_attachments(self):
+        msg = _message("Anexos", "Corpo.")
+        msg.add_attachment(b"x", maintype="application", subtype="octet-stream", filename="quebrado.bin")
+        msg.add_attachment(b"y", maintype="application", subtype="octet-stream", filename="desconhecido.bin")
+        self._write(msg)
+
+        def read_part(path):
+            if "quebrado" in path:
+                raise RuntimeError("arquivo corrompido")
+            return None
+
+        text = "".join(email_reader.iter_email_sections(self.path, read_part))
+
+        self.assertIn("--- Anexo: quebrado.bin ---\n[Não foi possível ler o conteúdo: arquivo corrompido]", text)
+        self.assertIn("--- Anexo: desconhecido.bin ---\n[Formato não suportado]", text)
+
+    def test_read_text_file_routes_attachments(self):
+        msg = _message("Notas", "Corpo do e-mail.")
+        msg.add_attachment(b"{\\rtf1\\ansi Conteudo do anexo RTF\\par}", maintype="application",
+                           subtype="rtf", filename="notas.rtf")
+        msg.add_attachment(b"Texto anexado", maintype="text", subtype="plain", filename="extra.txt")
+        self._write(msg)
+
+        with mock.patch.object(text_file_reader, "extraction_cache", ExtractionCache(use_disk=False)):
+            text = text_file_reader.read_text_file(self.path)
+
+        self.assertIn("Corpo do e-mail.", text)
+        self.assertIn("--- Anexo: notas.rtf ---\nConteudo do anexo RTF", text)
+        self.assertIn("--- Anexo: extra.txt ---\nTexto anexado", text)
+
+    def _write_with_recording(self):
+        msg = _message("Gravação", "Segue a gravação da reunião. " * 10)
+        msg.add_attachment(b"ID3\x03\x00" + b"\x00" * 64, maintype="audio", subtype="mpeg", filename="reuniao.mp3")
+        self._write(msg)
+
+    def test_preview_does_not_transcribe_audio_attachments(self):
+        self._write_with_recording()
+        with mock.patch.object(text_file_reader, "extraction_cache", ExtractionCache(use_disk=False)), \
+                mock.patch("audio_transcriber.transcribe_to_text") as mock_transcribe:
+            preview = text_file_reader.read_preview(self.path, 3000)
+        mock_transcribe.assert_not_called()
+        self.assertIn("--- Anexo: reuniao.mp3 ---\n[Anexo de áudio: transcrito apenas no processamento]", preview)
+
+    def test_audio_attachments_use_selected_settings(self):
+        self._write_with_recording()
+        settings = {"model_size": "medium", "use_gpu": True, "beam_size": 3, "compute_type": "int8"}
+        cache = ExtractionCache(use_disk=False)
+        with mock.patch.object(text_file_reader, "extraction_cache", cache), \
+                mock.patch("audio_transcriber.transcribe_to_text", return_value="fala transcrita") as mock_transcribe:
+            text = text_file_reader.read_text_file(self.path, transcription=settings)
+            # Extração sem transcrição não reaproveita a entrada com os áudios transcritos
+            preview_text = text_file_reader.read_text_file(self.path)
+        self.assertEqual(mock_transcribe.call_args.kwargs, settings)
+        self.assertIn("--- Anexo: reuniao.mp3 ---\nfala transcrita", text)
+        self.assertNotIn("fala transcrita", preview_text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import text_file_reader
+from extraction_cache import ExtractionCache
+
+class TestExtractionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.doc_path = os.path.join(self.tmp_dir.name, "requisitos.rtf")
+        with open(self.doc_path, "w", encoding="utf-8") as f:
+            f.write("Requisitos do sistema.")
+
+    def test_memory_and_disk_tiers(self):
+        cache = ExtractionCache(cache_dir=self.cache_dir, use_disk=True)
+        self.assertIsNone(cache.get(self.doc_path))
+        cache.put(self.doc_path, "texto extraído")
+        self.assertEqual(cache.get(self.doc_path), "texto extraído")
+        # Nova instância (nova execução da aplicação): encontrado no disco
+        self.assertEqual(ExtractionCache(cache_dir=self.cache_dir, use_disk=True).get(self.doc_path), "texto extraído")
+        self.assertIsNone(ExtractionCache(use_disk=False).get(self.doc_path))
+
+    def test_modified_file_misses(self):
+        cache = ExtractionCache(cache_dir=self.cache_dir, use_disk=True)
+        cache.put(self.doc_path, "versão antiga")
+        with open(self.doc_path, "w", encoding="utf-8") as f:
+            f.write("Requisitos revisados do sistema.")
+        self.assertIsNone(cache.get(self.doc_path))
+
+    def test_memory_lru_limit(self):
+        cache = ExtractionCache(memory_max_mb=1, use_disk=False)
+        paths = [self.doc_path]
+        for name in ("outro.rtf", "terceiro.rtf"):
+            paths.append(os.path.join(self.tmp_dir.name, name))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write(name)
+        for path in paths:
+            cache.put(path, "a" * 400_000)
+        self.assertIsNone(cache.get(paths[0]))
+        self.assertIsNotNone(cache.get(paths[1]))
+        self.assertIsNotNone(cache.get(paths[2]))
+
+    def test_reader_skips_parser_on_second_read(self):
+        cache = ExtractionCache(cache_dir=self.cache_dir, use_disk=True)
+        with mock.patch.object(text_file_reader, "extraction_cache", cache):
+            first = text_file_reader.read_text_file(self.doc_path)
+            with mock.patch.object(text_file_reader, "_iter_pieces") as mock_pieces:
+                second = text_file_reader.read_text_file(self.doc_path)
+                preview = text_file_reader.read_preview(self.doc_path, 9)
+        mock_pieces.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(preview, "Requisito")
+
+    def test_cache_bypass_follows_detected_format(self):
+        # .txt que na verdade é RTF passa pelo cache; texto puro sem extensão é lido direto do disco
+        rtf_as_txt = os.path.join(self.tmp_dir.name, "requisitos.txt")
+        with open(rtf_as_txt, "w", encoding="utf-8") as f:
+            f.write("{\\rtf1\\ansi Requisitos do sistema.}")
+        plain = os.path.join(self.tmp_dir.name, "LEIAME")
+        with open(plain, "w", encoding="utf-8") as f:
+            f.write("Requisitos do sistema.")
+        cache = ExtractionCache(use_disk=False)
+        with mock.patch.object(text_file_reader, "extraction_cache", cache):
+            self.assertEqual(text_file_reader.read_text_file(rtf_as_txt), "Requisitos do sistema.")
+            self.assertEqual(text_file_reader.read_text_file(plain), "Requisitos do sistema.")
+        self.assertEqual(cache.get(rtf_as_txt), "Requisitos do sistema.")
+        self.assertIsNone(cache.get(plain))
+
+    def test_concurrent_reads_share_one_extraction(self):
+        # A pré-extração em segundo plano e o processamento pedem o mesmo documento ao mesmo tempo
+        cache = ExtractionCache(use_disk=False)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_pieces(*args):
+            calls.append(args[0])
+            started.set()
+            release.wait(5)
+            yield "Requisitos do sistema."
+
+        results = []
+        with mock.patch.object(text_file_reader, "extraction_cache", cache), \
+             mock.patch.object(text_file_reader, "_iter_pieces", side_effect=slow_pieces):
+            threads = [threading.Thread(target=lambda: results.append(text_file_reader.read_text_file(self.doc_path)))
+                       for _ in range(2)]
+            threads[0].start()
+            started.wait(5)
+            threads[1].start()
+            threads[1].join(0.2)
+            release.set()
+            for t in threads:
+                t.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["Requisitos do sistema."] * 2)
+
+    def test_cancel_stops_waiting_for_other_extraction(self):
+        cache = ExtractionCache(use_disk=False)
+        key, _ = cache.claim(self.doc_path)     # extração "em andamento" em outra thread que não termina
+        self.addCleanup(cache.release, key)
+        stop_event = threading.Event()
+        stop_event.set()
+        with mock.patch.object(text_file_reader, "extraction_cache", cache), \
+             mock.patch.object(text_file_reader, "IN_FLIGHT_POLL_SECONDS", 0.01), \
+             mock.patch.object(text_file_reader, "_iter_pieces") as mock_pieces:
+            chunks = list(text_file_reader.iter_text_chunks(self.doc_path, stop_event=stop_event))
+        self.assertEqual(chunks, [])
+        mock_pieces.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
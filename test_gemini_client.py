@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import unittest
+from unittest import mock
+
+import gemini_client
+
+class TestGeminiClient(unittest.TestCase):
+
+    def setUp(self):
+        gemini_client.reset()
+        self.addCleanup(gemini_client.reset)
+        patcher = mock.patch.object(gemini_client, "genai")
+        self.mock_genai = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_genai.GenerativeModel.side_effect = lambda name: mock.Mock(name=name)
+
+    def test_configures_once_and_reuses_models(self):
+        first = gemini_client.get_model("models/gemini-1.5-flash", "chave")
+        second = gemini_client.get_model("models/gemini-1.5-flash", "chave")
+        other = gemini_client.get_model("models/gemini-1.5-pro", "chave")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.mock_genai.configure.assert_called_once_with(api_key="chave")
+        self.assertEqual(self.mock_genai.GenerativeModel.call_count, 2)
+
+    def test_call_without_key_keeps_configuration(self):
+        model = gemini_client.get_model(api_key="chave")
+        self.assertIs(gemini_client.get_model(), model)
+        self.mock_genai.configure.assert_called_once()
+
+    def test_new_key_reconfigures_and_drops_models(self):
+        model = gemini_client.get_model(api_key="chave")
+        new_model = gemini_client.get_model(api_key="outra")
+
+        self.assertIsNot(model, new_model)
+        self.assertEqual(self.mock_genai.configure.call_args_list,
+                         [mock.call(api_key="chave"), mock.call(api_key="outra")])
+
+    def test_key_from_environment(self):
+        with mock.patch.dict(os.environ, {"GEMINI_API_KEY": "chave-env"}):
+            gemini_client.configure()
+        self.mock_genai.configure.assert_called_once_with(api_key="chave-env")
+
+    def test_generate_content_waits_for_quota_and_retries(self):
+        model = gemini_client.get_model()
+        error = Exception("quota")
+        error.code = 429
+        model.generate_content.side_effect = [error, mock.Mock(text="ok")]
+        limiter = mock.Mock()
+        with mock.patch.object(gemini_client, "rate_limiter", limiter), \
+                mock.patch("rate_limiter.time.sleep") as mock_sleep:
+            response = gemini_client.generate_content("prompt")
+
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(limiter.acquire.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_unavailable_library(self):
+        with mock.patch.object(gemini_client, "genai", None):
+            self.assertFalse(gemini_client.is_available())
+            with self.assertRaises(gemini_client.GeminiUnavailableError):
+                gemini_client.get_model()
+
+if __name__ == "__main__":
+    unittest.main()
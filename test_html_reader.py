@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import text_file_reader
+from extraction_cache import ExtractionCache
+from text_readers import html_reader
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="windows-1252"><title>Arquitetura</title>
+<style>body { color: red; }</style>
+<script>var segredo = "<p>não é texto</p>";</script></head>
+<body>
+  <h1>Visão   geral</h1>
+  <p>Serviço de <b>pagamentos</b> &amp; faturamento.<br>Segunda linha</p>
+  <ul><li>API</li><li>Fila</li></ul>
+  <table><tr><th>Componente</th><th>Nuvem</th></tr>
+         <tr><td><p>Banco</p><p>principal</p></td><td>AWS</td></tr></table>
+  <pre>linha 1
+    linha 2</pre>
+  <noscript>Ative o JavaScript</noscript>
+</body></html>
+"""
+
+EXPECTED = ("Arquitetura\n\nVisão geral\n\nServiço de pagamentos & faturamento.\nSegunda linha\n\n"
+            "API\nFila\nComponente | Nuvem\nBanco principal | AWS\n\nlinha 1\n    linha 2")
+
+class TestHtmlReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "pagina.html")
+        with open(self.path, "wb") as f:
+            f.write(PAGE.encode("cp1252"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_extracts_visible_text_with_block_breaks(self):
+        text = "".join(html_reader.iter_html_text(self.path))
+        self.assertEqual(text, EXPECTED)
+
+    def test_same_result_with_tiny_blocks(self):
+        # Blocos de 7 bytes cortam tags, entidades e caracteres no meio
+        pieces = list(html_reader.iter_html_text(self.path, read_bytes=7))
+        self.assertGreater(len(pieces), 10)
+        self.assertEqual("".join(pieces), EXPECTED)
+
+    def test_charset_declared_in_meta(self):
+        self.assertEqual(html_reader.sniff_html_encoding(b'<meta charset="windows-1252">'), "cp1252")
+        self.assertEqual(html_reader.sniff_html_encoding(b"\xef\xbb\xbf<html>"), "utf-8-sig")
+        self.assertEqual(html_reader.sniff_html_encoding("<p>ação</p>".encode("utf-8")), "utf-8")
+
+    def test_read_text_file_uses_streaming_reader(self):
+        with mock.patch.object(text_file_reader, "extraction_cache", ExtractionCache(use_disk=False)), \
+                mock.patch.object(text_file_reader.registry, "load_backend") as mock_load:
+            text = text_file_reader.read_text_file(self.path)
+        mock_load.assert_not_called()
+        self.assertEqual(text, EXPECTED)
+
+if __name__ == "__main__":
+    unittest.main()
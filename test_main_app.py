@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# main_app encerra o programa na importação se não houver chave da API; com um handler já
+# configurado, o basicConfig de main_app não passa a gravar o log dos testes em voxLOG.txt
+os.environ.setdefault("GEMINI_API_KEY", "chave-de-teste")
+logging.getLogger().addHandler(logging.NullHandler())
+
+import main_app
+from progress_channel import ProgressChannel
+
+class TestGemModules(unittest.TestCase):
+
+    def setUp(self):
+        # Aplicação sem janela: apenas o que _run_all_modules usa
+        self.app = main_app.TranscriptionApp.__new__(main_app.TranscriptionApp)
+        self.app.master = mock.Mock()
+        self.app.progress_channel = ProgressChannel()
+        self.app.stop_timer = mock.Mock()
+        self.app.transcribe_button = mock.Mock()
+        self.app.cancel_button = mock.Mock()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        for target in ("logger", "text_file_reader"):
+            patcher = mock.patch.object(main_app, target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        main_app.text_file_reader.iter_text_chunks.return_value = iter(["Texto da reunião."])
+
+    def _run(self, stop_event=None):
+        labels = []
+        self.app._run_all_modules(
+            os.path.join(self.tmp_dir.name, "notas.txt"), ".txt", False, True, "small", False,
+            os.path.join(self.tmp_dir.name, "saida.txt"), True, True, "Azure",
+            labels.append, mock.Mock(), stop_event or threading.Event(), None, 5, "auto"
+        )
+        dialogs = []
+        while True:
+            dialog = self.app.progress_channel.next_dialog()
+            if dialog is None:
+                return labels, dialogs
+            dialogs.append(dialog)
+
+    def test_modules_run_concurrently_and_failures_are_isolated(self):
+        # As duas chamadas só passam da barreira se estiverem em andamento ao mesmo tempo
+        barrier = threading.Barrier(2, timeout=5)
+
+        def analyze(text, progress_callback=None, stop_event=None):
+            barrier.wait()
+            raise RuntimeError("cota esgotada")
+
+        def solve(*args, **kwargs):
+            barrier.wait()
+            return "Solução", [], []
+
+        with mock.patch.object(main_app.problem_analyzer, "analyze_full_text", side_effect=analyze), \
+             mock.patch.object(main_app.solution_generator, "generate_solution", side_effect=solve), \
+             mock.patch.object(main_app, "messagebox") as mock_messagebox:
+            labels, dialogs = self._run()
+
+        self.assertEqual(sorted(kind for kind, _, _ in dialogs), ["showerror", "showinfo"])
+        error = next(d for d in dialogs if d[0] == "showerror")
+        self.assertEqual(error[1], "Erro no Módulo de Análise")
+        self.assertIn("cota esgotada", error[2])
+        # Os diálogos são abertos pela thread da interface, nunca pelas threads do pool
+        mock_messagebox.showinfo.assert_not_called()
+        mock_messagebox.showerror.assert_not_called()
+        self.assertTrue(any("Módulo 2/4" in label and "Módulo 3/4" in label for label in labels))
+
+    def test_cancel_skips_gem_modules(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        with mock.patch.object(main_app.problem_analyzer, "analyze_full_text") as analyze, \
+             mock.patch.object(main_app.solution_generator, "generate_solution") as solve:
+            self._run(stop_event)
+        analyze.assert_not_called()
+        solve.assert_not_called()
+
+class TestPrewarm(unittest.TestCase):
+
+    def setUp(self):
+        self.app = main_app.TranscriptionApp.__new__(main_app.TranscriptionApp)
+        self.app.input_file_path = mock.Mock()
+
+    def test_email_is_not_prewarmed(self):
+        # E-mails podem ter áudios anexados: a pré-extração os transcreveria sem possibilidade de cancelamento
+        self.app.input_file_path.get.return_value = "reuniao.eml"
+        with mock.patch.object(main_app.text_registry, "detect_format",
+                               return_value={"kind": "text", "options": True}), \
+             mock.patch.object(main_app.threading, "Thread") as mock_thread:
+            self.app.prewarm_text_extraction()
+        mock_thread.assert_not_called()
+
+    def test_document_is_prewarmed_without_transcription(self):
+        self.app.input_file_path.get.return_value = "requisitos.docx"
+        with mock.patch.object(main_app.text_registry, "detect_format", return_value={"kind": "text"}), \
+             mock.patch.object(main_app.threading, "Thread") as mock_thread:
+            self.app.prewarm_text_extraction()
+        self.assertEqual(mock_thread.call_args.kwargs["args"], ("requisitos.docx",))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+import parallel_transcriber
+
+
+class _FakeProcess:
+    pid = 0
+
+    def __init__(self):
+        self.terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+
+class _FakeExecutor:
+    """Executor que conclui uma janela de cada vez (ou nenhuma, com hold=True) e registra a fila."""
+
+    def __init__(self, hold=False, **kwargs):
+        self.hold = hold
+        self.outstanding = []
+        self.max_outstanding = 0
+        self._processes = {1: _FakeProcess(), 2: _FakeProcess()}
+        self.shutdown_calls = []
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, fn, audio_slice, offset, beam_size, language):
+        future = Future()
+        future.offset = offset
+        self.outstanding.append(future)
+        self.max_outstanding = max(self.max_outstanding, len(self.outstanding))
+        return future
+
+    def _run(self):
+        while not self._stop.wait(0.005):
+            if self.outstanding and not self.hold:
+                future = self.outstanding.pop(0)
+                future.set_result([{"start": future.offset, "end": future.offset + 1, "text": "ok"}])
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self._stop.set()
+        self.shutdown_calls.append((wait, cancel_futures))
+
+class TestParallelTranscriber(unittest.TestCase):
+
+    def test_windows_cut_on_silence(self):
+        # Três trechos de fala de 100s separados por silêncios de 20s; janelas de até 150s
+        regions = [(0, 100), (120, 220), (240, 340)]
+        windows = parallel_transcriber.plan_windows(regions, 340, window_seconds=150, overlap_seconds=5)
+        cores = [(w["core_start"], w["core_end"]) for w in windows]
+        self.assertEqual(cores, [(0.0, 110.0), (110.0, 230.0), (230.0, 340)])
+        self.assertEqual((windows[1]["start"], windows[1]["end"]), (105.0, 235.0))
+
+    def test_long_speech_is_force_split(self):
+        windows = parallel_transcriber.plan_windows([(0, 700)], 700, window_seconds=300, overlap_seconds=5)
+        cores = [(w["core_start"], w["core_end"]) for w in windows]
+        self.assertEqual(cores, [(0.0, 300.0), (300.0, 600.0), (600.0, 700)])
+
+    def test_silent_windows_are_skipped(self):
+        windows = parallel_transcriber.plan_windows([(0, 50), (500, 550)], 600, window_seconds=100, overlap_seconds=0)
+        for w in windows:
+            self.assertTrue(w["start"] < 50 or w["end"] > 500)
+
+    def test_stitch_removes_overlap_duplicates(self):
+        w1 = {"core_start": 0.0, "core_end": 10.0, "start": 0.0, "end": 12.0}
+        w2 = {"core_start": 10.0, "core_end": 20.0, "start": 8.0, "end": 20.0}
+        results = [
+            (w2, [{"start": 8.5, "end": 11.0, "text": "segundo trecho"},
+                  {"start": 11.0, "end": 19.0, "text": "terceiro trecho"}]),
+            (w1, [{"start": 0.0, "end": 8.0, "text": "primeiro trecho"},
+                  {"start": 8.2, "end": 11.2, "text": "segundo trecho."}]),
+        ]
+        stitched = parallel_transcriber.stitch_segments(results)
+        self.assertEqual([s["text"] for s in stitched], ["primeiro trecho", "segundo trecho.", "terceiro trecho"])
+
+    def test_energy_detection_finds_tones(self):
+        import numpy as np
+        sr = parallel_transcriber.SAMPLE_RATE
+        t = np.arange(sr * 2) / sr
+        tone = 0.5 * np.sin(2 * np.pi * 440 * t).astype(np.float32)
+        audio = np.concatenate([tone, np.zeros(sr * 2, dtype=np.float32), tone])
+        regions = parallel_transcriber._detect_speech_by_energy(audio)
+        self.assertEqual(len(regions), 2)
+        self.assertAlmostEqual(regions[1][0], 4.0, delta=0.1)
+
+    def _run_parallel(self, executor, stop_event=None):
+        import numpy as np
+        audio = np.zeros(parallel_transcriber.SAMPLE_RATE * 100, dtype=np.float32)
+        with mock.patch("faster_whisper.decode_audio", return_value=audio), \
+             mock.patch.object(parallel_transcriber, "detect_speech_regions", return_value=[(0, 100)]), \
+             mock.patch.object(parallel_transcriber, "ProcessPoolExecutor", return_value=executor):
+            return parallel_transcriber.transcribe_parallel(
+                "audio.wav", "tiny", "cpu", "int8", max_workers=2, window_seconds=5, overlap_seconds=0,
+                stop_event=stop_event
+            )
+
+    def test_windows_are_submitted_with_bounded_lookahead(self):
+        executor = _FakeExecutor()
+        segments = self._run_parallel(executor)
+        self.assertEqual(len(segments), 20)
+        self.assertLessEqual(executor.max_outstanding, 2 * parallel_transcriber.MAX_PENDING_PER_WORKER)
+        self.assertFalse(any(p.terminated for p in executor._processes.values()))
+
+    def test_cancel_terminates_worker_processes(self):
+        executor = _FakeExecutor(hold=True)
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertIsNone(self._run_parallel(executor, stop_event))
+        self.assertTrue(all(p.terminated for p in executor._processes.values()))
+        self.assertEqual(executor.shutdown_calls, [(False, True)])
+
+if __name__ == "__main__":
+    unittest.main()
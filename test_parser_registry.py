@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import text_file_reader
+from text_readers import registry
+
+class TestParserRegistry(unittest.TestCase):
+
+    def test_formats_registered_without_importing_backends(self):
+        self.assertIn(".pdf", registry.supported_extensions())
+        self.assertIn(".docx", registry.supported_extensions())
+        with mock.patch("importlib.import_module") as mock_import:
+            report = registry.availability()
+        mock_import.assert_not_called()
+        self.assertTrue(report[".txt"]["available"])
+        self.assertEqual(list(report[".pdf"]["backends"]), ["pdfplumber", "PyPDF2"])
+
+    def test_missing_packages_uses_first_backend(self):
+        with mock.patch.object(registry, "is_backend_available", return_value=False):
+            missing = registry.missing_packages([".pdf", ".html", ".txt"])
+        self.assertEqual(missing, ["pdfplumber"])
+
+    def test_prewarm_loads_first_installed_backend(self):
+        fake_pypdf2 = mock.Mock()
+        installed = {"PyPDF2": True, "pdfplumber": False, "docx": False}
+        with mock.patch.object(registry, "is_backend_available", side_effect=lambda name: installed[name]), \
+                mock.patch.dict(sys.modules, {"PyPDF2": fake_pypdf2}), \
+                mock.patch.dict(registry._loaded, clear=True):
+            loaded = registry.prewarm((".pdf", ".docx"))
+            self.assertIs(registry.load_backend("PyPDF2"), fake_pypdf2)
+        self.assertEqual(loaded, ["PyPDF2"])
+
+    def _write(self, name, data):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_detects_mislabeled_files_by_content(self):
+        cases = {
+            "relatorio.doc": (b"PK\x03\x04" + b"\x00" * 26 + b"word/document.xml", "docx"),
+            "notas.txt": (b"\xef\xbb\xbf  <!DOCTYPE html><html><body>oi</body></html>", "html"),
+            "spec.txt": (b"%PDF-1.7\n%...", "pdf"),
+            "legado.docx": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 100, "doc"),
+            "gravacao.mp3": (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+            "reuniao.vtt": (b"WEBVTT\n\n00:00.000 --> 00:02.000\nOi", "subtitles"),
+            "chamado.dat": (b"Received: from mx\r\nSubject: teste\r\n", "eml"),
+            "lembrete.txt": (b"From: Joana\nLevar a ata da reuniao de segunda.\n", "text"),
+            "encaminhado.txt": (b"From: a@x.com\nTo: b@x.com\nSubject: oi\n\ncorpo", "eml"),
+            "leia-me.md": (b"# Projeto\nTexto", "text"),
+            "registro.log": (b"linha de log\n", "text"),
+        }
+        for name, (data, expected) in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(registry.detect_format(self._write(name, data))["name"], expected)
+
+    def test_extension_used_when_content_is_ambiguous(self):
+        # mp3 sem cabeçalho reconhecível: decide a extensão, não a assinatura genérica de texto
+        self.assertEqual(registry.detect_kind(self._write("audio.mp3", b"dados")), "audio")
+        self.assertIsNone(registry.detect_format(self._write("dados.bin", b"\x00\x01\x02")))
+
+    def test_subtitles_read_as_plain_speech(self):
+        path = self._write("reuniao.srt", (
+            "1\r\n00:00:01,000 --> 00:00:03,000\r\n<i>Bom dia</i> a todos.\r\n\r\n"
+            "2\r\n00:00:03,500 --> 00:00:05,000\r\nBom dia a todos.\r\n\r\n"
+            "3\r\n00:00:05,000 --> 00:00:07,000\r\nVamos começar.\r\n").encode("utf-8"))
+        self.assertEqual(text_file_reader.read_text_file(path), "Bom dia a todos.\nVamos começar.\n")
+
+    def test_entry_point_plugins_register_formats(self):
+        def plugin(reg):
+            reg.register("odt_teste", (".odt",), lambda path, chunk_chars, max_workers: iter(["texto odt"]),
+                         sniff=reg.zip_with(b"application/vnd.oasis.opendocument.text"), priority=10)
+
+        entry_point = mock.Mock()
+        entry_point.name = "odt"
+        entry_point.load.return_value = plugin
+        with mock.patch("importlib.metadata.entry_points", return_value=[entry_point]), \
+                mock.patch.object(registry, "_plugins_loaded", False), \
+                mock.patch.dict(registry._formats):
+            self.assertIn(".odt", registry.supported_extensions())
+            path = self._write("ata.zip", b"PK\x03\x04" + b"\x00" * 26 + b"mimetypeapplication/vnd.oasis.opendocument.text")
+            self.assertEqual(text_file_reader.read_text_file(path), "texto odt")
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            registry.get_reader(".xyz")
+
+if __name__ == "__main__":
+    unittest.main()
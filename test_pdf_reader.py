@@ -0,0 +1,120 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from text_readers import pdf_reader
+
+class FakePage:
+    def __init__(self, text, fail=False):
+        self.text = text
+        self.fail = fail
+        self.closed = False
+
+    def extract_text(self):
+        if self.fail:
+            raise ValueError("página corrompida")
+        return self.text
+
+    def close(self):
+        self.closed = True
+
+class FakePdf:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+def _has_pdf_library():
+    try:
+        import pdfplumber  # noqa: F401
+        return True
+    except ImportError:
+        try:
+            import PyPDF2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+def write_pdf(path, page_texts):
+    """Grava um PDF mínimo e válido com uma linha de texto (Helvetica) em cada página."""
+    n = len(page_texts)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(n))
+               + b"] /Count %d >>" % n,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, text in enumerate(page_texts):
+        content = b"BT /F1 12 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(data)
+
+class TestPdfReader(unittest.TestCase):
+
+    def test_plan_page_ranges(self):
+        self.assertEqual(pdf_reader.plan_page_ranges(10, 4), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(pdf_reader.plan_page_ranges(0, 4), [])
+
+    def test_failed_page_falls_back_to_pypdf2(self):
+        pages = [FakePage("um"), FakePage("", fail=True), FakePage("três")]
+        fake_pdfplumber = mock.Mock()
+        fake_pdfplumber.open.return_value = FakePdf(pages)
+        fake_pypdf2 = mock.Mock()
+        fake_pypdf2.PdfReader.return_value.pages = [None, mock.Mock(**{"extract_text.return_value": "dois"}), None]
+
+        with mock.patch.dict(sys.modules, {"pdfplumber": fake_pdfplumber, "PyPDF2": fake_pypdf2}), \
+                mock.patch("builtins.open", mock.mock_open(read_data=b"")):
+            texts = pdf_reader.extract_page_range("doc.pdf", 0, 3)
+
+        self.assertEqual(texts, ["um", "dois", "três"])
+        self.assertTrue(all(page.closed for page in pages))
+
+    def test_small_pdf_read_in_process_in_order(self):
+        document = mock.MagicMock()
+        document.__enter__.return_value.extract.side_effect = lambda start, end: [f"p{i}" for i in range(start, end)]
+        with mock.patch.object(pdf_reader, "count_pages", return_value=5), \
+                mock.patch.object(pdf_reader, "_PdfDocument", return_value=document) as mock_document, \
+                mock.patch.object(pdf_reader, "ProcessPoolExecutor") as mock_executor:
+            text = pdf_reader.read_pdf("doc.pdf", max_workers=1)
+        self.assertEqual(text, "p0\np1\np2\np3\np4")
+        mock_executor.assert_not_called()
+        # O PDF é aberto uma vez para todas as faixas
+        mock_document.assert_called_once_with("doc.pdf")
+
+    @unittest.skipUnless(_has_pdf_library(), "pdfplumber/PyPDF2 não instalados")
+    def test_real_multi_page_pdf_in_process_and_pool(self):
+        pages = [f"Pagina {i + 1} da ata" for i in range(6)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ata.pdf")
+            write_pdf(path, pages)
+            in_process = pdf_reader.read_pdf(path, max_workers=1)
+            with mock.patch.object(pdf_reader, "MIN_PAGES_FOR_POOL", 1):
+                pooled = list(pdf_reader.iter_pdf_pages(path, max_workers=2, pages_per_task=2))
+        self.assertEqual(in_process, "\n".join(pages))
+        self.assertEqual(pooled, pages)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+
+from text_readers import plain_reader
+
+class TestPlainReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_sniff_encoding(self):
+        self.assertEqual(plain_reader.sniff_encoding("olá".encode("utf-8")), "utf-8")
+        self.assertEqual(plain_reader.sniff_encoding("olá".encode("utf-8-sig")), "utf-8-sig")
+        self.assertEqual(plain_reader.sniff_encoding("olá".encode("utf-16")), "utf-16")
+        self.assertEqual(plain_reader.sniff_encoding("reunião de ação".encode("utf-16-le")), "utf-16-le")
+        self.assertEqual(plain_reader.sniff_encoding("reunião – ação".encode("cp1252")), "cp1252")
+        # Amostra cortada no meio de um caractere multibyte continua sendo UTF-8
+        self.assertEqual(plain_reader.sniff_encoding("ação".encode("utf-8")[:2]), "utf-8")
+
+    def test_multibyte_characters_split_across_chunks(self):
+        content = "ação é tão útil – " * 1000
+        path = self._write("chat.txt", content.encode("utf-8"))
+        chunks = list(plain_reader.iter_text(path, chunk_bytes=7))
+        self.assertEqual("".join(chunks), content)
+
+    def test_utf16_and_cp1252_files(self):
+        content = "Ação: revisar o contrato – item nº 3\n" * 50
+        for encoding in ("utf-16", "cp1252"):
+            path = self._write(f"export_{encoding}.txt", content.encode(encoding))
+            self.assertEqual("".join(plain_reader.iter_text(path, chunk_bytes=64)), content)
+
+    def test_zero_copy_slices_and_empty_file(self):
+        path = self._write("log.txt", b"abcdefghij")
+        with plain_reader.MappedTextFile(path) as doc:
+            slices = []
+            for view in doc.iter_slices(4):
+                self.assertIsInstance(view, memoryview)
+                slices.append(bytes(view))
+                view.release()
+        self.assertEqual(slices, [b"abcd", b"efgh", b"ij"])
+        self.assertEqual(list(plain_reader.iter_text(self._write("vazio.txt", b""))), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import problem_analyzer
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+
+def _response(text):
+    return mock.Mock(text=text)
+
+class TestProblemAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch.object(problem_analyzer.gemini_client, "response_cache", ResponseCache(cache_dir=tmp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(problem_analyzer.gemini_client, "rate_limiter", RateLimiter(0, 0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_split_on_paragraphs_with_overlap(self):
+        paragraphs = [f"Parágrafo {i}. " + "palavra " * 20 for i in range(12)]
+        text = "\n\n".join(paragraphs)
+
+        chunks = problem_analyzer.split_transcription(text, chunk_chars=600, overlap_chars=200)
+
+        self.assertGreater(len(chunks), 2)
+        self.assertTrue(all(len(chunk) <= 600 for chunk in chunks))
+        for chunk in chunks:
+            self.assertTrue(chunk.startswith("Parágrafo"))
+        # O último parágrafo de um trecho é repetido no início do seguinte
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertEqual(previous.split("\n\n")[-1].strip(), current.split("\n\n")[0].strip())
+        self.assertEqual({p.strip() for c in chunks for p in c.split("\n\n")}, {p.strip() for p in paragraphs})
+
+    def test_split_long_transcription_on_sentences(self):
+        # Transcrições de áudio não têm quebras de linha: o corte cai no fim de uma frase
+        text = " ".join(f"Frase número {i} da reunião." for i in range(200))
+
+        chunks = problem_analyzer.split_transcription(text, chunk_chars=1000, overlap_chars=100)
+
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        self.assertTrue(all(chunk.endswith(".") for chunk in chunks))
+        self.assertIn("Frase número 199 da reunião.", chunks[-1])
+
+    def test_short_transcription_single_call(self):
+        with mock.patch.object(problem_analyzer.gemini_client, "get_model") as mock_model:
+            mock_model.return_value.generate_content.return_value = _response("análise")
+            result = problem_analyzer.analyze_full_text("Reunião curta.", chunk_chars=1000)
+        self.assertEqual(result, "análise")
+        self.assertEqual(mock_model.return_value.generate_content.call_count, 1)
+
+    def test_repeated_analysis_served_from_cache(self):
+        with mock.patch.object(problem_analyzer.gemini_client, "get_model") as mock_model:
+            mock_model.return_value.generate_content.side_effect = [_response("primeira"), _response("segunda")]
+            first = problem_analyzer.analyze_full_text("Reunião curta.")
+            second = problem_analyzer.analyze_full_text("Reunião curta.\r\n")
+            forced = problem_analyzer.analyze_full_text("Reunião curta.", use_cache=False)
+        self.assertEqual((first, second, forced), ("primeira", "primeira", "segunda"))
+        self.assertEqual(mock_model.return_value.generate_content.call_count, 2)
+
+    def test_map_reduce_for_long_transcription(self):
+        text = "\n".join(f"Linha {i}: " + "x" * 80 for i in range(40))
+        prompts = []
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def generate(prompt):
+            with lock:
+                prompts.append(prompt)
+                active.append(1)
+                peak.append(len(active))
+            try:
+                if "ANÁLISES PARCIAIS" in prompt:
+                    return _response("análise consolidada")
+                if "[Trecho 2 de" in prompt:
+                    raise RuntimeError("limite excedido")
+                return _response("parcial " + prompt.split("[Trecho ")[1].split(" ")[0])
+            finally:
+                with lock:
+                    active.pop()
+
+        progress = []
+        with mock.patch.object(problem_analyzer.gemini_client, "get_model") as mock_model:
+            mock_model.return_value.generate_content.side_effect = generate
+            result = problem_analyzer.analyze_full_text(text, chunk_chars=1000, overlap_chars=100, max_workers=2,
+                                                        progress_callback=lambda done, total: progress.append(total))
+
+        self.assertEqual(result, "análise consolidada")
+        chunk_count = progress[0]
+        self.assertGreater(chunk_count, 3)
+        self.assertEqual(len(progress), chunk_count)
+        self.assertEqual(len(prompts), chunk_count + 1)
+        self.assertLessEqual(max(peak), 2)
+        reduce_prompt = prompts[-1]
+        self.assertIn("parcial 1\n\n<<ERRO AO ANALISAR TRECHO>>\n\nparcial 3", reduce_prompt)
+
+    def test_map_reduce_all_chunks_failed(self):
+        text = "a " * 3000
+        with mock.patch.object(problem_analyzer.gemini_client, "get_model") as mock_model:
+            mock_model.return_value.generate_content.side_effect = RuntimeError("sem cota")
+            result = problem_analyzer.analyze_full_text(text, chunk_chars=1000)
+        self.assertEqual(result, "Erro ao analisar o texto completo: sem cota")
+
+    def test_progress_counts_finished_chunks(self):
+        # O primeiro trecho termina por último: o progresso conta os concluídos, não o índice do trecho
+        others_done = threading.Event()
+        finished = []
+
+        def generate(model, prompt, use_cache=True, stop_event=None):
+            if "[Trecho 1 de" in prompt:
+                others_done.wait(5)
+            else:
+                finished.append(prompt)
+                if len(finished) == 2:
+                    others_done.set()
+            return {"status": "success", "text": "ok"}
+
+        progress = []
+        with mock.patch.object(problem_analyzer, "_generate", side_effect=generate):
+            problem_analyzer.analyze_chunks(["a", "b", "c"], "{transcricao}", "modelo", max_workers=3,
+                                            progress_callback=lambda done, total: progress.append((done, total)))
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+
+if __name__ == "__main__":
+    unittest.main()
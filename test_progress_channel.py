@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import threading
+import unittest
+from unittest import mock
+
+from progress_channel import ProgressChannel, poll_into_tk
+
+class TestProgressChannel(unittest.TestCase):
+
+    def test_keeps_only_latest_values(self):
+        channel = ProgressChannel()
+        for i in range(1000):
+            channel.set_bar(i / 10)
+            channel.set_label(f"segmento {i}")
+        self.assertEqual(channel.drain(), ("segmento 999", 99.9))
+        self.assertEqual(channel.drain(), (None, None))
+
+    def test_concurrent_publishers(self):
+        channel = ProgressChannel()
+        threads = [threading.Thread(target=lambda: [channel.set_bar(v) for v in range(500)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(channel.drain()[1], 499)
+
+    def test_poll_applies_once_per_frame(self):
+        # Tk falso: guarda os callbacks agendados para executá-los manualmente
+        master = mock.Mock()
+        scheduled = []
+        master.after.side_effect = lambda ms, fn: scheduled.append((ms, fn))
+        apply_label, apply_bar = mock.Mock(), mock.Mock()
+        channel = ProgressChannel()
+
+        poll_into_tk(master, channel, apply_label, apply_bar, fps=10)
+        for i in range(50):
+            channel.set_label(f"msg {i}")
+        scheduled.pop(0)[1]()
+        scheduled.pop(0)[1]()
+
+        self.assertEqual(scheduled[0][0], 100)
+        apply_label.assert_called_once_with("msg 49")
+        apply_bar.assert_not_called()
+
+    def test_dialogs_are_opened_one_at_a_time_by_the_poll(self):
+        master = mock.Mock()
+        scheduled = []
+        master.after.side_effect = lambda ms, fn: scheduled.append((ms, fn))
+        apply_dialog = mock.Mock()
+        channel = ProgressChannel()
+
+        poll_into_tk(master, channel, mock.Mock(), mock.Mock(), fps=10, apply_dialog=apply_dialog)
+        channel.post_dialog("showinfo", "Análise Concluída", "ok")
+        channel.post_dialog("showerror", "Erro no Módulo de Solução", "falhou")
+        scheduled.pop(0)[1]()
+        apply_dialog.assert_called_once_with("showinfo", "Análise Concluída", "ok")
+        scheduled.pop(0)[1]()
+        apply_dialog.assert_called_with("showerror", "Erro no Módulo de Solução", "falhou")
+        self.assertIsNone(channel.next_dialog())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import rate_limiter
+from rate_limiter import RateLimiter, TokenBucket, call_with_retry
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class HttpError(Exception):
+    def __init__(self, code, message="", headers=None):
+        super().__init__(message)
+        self.code = code
+        self.response = mock.Mock(headers=headers or {})
+
+class ResourceExhausted(Exception):
+    pass
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)   # 1 ficha por segundo
+
+        for _ in range(60):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+        self.assertAlmostEqual(bucket.acquire(5), 5.0)
+
+    def test_request_larger_than_capacity_waits_for_full_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(600, clock=clock, sleep=clock.sleep)
+        bucket.acquire(600)
+        self.assertAlmostEqual(bucket.acquire(10_000), 60.0)
+
+    def test_limiter_counts_requests_and_estimated_tokens(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual(limiter.acquire("x" * 4000), 0.0)          # 1000 tokens estimados
+        self.assertAlmostEqual(limiter.acquire("x" * 400), 6.0)     # 100 tokens a 1000/min
+
+    def test_stop_event_interrupts_quota_wait(self):
+        limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0)     # 1 pedido por minuto
+        limiter.acquire("x")
+        stop_event = threading.Event()
+        threading.Timer(0.1, stop_event.set).start()
+        start = time.monotonic()
+        with self.assertRaises(rate_limiter.RetryCancelled):
+            limiter.acquire("x", stop_event)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_disabled_limits(self):
+        limiter = RateLimiter(0, 0)
+        self.assertEqual(limiter.acquire("x" * 10 ** 7), 0.0)
+
+class TestRetry(unittest.TestCase):
+
+    def test_retryable_errors(self):
+        self.assertTrue(rate_limiter.is_retryable(HttpError(429)))
+        self.assertTrue(rate_limiter.is_retryable(HttpError(503)))
+        self.assertTrue(rate_limiter.is_retryable(ResourceExhausted("quota")))
+        self.assertFalse(rate_limiter.is_retryable(HttpError(400)))
+        self.assertFalse(rate_limiter.is_retryable(ValueError("prompt bloqueado")))
+
+    def test_retry_after_sources(self):
+        self.assertEqual(rate_limiter.retry_after_seconds(HttpError(429, headers={"Retry-After": "7"})), 7.0)
+        self.assertEqual(rate_limiter.retry_after_seconds(HttpError(429, "retry_delay { seconds: 12 }")), 12.0)
+        self.assertEqual(rate_limiter.retry_after_seconds(HttpError(429, "Please retry in 3.5s.")), 3.5)
+        self.assertIsNone(rate_limiter.retry_after_seconds(HttpError(503)))
+
+    def test_retries_with_backoff_and_retry_after(self):
+        func = mock.Mock(side_effect=[HttpError(503), HttpError(429, headers={"Retry-After": "10"}), "ok"])
+        sleeps = []
+        with mock.patch("rate_limiter.random.uniform", side_effect=lambda low, high: high):
+            result = call_with_retry(func, max_retries=5, base_delay=2, max_delay=60, sleep=sleeps.append)
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(sleeps, [2, 12])        # backoff (2 * 2**0) e Retry-After + jitter
+
+    def test_backoff_is_capped(self):
+        with mock.patch("rate_limiter.random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual(rate_limiter.backoff_delay(10, 2, 60), 60)
+            # O Retry-After nunca é encurtado pelo limite do backoff exponencial
+            self.assertEqual(rate_limiter.backoff_delay(0, 2, 60, retry_after=300), 302)
+            # ...mas um valor absurdo é limitado a max_retry_after
+            self.assertEqual(rate_limiter.backoff_delay(0, 2, 60, retry_after=86400, max_retry_after=600), 602)
+
+    def test_gives_up_after_max_retries_and_on_permanent_errors(self):
+        func = mock.Mock(side_effect=HttpError(429))
+        with self.assertRaises(HttpError):
+            call_with_retry(func, max_retries=3, base_delay=0, max_delay=0, sleep=lambda s: None)
+        self.assertEqual(func.call_count, 4)
+
+        func = mock.Mock(side_effect=HttpError(400))
+        with self.assertRaises(HttpError):
+            call_with_retry(func, max_retries=3, base_delay=0, max_delay=0, sleep=lambda s: None)
+        self.assertEqual(func.call_count, 1)
+
+    def test_stop_event_interrupts_the_wait(self):
+        func = mock.Mock(side_effect=HttpError(429, headers={"Retry-After": "60"}))
+        stop_event = threading.Event()
+        threading.Timer(0.1, stop_event.set).start()
+        start = time.monotonic()
+        with self.assertRaises(rate_limiter.RetryCancelled):
+            call_with_retry(func, max_retries=5, base_delay=0, max_delay=0, stop_event=stop_event)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(func.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from response_cache import ResponseCache
+
+MODEL = "models/gemini-1.5-flash"
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(cache_dir=self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_uses_model_normalized_prompt_and_config(self):
+        self.cache.put(MODEL, "Analise:\r\ntexto  \n", "resposta")
+
+        self.assertEqual(self.cache.get(MODEL, "Analise:\ntexto"), "resposta")
+        self.assertIsNone(self.cache.get("models/gemini-1.5-pro", "Analise:\ntexto"))
+        self.assertIsNone(self.cache.get(MODEL, "Analise:\noutro texto"))
+        self.assertIsNone(self.cache.get(MODEL, "Analise:\ntexto", {"temperature": 0.2}))
+
+        self.cache.put(MODEL, "Analise:\ntexto", "resposta fria", {"temperature": 0.2})
+        self.assertEqual(self.cache.get(MODEL, "Analise:\ntexto", {"temperature": 0.2}), "resposta fria")
+        self.assertEqual(self.cache.get(MODEL, "Analise:\ntexto"), "resposta")
+
+    def test_expired_entries_are_dropped(self):
+        cache = ResponseCache(cache_dir=self.tmp_dir.name, ttl_hours=1)
+        cache.put(MODEL, "prompt", "resposta")
+        with mock.patch("response_cache.time.time", return_value=time.time() + 2 * 3600):
+            self.assertIsNone(cache.get(MODEL, "prompt"))
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_size_limit_evicts_least_recently_used(self):
+        cache = ResponseCache(cache_dir=self.tmp_dir.name, max_size_mb=1)
+        big = "x" * 400 * 1024
+        for i, name in enumerate(("a", "b", "c")):
+            cache.put(MODEL, name, big)
+            os.utime(os.path.join(self.tmp_dir.name, cache.make_key(MODEL, name) + ".json"), (i, i))
+
+        self.assertIsNone(cache.get(MODEL, "a"))
+        self.assertEqual(cache.get(MODEL, "c"), big)
+
+    def test_disabled_cache(self):
+        cache = ResponseCache(cache_dir=self.tmp_dir.name, enabled=False)
+        cache.put(MODEL, "prompt", "resposta")
+        self.assertIsNone(cache.get(MODEL, "prompt"))
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+if __name__ == "__main__":
+    unittest.main()
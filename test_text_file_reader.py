@@ -0,0 +1,45 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+
+import text_file_reader
+
+class TestTextFileReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_chunks_rebuild_the_document(self):
+        content = "Linha de requisito ção.\n" * 500
+        path = self._write("doc.txt", content)
+        chunks = list(text_file_reader.iter_text_chunks(path, chunk_chars=1000))
+        self.assertEqual("".join(chunks), content)
+        self.assertTrue(all(len(c) == 1000 for c in chunks[:-1]))
+        self.assertEqual(text_file_reader.read_text_file(path), content)
+
+    def test_rechunk_merges_and_splits_pieces(self):
+        pieces = ["ab", "", "cdefg", "h", "ijklmnopq"]
+        self.assertEqual(list(text_file_reader._rechunk(pieces, 4)), ["abcd", "efgh", "ijkl", "mnop", "q"])
+
+    def test_preview_only_first_chunk(self):
+        path = self._write("notas.md", "x" * 10000)
+        self.assertEqual(text_file_reader.read_preview(path, 3000), "x" * 3000)
+
+    def test_unsupported_format(self):
+        path = self._write("planilha.xyz", "\x00\x01\x02dados binários")
+        with self.assertRaises(RuntimeError):
+            text_file_reader.read_text_file(path)
+
+if __name__ == "__main__":
+    unittest.main()
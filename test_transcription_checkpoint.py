@@ -0,0 +1,30 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+
+from transcription_checkpoint import CheckpointWriter, checkpoint_path, load_checkpoint
+
+class TestTranscriptionCheckpoint(unittest.TestCase):
+
+    def test_resume_discards_truncated_line(self):
+        settings = {"model_size": "small"}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "saida.txt")
+            with CheckpointWriter(output_path, "hash", settings) as checkpoint:
+                checkpoint.add_segment({"start": 0.0, "end": 5.0, "text": "Primeira parte."})
+            # Queda durante a gravação do segundo segmento
+            with open(checkpoint_path(output_path), "a", encoding="utf-8") as f:
+                f.write('{"start": 5.0, "end": 10.0, "te')
+
+            with CheckpointWriter(output_path, "hash", settings, resume=True) as checkpoint:
+                checkpoint.add_segment({"start": 5.0, "end": 10.0, "text": "Segunda parte."})
+            segments = load_checkpoint(output_path, "hash", settings)
+
+        self.assertEqual([s["text"] for s in segments], ["Primeira parte.", "Segunda parte."])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import unittest
+from unittest import mock
+
+from whisper_model_pool import WhisperModelPool, estimate_model_memory_mb
+
+class TestWhisperModelPool(unittest.TestCase):
+
+    def setUp(self):
+        # Loader falso: cada chamada devolve um objeto novo, permitindo contar carregamentos
+        self.loader = mock.Mock(side_effect=lambda *args, **kwargs: object())
+
+    def test_reuses_loaded_model(self):
+        pool = WhisperModelPool(self.loader, max_models=2, memory_budget_mb=None)
+        with pool.borrow("small", "cpu", "int8") as first:
+            pass
+        with pool.borrow("small", "cpu", "int8") as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_lru_eviction_by_model_count(self):
+        pool = WhisperModelPool(self.loader, max_models=2, memory_budget_mb=None)
+        for size in ("tiny", "base", "tiny", "small"):
+            with pool.borrow(size, "cpu", "int8"):
+                pass
+        keys = [m["key"][0] for m in pool.stats()["models"]]
+        # "base" foi o menos usado recentemente e deve ter sido descartado
+        self.assertEqual(keys, ["tiny", "small"])
+
+    def test_memory_budget_eviction(self):
+        budget = estimate_model_memory_mb("medium", "int8") + 1
+        pool = WhisperModelPool(self.loader, max_models=5, memory_budget_mb=budget)
+        with pool.borrow("medium", "cpu", "int8"):
+            pass
+        with pool.borrow("small", "cpu", "int8"):
+            pass
+        keys = [m["key"][0] for m in pool.stats()["models"]]
+        self.assertEqual(keys, ["small"])
+
+    def test_models_in_use_are_not_evicted(self):
+        pool = WhisperModelPool(self.loader, max_models=1, memory_budget_mb=None)
+        with pool.borrow("tiny", "cpu", "int8"):
+            with pool.borrow("base", "cpu", "int8"):
+                self.assertEqual(len(pool.stats()["models"]), 2)
+        pool.clear()
+        self.assertEqual(pool.stats()["models"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import whisper_tuning
+
+class TestWhisperTuning(unittest.TestCase):
+
+    def setUp(self):
+        # Perfil isolado em diretório temporário
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        patcher = mock.patch.object(whisper_tuning, "_profile_path",
+                                    return_value=os.path.join(self.tmp_dir.name, "profile.json"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        whisper_tuning._profile = None
+        self.addCleanup(setattr, whisper_tuning, "_profile", None)
+
+    def test_auto_picks_int8_on_cpu(self):
+        with mock.patch.object(whisper_tuning, "_supported_compute_types",
+                               return_value={"float32", "int8", "int8_float32", "int16"}):
+            self.assertEqual(whisper_tuning.resolve_compute_type("auto", "cpu"), "int8_float32")
+
+    def test_auto_falls_back_to_float32(self):
+        with mock.patch.object(whisper_tuning, "_supported_compute_types", return_value={"float32"}):
+            self.assertEqual(whisper_tuning.resolve_compute_type("auto", "cpu"), "float32")
+
+    def test_explicit_compute_type_is_kept(self):
+        self.assertEqual(whisper_tuning.resolve_compute_type("float16", "cpu"), "float16")
+
+    def test_profile_is_persisted_with_rtf(self):
+        whisper_tuning.record_rtf("small", "int8", "cpu", audio_seconds=100, elapsed_seconds=25)
+        whisper_tuning._profile = None
+        profile = whisper_tuning.get_profile()
+        self.assertAlmostEqual(profile["measurements"]["cpu/small/int8"]["rtf"], 0.25)
+        self.assertGreaterEqual(whisper_tuning.model_load_kwargs("cpu")["cpu_threads"], 1)
+        self.assertEqual(whisper_tuning.model_load_kwargs("cuda"), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,64 +3,256 @@
 # Proibida a modificação e distribuição sem autorização do autor.
 
 # text_file_reader.py
+import json
 import os
 import logging
+import re
+
+from extraction_cache import ExtractionCache
+from text_readers import doc_reader, docx_reader, email_reader, html_reader, pdf_reader, plain_reader, registry, rtf_reader, subtitle_reader
 
 logger = logging.getLogger(__name__)
 
-def read_text_file(file_path):
+# Tamanho padrão (em caracteres) dos blocos produzidos por iter_text_chunks
+DEFAULT_CHUNK_CHARS = 64 * 1024
+
+# Texto já extraído: prévia, processamento e novas execuções sobre o mesmo documento não repetem o parser
+extraction_cache = ExtractionCache()
+
+# Intervalo (s) entre verificações do cancelamento enquanto se espera a extração de outra thread
+IN_FLIGHT_POLL_SECONDS = 0.5
+
+def _join_lines(lines, separator="\n"):
+    """Equivalente incremental de separator.join(lines)."""
+    first = True
+    for line in lines:
+        if not first:
+            yield separator
+        first = False
+        yield line
+
+def _read_plain(file_path, chunk_chars, max_workers):
+    # mmap + decodificação incremental, com a codificação detectada no início do arquivo
+    yield from plain_reader.iter_text(file_path, chunk_bytes=max(chunk_chars, 4096))
+
+def _read_docx(file_path, chunk_chars, max_workers):
+    # XML do corpo percorrido aos poucos: parágrafos, tabelas (linha a linha), cabeçalhos e rodapés
+    yield from _join_lines(docx_reader.iter_docx_lines(file_path))
+
+def _read_doc(file_path, chunk_chars, max_workers):
+    # Texto lido direto do binário do Word 97-2003 (tabela de peças)
+    try:
+        yield from doc_reader.iter_doc_text(file_path)
+    except doc_reader.DocFormatError as e:
+        if not registry.is_backend_available("textract"):
+            raise
+        # fallback para textract em variantes que o leitor binário não cobre
+        logger.warning(f"Leitura direta do .doc falhou ({e}). Usando textract.")
+        textract = registry.load_backend("textract")
+        yield textract.process(file_path).decode('utf-8')
+
+def _read_rtf(file_path, chunk_chars, max_workers):
+    yield from rtf_reader.iter_rtf_text(file_path)
+
+def _email_part_reader(transcription):
     """
-    Lê arquivos de texto nos formatos suportados e retorna o conteúdo como string UTF-8.
-    Suporta: .txt, .md, .docx, .doc, .rtf, .eml, .pdf (opcional), .html (opcional)
+    Leitor dos anexos de um e-mail: documentos pelo leitor do formato, áudios pela transcrição com
+    os ajustes indicados. Sem ajustes (ex: prévia), áudios não são transcritos: a prévia não pode
+    esperar uma transcrição inteira.
     """
-    ext = os.path.splitext(file_path)[1].lower()
+    def read_part(path):
+        spec = registry.detect_format(path)
+        if spec is None:
+            return None
+        if spec["kind"] == "audio":
+            if transcription is None:
+                return "[Anexo de áudio: transcrito apenas no processamento]"
+            import audio_transcriber  # importação pesada (torch): só quando há anexo de áudio
+            return audio_transcriber.transcribe_to_text(path, **transcription)
+        return "".join(iter_text_chunks(path, use_cache=False, transcription=transcription))
+    return read_part
+
+def _read_eml(file_path, chunk_chars, max_workers, options=None):
+    # Corpo e anexos (documentos, gravações, e-mails encaminhados) num único documento ordenado
+    transcription = (options or {}).get("transcription")
+    yield from email_reader.iter_email_sections(file_path, _email_part_reader(transcription))
 
+def _read_pdf(file_path, chunk_chars, max_workers):
+    # Páginas extraídas em paralelo, com fallback para PyPDF2 página a página
+    yield from _join_lines(pdf_reader.iter_pdf_pages(file_path, max_workers=max_workers))
+
+def _read_html(file_path, chunk_chars, max_workers):
+    # Tokenizador incremental (html.parser): sem árvore do documento, scripts e estilos descartados
+    produced = False
     try:
-        if ext in ('.txt', '.md', '.rtf'):
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
-        elif ext == '.docx':
-            from docx import Document
-            doc = Document(file_path)
-            return "\n".join([p.text for p in doc.paragraphs])
-        elif ext == '.doc':
-            try:
-                import mammoth
-                with open(file_path, "rb") as doc_file:
-                    result = mammoth.convert_to_html(doc_file)
-                    import re
-                    return re.sub('<[^<]+?>', '', result.value)
-            except ImportError:
-                # fallback para textract se mammoth não estiver instalado
-                import textract
-                text = textract.process(file_path)
-                return text.decode('utf-8')
-        elif ext == '.eml':
-            from email import policy
-            from email.parser import BytesParser
-            with open(file_path, 'rb') as f:
-                msg = BytesParser(policy=policy.default).parse(f)
-            return msg.get_body(preferencelist=('plain', 'html')).get_content()
-        elif ext == '.pdf':
-            try:
-                import pdfplumber
-                with pdfplumber.open(file_path) as pdf:
-                    return "\n".join(page.extract_text() or '' for page in pdf.pages)
-            except ImportError:
-                import PyPDF2
-                with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    return "\n".join(page.extract_text() or '' for page in reader.pages)
-        elif ext == '.html':
-            from bs4 import BeautifulSoup
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f, "html.parser")
-                return soup.get_text()
-        else:
-            raise ValueError(f"Formato de arquivo não suportado: {ext}")
+        for text in html_reader.iter_html_text(file_path):
+            produced = True
+            yield text
+    except Exception as e:
+        if produced or not registry.is_backend_available("bs4"):
+            raise
+        # fallback para BeautifulSoup em documentos que o tokenizador não consegue ler
+        logger.warning(f"Leitura incremental do HTML falhou ({e}). Usando BeautifulSoup.")
+        bs4 = registry.load_backend("bs4")
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            soup = bs4.BeautifulSoup(f, "html.parser")
+            for element in soup(["script", "style", "noscript", "template"]):
+                element.decompose()
+            yield soup.get_text("\n", strip=True)
+
+def _read_subtitles(file_path, chunk_chars, max_workers):
+    yield from subtitle_reader.iter_subtitle_text(file_path)
+
+# Formatos de documento. Assinaturas específicas (prioridade alta) prevalecem sobre a extensão;
+# contêineres ZIP sem membro identificável no cabeçalho ficam com prioridade menor.
+registry.register("text", ('.txt', '.md'), _read_plain, sniff=registry.looks_like_text, priority=-10)
+registry.register("rtf", ('.rtf',), _read_rtf, sniff=registry.magic(b"{\\rtf", textual=True), priority=10)
+registry.register("docx", ('.docx',), _read_docx,
+                  sniff=registry.zip_with(b"word/"), priority=10)
+registry.register("doc", ('.doc',), _read_doc,
+                  sniff=registry.magic(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"), priority=10)
+registry.register("pdf", ('.pdf',), _read_pdf, backends=("pdfplumber", "PyPDF2"),
+                  sniff=registry.pattern(rb"%PDF-"), priority=10)
+registry.register("html", ('.html', '.htm'), _read_html,
+                  sniff=registry.pattern(rb"(<!--.*?-->\s*)*<(!doctype\s+html|html|head|body)\b",
+                                         re.IGNORECASE | re.DOTALL), priority=5)
+registry.register("eml", ('.eml',), _read_eml, options=True,
+                  sniff=email_reader.looks_like_email, priority=1)
+registry.register("subtitles", ('.vtt', '.srt'), _read_subtitles,
+                  sniff=registry.pattern(rb"WEBVTT\b|\d+\s*\r?\n\d{2}:\d{2}:\d{2},\d{3} -->"), priority=10)
+
+# Leitores que já leem diretamente do disco: o cache não economizaria nada. Decidido pelo formato
+# detectado no conteúdo, não pela extensão (um .txt que na verdade é RTF passa pelo cache)
+UNCACHED_READERS = (_read_plain,)
+
+def _iter_pieces(file_path, spec, chunk_chars, max_workers, options):
+    """Produz o texto do arquivo em pedaços de tamanho variável, na ordem do documento."""
+    if spec is None or spec["reader"] is None:
+        raise ValueError(f"Formato de arquivo não suportado: {os.path.splitext(file_path)[1].lower()}")
+    if spec.get("options"):
+        return spec["reader"](file_path, chunk_chars, max_workers, options=options)
+    return spec["reader"](file_path, chunk_chars, max_workers)
+
+def _rechunk(pieces, chunk_chars):
+    """Reagrupa pedaços de tamanho variável em blocos de exatamente chunk_chars (o último pode ser menor)."""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_chars:
+            data = "".join(buffer)
+            cut = len(data) - len(data) % chunk_chars
+            for start in range(0, cut, chunk_chars):
+                yield data[start:start + chunk_chars]
+            rest = data[cut:]
+            buffer = [rest] if rest else []
+            size = len(rest)
+    if size:
+        yield "".join(buffer)
+
+def _iter_and_cache(file_path, chunks, variant):
+    """Repassa os blocos e, se o documento for lido até o fim e não for grande demais, guarda o texto no cache."""
+    collected = []
+    collected_chars = 0
+    for chunk in chunks:
+        if collected is not None:
+            collected.append(chunk)
+            collected_chars += len(chunk)
+            if collected_chars > extraction_cache.max_entry_chars:
+                collected = None
+        yield chunk
+    if collected is not None:
+        extraction_cache.put(file_path, "".join(collected), variant)
+
+def _cached_or_claim(file_path, variant, stop_event=None):
+    """
+    Texto em cache, ou a posse da extração. Se outra thread (ex: a pré-extração em segundo plano)
+    já está extraindo o mesmo documento, espera por ela e usa o resultado; a espera termina se
+    stop_event for acionado.
+    Retorna (texto, None), (None, chave a liberar) ou (None, None) no cancelamento.
+    """
+    while True:
+        key, in_flight = extraction_cache.claim(file_path, variant)
+        if in_flight is None:
+            # Outra extração pode ter terminado entre a consulta ao cache e o registro
+            cached = extraction_cache.get(file_path, variant)
+            if cached is not None:
+                extraction_cache.release(key)
+                return cached, None
+            return None, key
+        logger.info(f"Extração de '{os.path.basename(file_path)}' já em andamento. Aguardando o resultado.")
+        while not in_flight.wait(IN_FLIGHT_POLL_SECONDS):
+            if stop_event is not None and stop_event.is_set():
+                logger.info(f"Espera pela extração de '{os.path.basename(file_path)}' cancelada.")
+                return None, None
+        cached = extraction_cache.get(file_path, variant)
+        if cached is not None:
+            return cached, None
+
+def iter_text_chunks(file_path, chunk_chars=DEFAULT_CHUNK_CHARS, max_workers=None, use_cache=True, transcription=None,
+                     wait_in_flight=True, stop_event=None):
+    """
+    Lê o arquivo de forma incremental, produzindo o texto em blocos de até chunk_chars caracteres.
+    Texto puro e PDF são lidos aos poucos (memória constante); os demais formatos dependem de
+    bibliotecas que carregam o documento inteiro, mas a saída continua sendo entregue em blocos.
+    max_workers limita os processos usados na extração de PDFs (1 = sem pool).
+    transcription: ajustes da transcrição de anexos de áudio (model_size, use_gpu, beam_size,
+    compute_type); sem eles, os áudios anexados não são transcritos.
+    Com use_cache=True, um documento já extraído é servido do cache sem passar pelo parser
+    (exceto texto puro, reconhecido pelo conteúdo e já lido direto do disco); com
+    wait_in_flight=True, uma extração do mesmo documento já em andamento em outra thread é
+    aguardada em vez de repetida (com stop_event acionado durante essa espera, nada é produzido).
+    """
+    chunk_chars = max(1, chunk_chars)
+    key = None      # extração em andamento registrada por esta chamada (liberada no finally)
+    try:
+        spec = registry.detect_format(file_path)
+        use_cache = use_cache and spec is not None and spec["reader"] not in UNCACHED_READERS
+        # Formatos que usam os ajustes (e-mails com áudio anexado) têm uma entrada de cache por ajuste
+        variant = json.dumps(transcription, sort_keys=True) if spec and spec.get("options") and transcription else ""
+        cached = extraction_cache.get(file_path, variant) if use_cache else None
+        if cached is None and use_cache and wait_in_flight:
+            cached, key = _cached_or_claim(file_path, variant, stop_event)
+            if cached is None and key is None:
+                return
+        if cached is not None:
+            for start in range(0, len(cached), chunk_chars):
+                yield cached[start:start + chunk_chars]
+            return
+        options = {"transcription": transcription}
+        chunks = _rechunk(_iter_pieces(file_path, spec, chunk_chars, max_workers, options), chunk_chars)
+        yield from (_iter_and_cache(file_path, chunks, variant) if key is not None else chunks)
+    except GeneratorExit:
+        raise
     except Exception as e:
         logger.error(f"Erro ao ler o arquivo '{file_path}': {e}", exc_info=True)
         raise RuntimeError(f"Não foi possível ler o arquivo: {file_path}. Erro: {e}")
+    finally:
+        if key is not None:
+            extraction_cache.release(key)
+
+def read_preview(file_path, max_chars=3000):
+    """
+    Retorna apenas o início do documento (até max_chars caracteres), sem ler o restante e sem
+    esperar por uma extração completa em andamento.
+    """
+    chunks = iter_text_chunks(file_path, chunk_chars=max_chars, max_workers=1, wait_in_flight=False)
+    try:
+        return next(chunks, "")
+    finally:
+        chunks.close()
+
+def read_text_file(file_path, transcription=None):
+    """
+    Lê arquivos de texto nos formatos suportados e retorna o conteúdo como string UTF-8.
+    Suporta: .txt, .md, .docx, .doc, .rtf, .eml, .vtt, .srt, .html, .pdf (opcional),
+    além dos formatos registrados por plugins (ver text_readers/registry.py).
+    O formato é identificado pelo conteúdo do arquivo; a extensão só decide quando o conteúdo é ambíguo.
+    """
+    return "".join(iter_text_chunks(file_path, transcription=transcription))
 
 if __name__ == "__main__":
     # Teste rápido
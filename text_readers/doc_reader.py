@@ -0,0 +1,177 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/doc_reader.py
+# Texto de documentos Word 97-2003 (.doc) lido direto do binário, sem conversão intermediária:
+# o arquivo é um contêiner OLE2 (Compound File); o texto fica no fluxo WordDocument e a tabela
+# de peças (CLX, no fluxo 0Table/1Table) indica onde está cada trecho e se é cp1252 ou UTF-16.
+import logging
+import struct
+
+logger = logging.getLogger(__name__)
+
+OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_FREE_SECTOR = 0xFFFFFFFF
+_END_OF_CHAIN = 0xFFFFFFFE
+
+# Caracteres especiais do Word no texto do documento
+_WORD_CHARS = {
+    "\r": "\n",       # fim de parágrafo
+    "\x0b": "\n",     # quebra de linha manual
+    "\x0c": "\n",     # quebra de página/seção
+    "\x07": "\t",     # fim de célula/linha de tabela
+    "\x1e": "-",      # hífen não separável
+    "\x1f": "",       # hífen opcional
+    "\xa0": " ",
+    "\x01": "", "\x02": "", "\x03": "", "\x04": "", "\x05": "", "\x08": "",
+}
+_FIELD_BEGIN, _FIELD_SEPARATOR, _FIELD_END = "\x13", "\x14", "\x15"
+
+
+class DocFormatError(Exception):
+    """O arquivo não é um .doc legível por este leitor (formato inválido ou criptografado)."""
+
+
+class CompoundFile:
+    """Leitor mínimo de arquivos OLE2/Compound File Binary (somente leitura de fluxos pelo nome)."""
+
+    def __init__(self, data):
+        if not data.startswith(OLE2_SIGNATURE):
+            raise DocFormatError("Assinatura OLE2 ausente.")
+        self._data = data
+        sector_shift, mini_sector_shift = struct.unpack_from("<HH", data, 0x1E)
+        if sector_shift not in (9, 12) or mini_sector_shift != 6:
+            raise DocFormatError("Cabeçalho OLE2 inválido.")
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+        fat_sector_count, first_dir, _, self.mini_cutoff, first_minifat, minifat_count, first_difat, difat_count = \
+            struct.unpack_from("<IIIIIIII", data, 0x2C)
+        difat = [s for s in struct.unpack_from("<109I", data, 0x4C) if s != _FREE_SECTOR]
+        sector = first_difat
+        per_sector = self.sector_size // 4 - 1
+        for _ in range(difat_count):
+            if sector in (_FREE_SECTOR, _END_OF_CHAIN):
+                break
+            entries = struct.unpack_from(f"<{per_sector + 1}I", self._sector(sector))
+            difat.extend(s for s in entries[:per_sector] if s != _FREE_SECTOR)
+            sector = entries[per_sector]
+        self._fat = []
+        for fat_sector in difat[:fat_sector_count]:
+            self._fat.extend(struct.unpack_from(f"<{self.sector_size // 4}I", self._sector(fat_sector)))
+        self._entries = self._read_directory(self._read_chain(first_dir))
+        root = self._entries.get("Root Entry")
+        self._mini_stream = self._read_chain(root["start"])[:root["size"]] if root else b""
+        self._minifat = []
+        if minifat_count:
+            minifat = self._read_chain(first_minifat)
+            self._minifat = list(struct.unpack_from(f"<{len(minifat) // 4}I", minifat))
+
+    def _sector(self, index):
+        offset = (index + 1) * self.sector_size
+        return self._data[offset:offset + self.sector_size]
+
+    def _read_chain(self, start, fat=None, reader=None):
+        fat = self._fat if fat is None else fat
+        reader = reader or self._sector
+        parts = []
+        sector = start
+        seen = 0
+        while sector not in (_FREE_SECTOR, _END_OF_CHAIN):
+            if sector >= len(fat) or seen > len(fat):
+                raise DocFormatError("Cadeia de setores inválida.")
+            parts.append(reader(sector))
+            seen += 1
+            sector = fat[sector]
+        return b"".join(parts)
+
+    def _mini_sector(self, index):
+        offset = index * self.mini_sector_size
+        return self._mini_stream[offset:offset + self.mini_sector_size]
+
+    @staticmethod
+    def _read_directory(data):
+        entries = {}
+        for offset in range(0, len(data) - 127, 128):
+            name_length = struct.unpack_from("<H", data, offset + 0x40)[0]
+            entry_type = data[offset + 0x42]
+            if entry_type == 0 or name_length < 2:
+                continue
+            name = data[offset:offset + name_length - 2].decode("utf-16-le", errors="replace")
+            start, size = struct.unpack_from("<II", data, offset + 0x74)
+            entries[name] = {"type": entry_type, "start": start, "size": size}
+        return entries
+
+    def open_stream(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            raise DocFormatError(f"Fluxo '{name}' ausente.")
+        if entry["size"] < self.mini_cutoff:
+            data = self._read_chain(entry["start"], fat=self._minifat, reader=self._mini_sector)
+        else:
+            data = self._read_chain(entry["start"])
+        return data[:entry["size"]]
+
+
+def _iter_pieces(word_stream, table_stream, text_length):
+    """Trechos (str) do texto principal, na ordem do documento, a partir da tabela de peças."""
+    fc_clx, lcb_clx = struct.unpack_from("<II", word_stream, 0x01A2)
+    clx = table_stream[fc_clx:fc_clx + lcb_clx]
+    pos = 0
+    while pos < len(clx) and clx[pos] == 0x01:                    # Prc (formatação): ignorado
+        pos += 3 + struct.unpack_from("<H", clx, pos + 1)[0]
+    if pos >= len(clx) or clx[pos] != 0x02:
+        raise DocFormatError("Tabela de peças (CLX) inválida.")
+    lcb = struct.unpack_from("<I", clx, pos + 1)[0]
+    plc = clx[pos + 5:pos + 5 + lcb]
+    count = (lcb - 4) // 12
+    cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+    for i in range(count):
+        start_cp, end_cp = cps[i], min(cps[i + 1], text_length)
+        if start_cp >= text_length:
+            break
+        fc = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * i + 2)[0]
+        chars = end_cp - start_cp
+        if fc & 0x40000000:
+            offset = (fc & ~0x40000000) // 2
+            yield word_stream[offset:offset + chars].decode("cp1252", errors="replace")
+        else:
+            yield word_stream[fc:fc + 2 * chars].decode("utf-16-le", errors="replace")
+
+
+def _clean(pieces):
+    """Converte os caracteres especiais do Word e mantém só o resultado dos campos (não o código)."""
+    depth_in_code = []
+    for piece in pieces:
+        out = []
+        for char in piece:
+            if char == _FIELD_BEGIN:
+                depth_in_code.append(True)
+            elif char == _FIELD_SEPARATOR:
+                if depth_in_code:
+                    depth_in_code[-1] = False
+            elif char == _FIELD_END:
+                if depth_in_code:
+                    depth_in_code.pop()
+            elif any(depth_in_code):
+                continue
+            else:
+                out.append(_WORD_CHARS.get(char, char))
+        if out:
+            yield "".join(out)
+
+
+def iter_doc_text(file_path):
+    """Produz o texto principal do documento .doc em pedaços."""
+    with open(file_path, "rb") as f:
+        compound = CompoundFile(f.read())
+    word_stream = compound.open_stream("WordDocument")
+    if struct.unpack_from("<H", word_stream, 0)[0] != 0xA5EC:
+        raise DocFormatError("Fluxo WordDocument inválido.")
+    flags = struct.unpack_from("<H", word_stream, 0x0A)[0]
+    if flags & 0x0100:
+        raise DocFormatError("Documento protegido por senha.")
+    table_stream = compound.open_stream("1Table" if flags & 0x0200 else "0Table")
+    text_length = struct.unpack_from("<I", word_stream, 0x4C)[0]     # ccpText: texto principal
+    yield from _clean(_iter_pieces(word_stream, table_stream, text_length))
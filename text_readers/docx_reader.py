@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/docx_reader.py
+# Texto de documentos .docx lido direto do XML, sem montar o modelo de objetos do python-docx.
+# O membro word/document.xml é descompactado aos poucos e percorrido com iterparse, na ordem do
+# documento: parágrafos viram linhas, tabelas viram uma linha por linha da tabela (células
+# separadas por " | "). Cabeçalhos vêm antes do corpo e rodapés depois.
+import logging
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_P, _R, _T, _TAB, _BR, _CR = _W + "p", _W + "r", _W + "t", _W + "tab", _W + "br", _W + "cr"
+_TBL, _TR, _TC = _W + "tbl", _W + "tr", _W + "tc"
+_NO_BREAK_HYPHEN = _W + "noBreakHyphen"
+
+CELL_SEPARATOR = " | "
+
+_PART_NUMBER = re.compile(r"(\d+)\.xml$")
+
+
+def _part_order(name):
+    match = _PART_NUMBER.search(name)
+    return int(match.group(1)) if match else 0
+
+
+def iter_part_lines(stream):
+    """
+    Percorre um XML WordprocessingML (corpo, cabeçalho ou rodapé) e produz uma linha por
+    parágrafo ou por linha de tabela. Elementos já processados são removidos da árvore,
+    de modo que a memória não cresce com o tamanho do documento.
+    """
+    stack = []            # elementos abertos (para remover os já processados do pai)
+    paragraphs = []       # textos dos parágrafos abertos (caixas de texto podem aninhar parágrafos)
+    cells = []            # parágrafos de cada célula aberta
+    rows = []             # células de cada linha de tabela aberta
+    in_run = 0
+    in_fallback = 0       # conteúdo alternativo (VML) duplica o texto das caixas de texto
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == _MC_FALLBACK:
+                in_fallback += 1
+            elif in_fallback:
+                continue
+            elif tag == _P:
+                paragraphs.append([])
+            elif tag == _R:
+                in_run += 1
+            elif tag == _TR:
+                rows.append([])
+            elif tag == _TC:
+                cells.append([])
+            continue
+
+        stack.pop()
+        if tag == _MC_FALLBACK:
+            in_fallback -= 1
+            elem.clear()
+            continue
+        if in_fallback:
+            continue
+
+        line = None
+        if tag == _R:
+            in_run -= 1
+        elif in_run and paragraphs:
+            if tag == _T:
+                paragraphs[-1].append(elem.text or "")
+            elif tag == _TAB:
+                paragraphs[-1].append("\t")
+            elif tag in (_BR, _CR):
+                paragraphs[-1].append("\n")
+            elif tag == _NO_BREAK_HYPHEN:
+                paragraphs[-1].append("-")
+        if tag == _P:
+            line = "".join(paragraphs.pop())
+        elif tag == _TC:
+            text = " ".join(p.strip() for p in cells.pop() if p.strip())
+            if rows:
+                rows[-1].append(text)
+        elif tag == _TR:
+            cells_text = rows.pop()
+            line = CELL_SEPARATOR.join(cells_text) if any(cells_text) else ""
+
+        if line is not None:
+            if cells:
+                cells[-1].append(line)
+            elif paragraphs:
+                paragraphs[-1].append(line + " ")
+            else:
+                yield line
+        if tag in (_P, _TBL) and stack:
+            stack[-1].remove(elem)
+
+
+def iter_docx_lines(file_path):
+    """Linhas do documento: cabeçalhos (sem repetições), corpo e rodapés (sem repetições)."""
+    with zipfile.ZipFile(file_path) as archive:
+        names = archive.namelist()
+        headers = sorted((n for n in names if re.fullmatch(r"word/header\d*\.xml", n)), key=_part_order)
+        footers = sorted((n for n in names if re.fullmatch(r"word/footer\d*\.xml", n)), key=_part_order)
+
+        def lines_of(parts):
+            seen = set()
+            for name in parts:
+                with archive.open(name) as stream:
+                    text = "\n".join(line for line in iter_part_lines(stream) if line.strip())
+                if text and text not in seen:
+                    seen.add(text)
+                    yield text
+
+        yield from lines_of(headers)
+        with archive.open("word/document.xml") as stream:
+            yield from iter_part_lines(stream)
+        yield from lines_of(footers)
@@ -0,0 +1,174 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/email_reader.py
+# Leitura de e-mails (.eml) como um único documento: cabeçalhos, corpo e o conteúdo de cada
+# anexo (PDF, Word, gravações de reunião, e-mails encaminhados...), na ordem em que aparecem.
+# As partes MIME são percorridas uma única vez; cada anexo é gravado num diretório temporário e
+# entregue ao leitor do seu formato, todos em paralelo.
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.parser import BytesParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = int(os.environ.get("EMAIL_ATTACHMENT_WORKERS", "4"))
+
+HEADER_FIELDS = (("From", "De"), ("To", "Para"), ("Cc", "Cc"), ("Date", "Data"), ("Subject", "Assunto"))
+
+# Extensão usada quando o anexo não tem nome (o leitor ainda detecta o formato pelo conteúdo)
+_CONTENT_TYPE_EXTS = {
+    "text/html": ".html", "text/plain": ".txt", "application/pdf": ".pdf", "text/rtf": ".rtf",
+    "application/rtf": ".rtf", "application/msword": ".doc", "text/vtt": ".vtt",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "audio/mpeg": ".mp3", "audio/wav": ".wav", "audio/x-wav": ".wav", "audio/flac": ".flac",
+    "audio/mp4": ".m4a", "audio/x-m4a": ".m4a",
+}
+
+
+# Campos RFC 822 que caracterizam um e-mail; para ser reconhecido pelo conteúdo, o arquivo deve
+# começar por um bloco de cabeçalhos bem formado com pelo menos MIN_SNIFF_HEADERS deles
+SNIFF_HEADERS = {
+    b"received", b"return-path", b"delivered-to", b"mime-version", b"message-id", b"from", b"to",
+    b"cc", b"date", b"subject", b"reply-to", b"sender", b"content-type",
+}
+MIN_SNIFF_HEADERS = 2
+
+_HEADER_LINE = re.compile(rb"([!-9;-~]+):[ \t]")
+
+
+def looks_like_email(header):
+    """
+    Assinatura de .eml: todas as linhas iniciais (até a linha em branco ou o fim da amostra) são
+    cabeçalhos "Nome: valor" ou continuações, com pelo menos MIN_SNIFF_HEADERS campos distintos de
+    SNIFF_HEADERS. Uma nota que apenas começa com "From: " continua sendo texto.
+    """
+    if header.startswith(b"\xef\xbb\xbf"):
+        header = header[3:]
+    lines = header.lstrip().split(b"\n")
+    if len(lines) > 1:
+        lines = lines[:-1]      # última linha possivelmente cortada pela amostra
+    names = set()
+    for index, line in enumerate(lines):
+        line = line.rstrip(b"\r")
+        if not line:
+            break
+        if line[:1] in (b" ", b"\t") and index > 0:
+            continue
+        match = _HEADER_LINE.match(line)
+        if match is None:
+            return False
+        name = match.group(1).lower()
+        if name in SNIFF_HEADERS:
+            names.add(name)
+    return len(names) >= MIN_SNIFF_HEADERS
+
+
+def _header_block(message):
+    lines = []
+    for field, label in HEADER_FIELDS:
+        value = message.get(field)
+        if value:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
+
+def _safe_name(name, index, content_type):
+    name = os.path.basename(name or "")
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip(" .")
+    if not name:
+        name = f"parte_{index}{_CONTENT_TYPE_EXTS.get(content_type, '.bin')}"
+    return f"{index:03d}_{name}"
+
+
+def _preferred_alternative(part):
+    """Em multipart/alternative, a versão em texto puro; senão HTML; senão a primeira."""
+    alternatives = list(part.iter_parts())
+    for wanted in ("text/plain", "text/html"):
+        for alternative in alternatives:
+            if alternative.get_content_type() == wanted:
+                return alternative
+    return alternatives[0] if alternatives else None
+
+
+class _EmailWalker:
+    def __init__(self, work_dir, read_part, executor):
+        self.work_dir = work_dir
+        self.read_part = read_part
+        self.executor = executor
+        self.sections = []        # (título ou None, str | Future)
+        self.count = 0
+
+    def _submit(self, title, part, content_type):
+        self.count += 1
+        payload = part.get_payload(decode=True) or b""
+        path = os.path.join(self.work_dir, _safe_name(part.get_filename(), self.count, content_type))
+        with open(path, "wb") as f:
+            f.write(payload)
+        self.sections.append((title, self.executor.submit(self.read_part, path)))
+
+    def walk(self, part):
+        content_type = part.get_content_type()
+        if content_type == "message/rfc822":
+            inner = part.get_content()
+            self.sections.append(("Mensagem encaminhada", _header_block(inner)))
+            self.walk(inner)
+        elif content_type == "multipart/alternative":
+            preferred = _preferred_alternative(part)
+            if preferred is not None:
+                self.walk(preferred)
+        elif part.is_multipart():
+            for sub in part.iter_parts():
+                self.walk(sub)
+        elif part.is_attachment() or part.get_filename():
+            self._submit(f"Anexo: {part.get_filename() or content_type}", part, content_type)
+        elif content_type == "text/plain":
+            self.sections.append((None, part.get_content()))
+        elif content_type == "text/html":
+            # Corpo HTML: convertido em texto pelo mesmo leitor dos arquivos .html
+            self._submit(None, part, content_type)
+        else:
+            logger.debug(f"[email_reader] Parte inline ignorada: {content_type}")
+
+
+def iter_email_sections(file_path, read_part, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Produz o e-mail como texto, seção por seção e na ordem original: cabeçalhos, corpo e anexos.
+
+    read_part(caminho) recebe cada anexo (ou corpo HTML) gravado em arquivo temporário e retorna
+    seu texto, ou None se o formato não for suportado. As chamadas rodam em paralelo; uma falha
+    num anexo é registrada no documento sem interromper a leitura do restante.
+    """
+    with open(file_path, "rb") as f:
+        message = BytesParser(policy=policy.default).parse(f)
+
+    work_dir = tempfile.TemporaryDirectory(prefix="voxlog_eml_")
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="EmailPart")
+    completed = False
+    try:
+        walker = _EmailWalker(work_dir.name, read_part, executor)
+        yield _header_block(message) + "\n\n"
+        walker.walk(message)
+        for title, content in walker.sections:
+            if not isinstance(content, str):
+                try:
+                    content = content.result()
+                except Exception as e:
+                    logger.error(f"[email_reader] Falha ao ler '{title}' de '{file_path}': {e}", exc_info=True)
+                    content = f"[Não foi possível ler o conteúdo: {e}]"
+                if content is None:
+                    content = "[Formato não suportado]"
+            if title:
+                yield f"\n--- {title} ---\n"
+            yield content.strip() + "\n"
+        completed = True
+    finally:
+        # Consumidor parou no meio (ex: prévia): anexos ainda na fila são cancelados; os em andamento
+        # terminam antes de o diretório temporário ser removido
+        executor.shutdown(wait=True, cancel_futures=not completed)
+        work_dir.cleanup()
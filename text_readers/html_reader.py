@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/html_reader.py
+# Conversão de HTML em texto com o tokenizador incremental da biblioteca padrão (html.parser):
+# o arquivo é decodificado em blocos e entregue ao parser aos poucos, sem montar a árvore do
+# documento. Scripts, estilos e afins são descartados; elementos de bloco viram quebras de linha
+# e células de tabela são separadas por " | ". A memória usada não depende do tamanho do arquivo.
+import codecs
+import re
+from html.parser import HTMLParser
+
+from text_readers import plain_reader
+
+READ_BYTES = 256 * 1024
+
+# Bytes do início do arquivo procurados por <meta charset>
+CHARSET_SNIFF_BYTES = 4096
+
+# Elementos cujo conteúdo não é texto do documento
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "math", "iframe", "object", "canvas", "select"}
+
+# Elementos de bloco: quebra de linha antes e depois (parágrafos e títulos com linha em branco)
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "caption", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "header", "hr", "li", "main", "nav", "ol",
+    "section", "summary", "table", "title", "tr", "ul",
+}
+PARAGRAPH_TAGS = {"p", "pre", "h1", "h2", "h3", "h4", "h5", "h6"}
+CELL_TAGS = {"td", "th"}
+
+CELL_SEPARATOR = " | "
+
+# Elementos sem fechamento: uma tag de fechamento avulsa (</br>) é ignorada
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+
+_WHITESPACE = re.compile(r"\s+")
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+
+
+def sniff_html_encoding(sample):
+    """BOM > <meta charset> declarado no início do documento > detecção do texto puro."""
+    for bom, encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if sample.startswith(bom):
+            return encoding
+    match = _META_CHARSET.search(sample[:CHARSET_SNIFF_BYTES])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return plain_reader.sniff_encoding(sample)
+
+
+class HtmlTextExtractor(HTMLParser):
+    """Converte HTML em texto aos poucos: feed(bloco) e finish() devolvem o texto produzido."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._out = []
+        self._started = False        # algum texto já foi produzido (quebras no início são descartadas)
+        self._blank = True           # a saída termina em espaço ou quebra de linha
+        self._pending_newlines = 0
+        self._pending_space = False
+        self._skip_depth = 0
+        self._pre_depth = 0
+        self._cell_depth = 0
+        self._cells = []             # células já abertas em cada linha de tabela aberta
+
+    def _break(self, count=1):
+        if self._cell_depth:
+            # Blocos dentro de uma célula não quebram a linha da tabela
+            self._pending_space = True
+        elif self._started:
+            self._pending_newlines = max(self._pending_newlines, count)
+
+    def _write(self, text):
+        if self._pending_newlines:
+            self._out.append("\n" * self._pending_newlines)
+            self._pending_newlines = 0
+            self._blank = True
+        if self._pending_space and not self._blank:
+            self._out.append(" ")
+        self._pending_space = False
+        self._out.append(text)
+        self._started = True
+        self._blank = text[-1].isspace()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif self._skip_depth:
+            return
+        elif tag == "br":
+            if self._started:
+                self._pending_newlines += 1
+                self._pending_space = False
+        elif tag in PARAGRAPH_TAGS:
+            self._break(2)
+            self._pre_depth += tag == "pre"
+        elif tag in BLOCK_TAGS:
+            self._break()
+            if tag == "tr":
+                self._cells.append(0)
+        elif tag in CELL_TAGS:
+            if self._cells:
+                if self._cells[-1]:
+                    self._pending_space = False
+                    self._write(CELL_SEPARATOR)
+                self._cells[-1] += 1
+            self._cell_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif self._skip_depth or tag in _VOID_TAGS:
+            return
+        elif tag in PARAGRAPH_TAGS:
+            self._break(2)
+            if tag == "pre":
+                self._pre_depth = max(0, self._pre_depth - 1)
+        elif tag in CELL_TAGS:
+            self._cell_depth = max(0, self._cell_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._break()
+            if tag == "tr" and self._cells:
+                self._cells.pop()
+
+    def handle_data(self, data):
+        if self._skip_depth or not data:
+            return
+        if self._pre_depth:
+            self._write(data)
+            return
+        text = _WHITESPACE.sub(" ", data)
+        if text.startswith(" "):
+            self._pending_space = True
+        text = text.strip(" ")
+        if text:
+            self._write(text)
+            self._pending_space = data[-1].isspace()
+
+    def _take(self):
+        text = "".join(self._out)
+        self._out = []
+        return text
+
+    def feed(self, data):
+        super().feed(data)
+        return self._take()
+
+    def finish(self):
+        self.close()
+        return self._take()
+
+
+def iter_html_text(file_path, read_bytes=READ_BYTES):
+    """Produz o texto visível do documento HTML em pedaços, sem carregar o arquivo inteiro."""
+    with open(file_path, "rb") as f:
+        encoding = sniff_html_encoding(f.read(plain_reader.SNIFF_BYTES))
+    extractor = HtmlTextExtractor()
+    for block in plain_reader.iter_text(file_path, chunk_bytes=read_bytes, encoding=encoding):
+        text = extractor.feed(block)
+        if text:
+            yield text
+    tail = extractor.finish()
+    if tail:
+        yield tail
@@ -0,0 +1,170 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/pdf_reader.py
+# Extração de texto de PDFs com as páginas distribuídas num pool de processos.
+# Cada processo do pool abre o PDF uma única vez (ao ser criado) e atende tarefas que extraem
+# faixas curtas de páginas; a ordem das páginas é preservada na saída. Páginas que falham no
+# pdfplumber são lidas com o PyPDF2.
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Páginas por tarefa: faixas curtas limitam a memória de cada worker (o pdfplumber guarda
+# os objetos de layout das páginas já abertas) e equilibram melhor a carga entre processos.
+PAGES_PER_TASK = int(os.environ.get("PDF_PAGES_PER_TASK", "16"))
+
+# Abaixo deste número de páginas o custo de subir processos não compensa
+MIN_PAGES_FOR_POOL = int(os.environ.get("PDF_MIN_PAGES_FOR_POOL", "24"))
+
+# Cada processo é reciclado após algumas tarefas, devolvendo ao sistema a memória que o
+# parser de PDF não libera sozinho
+TASKS_PER_CHILD = 8
+
+
+def plan_page_ranges(page_count, pages_per_task=PAGES_PER_TASK):
+    """Divide [0, page_count) em faixas (início, fim) consecutivas de até pages_per_task páginas."""
+    pages_per_task = max(1, pages_per_task)
+    return [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+
+def count_pages(file_path):
+    try:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    except ImportError:
+        import PyPDF2
+        with open(file_path, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+
+class _PdfDocument:
+    """
+    PDF aberto para extrair várias faixas de páginas sem reabrir o arquivo: pdfplumber, se
+    disponível, e o PyPDF2 (aberto só quando necessário) para as páginas que falharem nele.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        try:
+            import pdfplumber
+            self._pdf = pdfplumber.open(file_path)
+        except ImportError:
+            self._pdf = None
+        self._fallback_file = None
+        self._fallback_reader = None
+
+    def _extract_pypdf2(self, index):
+        if self._fallback_reader is None:
+            import PyPDF2
+            self._fallback_file = open(self.file_path, "rb")
+            self._fallback_reader = PyPDF2.PdfReader(self._fallback_file)
+        return self._fallback_reader.pages[index].extract_text() or ""
+
+    def extract(self, start, end):
+        """Textos das páginas [start, end), um por página (vazio se a página for ilegível)."""
+        if self._pdf is None:
+            return [self._extract_pypdf2(index) for index in range(start, end)]
+        texts = []
+        for index in range(start, end):
+            page = self._pdf.pages[index]
+            try:
+                texts.append(page.extract_text() or "")
+            except Exception as e:
+                logger.warning(f"[pdf_reader] pdfplumber falhou na página {index + 1} de '{self.file_path}': {e}. Usando PyPDF2.")
+                try:
+                    texts.append(self._extract_pypdf2(index))
+                except Exception as fallback_error:
+                    logger.error(f"[pdf_reader] Página {index + 1} ilegível em '{self.file_path}': {fallback_error}")
+                    texts.append("")
+            finally:
+                # Libera os objetos de layout da página antes de seguir para a próxima
+                page.close()
+        return texts
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+        if self._fallback_file is not None:
+            self._fallback_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def extract_page_range(file_path, start, end):
+    """
+    Extrai o texto das páginas [start, end) e retorna a lista de textos, uma entrada por página.
+    Uma página que falha no pdfplumber é lida com o PyPDF2; se também falhar, fica vazia.
+    """
+    with _PdfDocument(file_path) as document:
+        return document.extract(start, end)
+
+
+# Documento aberto uma vez em cada processo do pool (ver _init_worker); o processo reciclado
+# após TASKS_PER_CHILD tarefas o reabre ao ser recriado
+_worker_document = None
+
+
+def _init_worker(file_path):
+    global _worker_document
+    _worker_document = _PdfDocument(file_path)
+
+
+def _extract_in_worker(start, end):
+    return _worker_document.extract(start, end)
+
+
+def default_worker_count():
+    return max(1, min(8, (os.cpu_count() or 1) - 1))
+
+
+def iter_pdf_pages(file_path, max_workers=None, pages_per_task=PAGES_PER_TASK):
+    """
+    Produz o texto de cada página do PDF, em ordem.
+    PDFs grandes são extraídos em paralelo; no máximo 2 faixas por worker ficam pendentes,
+    de modo que a memória do processo principal não cresce com o tamanho do documento.
+    """
+    page_count = count_pages(file_path)
+    ranges = plan_page_ranges(page_count, pages_per_task)
+    workers = max(1, min(max_workers or default_worker_count(), len(ranges)))
+
+    if page_count < MIN_PAGES_FOR_POOL or workers == 1:
+        with _PdfDocument(file_path) as document:
+            for start, end in ranges:
+                yield from document.extract(start, end)
+        return
+
+    logger.info(f"[pdf_reader] Extraindo {page_count} páginas de '{os.path.basename(file_path)}' com {workers} processos.")
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   max_tasks_per_child=TASKS_PER_CHILD,
+                                   initializer=_init_worker, initargs=(file_path,))
+    try:
+        pending = deque()
+        remaining = iter(ranges)
+        for start, end in remaining:
+            pending.append(executor.submit(_extract_in_worker, start, end))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            texts = pending.popleft().result()
+            next_range = next(remaining, None)
+            if next_range is not None:
+                pending.append(executor.submit(_extract_in_worker, *next_range))
+            yield from texts
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def read_pdf(file_path, max_workers=None):
+    """Retorna o texto completo do PDF, com as páginas separadas por quebra de linha."""
+    return "\n".join(iter_pdf_pages(file_path, max_workers=max_workers))
@@ -0,0 +1,130 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/plain_reader.py
+# Leitura de arquivos de texto puro (.txt, .md, logs de chat exportados) via mmap.
+# O arquivo é mapeado na memória e decodificado em blocos com um decodificador incremental:
+# nenhum momento tem o arquivo inteiro como string Python. A codificação é detectada uma única
+# vez a partir de uma amostra do início do arquivo.
+import codecs
+import logging
+import mmap
+import os
+
+logger = logging.getLogger(__name__)
+
+# Bytes lidos do início do arquivo para detectar a codificação
+SNIFF_BYTES = 64 * 1024
+
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+# BOMs mais longos primeiro: o BOM UTF-32 LE começa com o BOM UTF-16 LE
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def sniff_encoding(sample):
+    """
+    Detecta a codificação a partir dos primeiros bytes do arquivo:
+    BOM (UTF-8/16/32) > UTF-16 sem BOM (muitos bytes nulos alternados) > UTF-8 válido > cp1252 > latin-1.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if sample:
+        even_nulls = sample[0::2].count(0)
+        odd_nulls = sample[1::2].count(0)
+        half = len(sample) / 2
+        if odd_nulls > 0.4 * half and even_nulls < 0.05 * half:
+            return "utf-16-le"
+        if even_nulls > 0.4 * half and odd_nulls < 0.05 * half:
+            return "utf-16-be"
+    try:
+        # final=False: a amostra pode terminar no meio de um caractere multibyte
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+class MappedTextFile:
+    """
+    Arquivo de texto mapeado na memória (somente leitura).
+
+        with MappedTextFile(caminho) as doc:
+            for view in doc.iter_slices():    # memoryview, sem cópia
+                ...
+            for text in doc.iter_text():      # str decodificada em blocos
+                ...
+    """
+    def __init__(self, file_path, encoding=None):
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap não aceita arquivos vazios
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.encoding = encoding or sniff_encoding(self._map[:SNIFF_BYTES] if self._map else b"")
+        logger.debug(f"[plain_reader] '{os.path.basename(file_path)}': {self.size} bytes, codificação {self.encoding}.")
+
+    def iter_slices(self, chunk_bytes=DEFAULT_CHUNK_BYTES):
+        """Fatias do conteúdo bruto como memoryview sobre o mmap (sem cópia). Libere-as antes de close()."""
+        if self._map is None:
+            return
+        view = memoryview(self._map)
+        try:
+            for start in range(0, self.size, chunk_bytes):
+                yield view[start:start + chunk_bytes]
+        finally:
+            view.release()
+
+    def iter_text(self, chunk_bytes=DEFAULT_CHUNK_BYTES, errors="replace"):
+        """
+        Decodifica o conteúdo em blocos. Caracteres multibyte divididos entre dois blocos são
+        recompostos pelo decodificador incremental; bytes inválidos viram U+FFFD em vez de sumir.
+        """
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors=errors)
+        slices = self.iter_slices(chunk_bytes)
+        try:
+            for piece in slices:
+                try:
+                    text = decoder.decode(piece)
+                finally:
+                    piece.release()
+                if text:
+                    yield text
+        finally:
+            # Libera a view do mmap mesmo se o consumidor parar no meio (ex: prévia)
+            slices.close()
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def iter_text(file_path, chunk_bytes=DEFAULT_CHUNK_BYTES, encoding=None):
+    """Texto do arquivo em blocos, decodificado incrementalmente a partir do mmap."""
+    with MappedTextFile(file_path, encoding=encoding) as doc:
+        yield from doc.iter_text(chunk_bytes)
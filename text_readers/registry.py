@@ -0,0 +1,309 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/registry.py
+# Registro dos formatos de entrada (áudio e documentos), dos leitores de cada formato e das
+# bibliotecas (backends) de que dependem.
+#
+# O formato de um arquivo é detectado pelo conteúdo (assinaturas no cabeçalho, lido uma única vez)
+# e só então pela extensão, de modo que arquivos com extensão trocada (.doc que é .docx, .txt que
+# é HTML) chegam ao leitor certo. Nada é importado no registro: a disponibilidade dos backends é
+# consultada com importlib.util.find_spec e os módulos só são carregados no primeiro uso ou pelo
+# pré-aquecimento em segundo plano.
+#
+# Novos formatos podem ser registrados por outros pacotes, sem alterar este projeto, pelo grupo de
+# entry points "voxlog.readers": o objeto apontado é chamado com este módulo e deve chamar register().
+import importlib
+import importlib.util
+import logging
+import os
+import re
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "voxlog.readers"
+
+# Bytes do início do arquivo usados na detecção do formato
+HEADER_BYTES = 8192
+
+# módulo importável -> pacote pip que o fornece
+BACKEND_PACKAGES = {
+    "textract": "textract",
+    "pdfplumber": "pdfplumber",
+    "PyPDF2": "PyPDF2",
+    "bs4": "beautifulsoup4",
+}
+
+# Formatos cujos parsers valem a pena pré-carregar: são os mais comuns e os de importação mais lenta
+PREWARM_EXTS = ('.pdf',)
+
+_formats = {}
+_loaded = {}
+_load_lock = threading.Lock()
+_plugins_loaded = False
+_plugins_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------------------------
+# Assinaturas de conteúdo
+# ---------------------------------------------------------------------------------------------
+
+def _strip_leading(header):
+    """Remove BOM UTF-8 e espaços iniciais (para formatos textuais)."""
+    if header.startswith(b"\xef\xbb\xbf"):
+        header = header[3:]
+    return header.lstrip()
+
+
+def magic(*prefixes, offset=0, textual=False):
+    """Assinatura: o cabeçalho começa (na posição 'offset') com um dos prefixos."""
+    def sniff(header):
+        data = _strip_leading(header) if textual else header[offset:]
+        return any(data.startswith(prefix) for prefix in prefixes)
+    return sniff
+
+
+def pattern(regex, flags=0, textual=True):
+    """Assinatura: a expressão regular (bytes) casa no início do cabeçalho."""
+    compiled = re.compile(regex, flags)
+
+    def sniff(header):
+        return compiled.match(_strip_leading(header) if textual else header) is not None
+    return sniff
+
+
+def zip_with(*markers):
+    """Assinatura de contêineres ZIP (Office Open XML, OpenDocument) com um nome de membro no cabeçalho."""
+    def sniff(header):
+        return header.startswith(b"PK\x03\x04") and any(marker in header for marker in markers)
+    return sniff
+
+
+def looks_like_text(header):
+    """Cabeçalho sem bytes nulos e decodificável como UTF-8 ou cp1252 (texto puro)."""
+    if not header or b"\x00" in header:
+        return False
+    try:
+        header.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        # Caractere multibyte cortado no fim da amostra
+        if e.start >= len(header) - 3:
+            return True
+    try:
+        header.decode("cp1252")
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+# ---------------------------------------------------------------------------------------------
+# Registro
+# ---------------------------------------------------------------------------------------------
+
+def register(name, extensions, reader=None, kind="text", backends=(), sniff=None, priority=0, options=False):
+    """
+    Registra (ou substitui) um formato.
+
+    - extensions: extensões associadas (usadas quando o conteúdo não identifica o formato);
+    - reader: chamado como reader(file_path, chunk_chars, max_workers), produz o texto em pedaços
+      (formatos de áudio não têm leitor);
+    - kind: "text" ou "audio";
+    - backends: módulos usados pelo leitor, em ordem de preferência (basta um estar instalado);
+    - sniff: função(cabeçalho: bytes) -> bool que reconhece o formato pelo conteúdo;
+    - priority: desempate quando mais de um formato reconhece o conteúdo (maior vence).
+      Assinaturas com prioridade negativa são genéricas e só valem se a extensão não for conhecida.
+    - options: se True, o leitor também recebe os ajustes da leitura como argumento nomeado
+      'options' (ex: {"transcription": ...} para e-mails com áudio anexado).
+    """
+    _formats[name] = {
+        "name": name,
+        "extensions": tuple(ext.lower() for ext in extensions),
+        "reader": reader,
+        "kind": kind,
+        "backends": tuple(backends),
+        "sniff": sniff,
+        "priority": priority,
+        "options": options,
+    }
+
+
+def _load_plugins():
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    with _plugins_lock:
+        if _plugins_loaded:
+            return
+        _plugins_loaded = True
+        try:
+            from importlib.metadata import entry_points
+            plugins = entry_points(group=ENTRY_POINT_GROUP)
+        except Exception as e:
+            logger.warning(f"[registry] Não foi possível listar os plugins de leitura: {e}")
+            return
+        for plugin in plugins:
+            try:
+                plugin.load()(sys.modules[__name__])
+                logger.info(f"[registry] Plugin de leitura registrado: {plugin.name}")
+            except Exception as e:
+                logger.error(f"[registry] Falha ao registrar o plugin '{plugin.name}': {e}", exc_info=True)
+
+
+def formats(kind=None):
+    _load_plugins()
+    return [spec for spec in _formats.values() if kind is None or spec["kind"] == kind]
+
+
+def extensions(kind=None):
+    """Extensões conhecidas (opcionalmente só as de um tipo: "text" ou "audio")."""
+    return sorted({ext for spec in formats(kind) for ext in spec["extensions"]})
+
+
+def supported_extensions():
+    return extensions("text")
+
+
+def _formats_for_extension(ext, with_reader=False):
+    ext = ext.lower()
+    specs = [spec for spec in formats() if ext in spec["extensions"] and (spec["reader"] or not with_reader)]
+    return sorted(specs, key=lambda spec: -spec["priority"])
+
+
+def get_reader(ext):
+    candidates = _formats_for_extension(ext, with_reader=True)
+    if not candidates:
+        raise ValueError(f"Formato de arquivo não suportado: {ext}")
+    return candidates[0]["reader"]
+
+
+def read_header(file_path, size=HEADER_BYTES):
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(size)
+    except OSError:
+        return b""
+
+
+def detect_format(file_path, header=None):
+    """
+    Identifica o formato do arquivo com uma única leitura do cabeçalho. Ordem de decisão:
+    assinatura de conteúdo específica > extensão > assinatura genérica (ex: texto puro).
+    Retorna o registro do formato ou None.
+    """
+    if header is None:
+        header = read_header(file_path)
+    ext = os.path.splitext(file_path)[1].lower()
+
+    matches = []
+    if header:
+        for spec in formats():
+            if spec["sniff"] is None:
+                continue
+            try:
+                if spec["sniff"](header):
+                    matches.append(spec)
+            except Exception as e:
+                logger.debug(f"[registry] Assinatura de '{spec['name']}' falhou: {e}")
+    # Entre formatos de mesma prioridade, o que corresponde à extensão vence
+    matches.sort(key=lambda spec: (spec["priority"], ext in spec["extensions"]), reverse=True)
+
+    if matches and matches[0]["priority"] >= 0:
+        return matches[0]
+    by_extension = _formats_for_extension(ext)
+    if by_extension:
+        return by_extension[0]
+    return matches[0] if matches else None
+
+
+def detect_kind(file_path):
+    """"audio", "text" ou None."""
+    spec = detect_format(file_path)
+    return spec["kind"] if spec else None
+
+
+# ---------------------------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------------------------
+
+def is_backend_available(module_name):
+    """Indica se o módulo está instalado, sem importá-lo."""
+    if module_name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def load_backend(module_name):
+    """Importa (uma única vez) e retorna o módulo do backend. Lança ImportError se não estiver instalado."""
+    with _load_lock:
+        module = _loaded.get(module_name)
+        if module is None:
+            module = importlib.import_module(module_name)
+            _loaded[module_name] = module
+        return module
+
+
+def availability():
+    """
+    Situação de cada extensão de documento, sem importar os backends:
+    {ext: {"available": bool, "backends": {módulo: instalado}}}
+    """
+    report = {}
+    for ext in supported_extensions():
+        spec = _formats_for_extension(ext, with_reader=True)[0]
+        backends = {name: is_backend_available(name) for name in spec["backends"]}
+        report[ext] = {"available": not backends or any(backends.values()), "backends": backends}
+    return report
+
+
+def missing_packages(exts=None):
+    """Pacotes pip a instalar para que os formatos indicados (padrão: todos) tenham ao menos um backend."""
+    missing = []
+    for ext, status in availability().items():
+        if exts is not None and ext not in exts:
+            continue
+        if not status["available"]:
+            package = BACKEND_PACKAGES.get(next(iter(status["backends"])))
+            if package and package not in missing:
+                missing.append(package)
+    return missing
+
+
+def prewarm(exts=PREWARM_EXTS):
+    """Importa os backends instalados dos formatos indicados. Retorna os módulos carregados."""
+    loaded = []
+    for ext in exts:
+        specs = _formats_for_extension(ext, with_reader=True)
+        if not specs:
+            continue
+        for name in specs[0]["backends"]:
+            if not is_backend_available(name):
+                continue
+            try:
+                load_backend(name)
+                loaded.append(name)
+            except Exception as e:
+                logger.warning(f"[registry] Falha ao pré-carregar '{name}': {e}")
+            break
+    return loaded
+
+
+# ---------------------------------------------------------------------------------------------
+# Formatos de áudio (transcritos pelo audio_transcriber; não têm leitor de texto)
+# ---------------------------------------------------------------------------------------------
+
+_MP4_AUDIO_BRANDS = (b"M4A ", b"M4B ", b"mp41", b"mp42", b"isom", b"dash")
+
+register("mp3", (".mp3",), kind="audio",
+         sniff=magic(b"ID3", b"\xff\xfb", b"\xff\xf3", b"\xff\xf2", b"\xff\xe3"), priority=10)
+register("wav", (".wav",), kind="audio",
+         sniff=lambda header: header[:4] == b"RIFF" and header[8:12] == b"WAVE", priority=10)
+register("flac", (".flac",), kind="audio", sniff=magic(b"fLaC"), priority=10)
+register("m4a", (".m4a",), kind="audio",
+         sniff=lambda header: header[4:8] == b"ftyp" and header[8:12] in _MP4_AUDIO_BRANDS, priority=10)
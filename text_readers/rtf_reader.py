@@ -0,0 +1,192 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/rtf_reader.py
+# Conversão de RTF em texto por um tokenizador incremental: o arquivo é lido em blocos e as
+# palavras de controle são interpretadas à medida que chegam (grupos, destinos ignorados,
+# \uN com caracteres de substituição, \'hh na página de código do documento, inclusive páginas
+# de dois bytes como 932/936/949/950, e dados binários de \binN descartados).
+import codecs
+import re
+
+READ_BYTES = 256 * 1024
+
+# Destinos cujo conteúdo não é texto do documento
+SKIPPED_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "objdata", "themedata",
+    "colorschememapping", "datastore", "latentstyles", "listtable", "listoverridetable",
+    "rsidtbl", "generator", "xmlnstbl", "mmathPr", "filetbl", "revtbl", "pgdsctbl",
+    "fldinst", "header", "headerl", "headerr", "headerf", "footer", "footerl", "footerr",
+    "footerf", "footnote", "bkmkstart", "bkmkend", "nonshppict", "shppict", "listtext",
+}
+
+CONTROL_TEXT = {
+    "par": "\n", "line": "\n", "sect": "\n\n", "page": "\n\n", "row": "\n",
+    "tab": "\t", "cell": "\t", "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022",
+    "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d",
+    "emspace": " ", "enspace": " ", "qmspace": " ",
+}
+
+CONTROL_SYMBOLS = {"~": "\u00a0", "_": "\u2011", "-": "", "\\": "\\", "{": "{", "}": "}"}
+
+# Uma palavra de controle nunca passa deste tamanho; usado para não cortar tokens entre blocos
+_MAX_TOKEN = 48
+
+_TOKEN = re.compile(
+    r"\\([a-zA-Z]+)(-?\d+)? ?"       # palavra de controle
+    r"|\\'([0-9a-fA-F]{2})"          # byte em hexadecimal
+    r"|\\([^a-zA-Z'])"               # símbolo de controle
+    r"|([{}])"                       # grupo
+    r"|[\r\n]+"                      # quebras do arquivo (não fazem parte do texto)
+    r"|([^\\{}\r\n]+)"               # texto
+)
+
+
+def codepage_encoding(codepage, default="cp1252"):
+    """Codec Python da página de código \\ansicpgN; páginas sem codec (ex.: 10000, Mac) usam default."""
+    try:
+        return codecs.lookup(f"cp{codepage}").name
+    except LookupError:
+        return default
+
+
+class RtfTokenizer:
+    """Converte RTF em texto aos poucos: feed(bloco) e finish() devolvem o texto produzido."""
+
+    def __init__(self):
+        # Estado de cada grupo: (ignorar conteúdo, caracteres de substituição após \uN)
+        self._stack = []
+        self._skip = False
+        self._uc = 1
+        self._pending_skip = 0
+        self._set_encoding("cp1252")
+        self._star = False
+        self._buffer = ""
+        self._bin_remaining = 0      # bytes de \binN ainda a descartar
+
+    def _set_encoding(self, encoding):
+        self._encoding = encoding
+        # Decodificador incremental: em páginas de dois bytes, o primeiro \'hh de um caractere
+        # fica pendente até chegar o segundo
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._partial = False
+
+    def _decode_byte(self, value):
+        text = self._decoder.decode(bytes([value]))
+        self._partial = not text
+        return text
+
+    def _flush_bytes(self, out):
+        """Encerra um caractere de vários bytes interrompido por outro token (vira U+FFFD)."""
+        if self._partial:
+            out.append(self._decoder.decode(b"", final=True))
+            self._partial = False
+
+    def _consume_fallback(self, text):
+        """Descarta os caracteres de substituição que seguem um \\uN."""
+        if self._pending_skip:
+            dropped = min(self._pending_skip, len(text))
+            self._pending_skip -= dropped
+            text = text[dropped:]
+        return text
+
+    def _control_word(self, word, param, out):
+        if word == "bin":
+            # Dados binários, mesmo dentro de destinos ignorados: os N bytes seguintes não são RTF
+            self._bin_remaining = int(param or 0)
+            self._star = False
+            return
+        if self._star or word in SKIPPED_DESTINATIONS:
+            self._star = False
+            self._skip = True
+            return
+        if self._skip:
+            return
+        if word == "u" and param is not None:
+            code = int(param)
+            out.append(chr(code + 65536 if code < 0 else code))
+            self._pending_skip = self._uc
+        elif word == "uc" and param is not None:
+            self._uc = int(param)
+        elif word == "ansicpg" and param is not None:
+            self._set_encoding(codepage_encoding(param))
+        elif word in CONTROL_TEXT:
+            self._pending_skip = 0
+            out.append(CONTROL_TEXT[word])
+
+    def _process(self, data, final):
+        out = []
+        pos = 0
+        limit = len(data) - _MAX_TOKEN
+        while True:
+            if self._bin_remaining:
+                skipped = min(self._bin_remaining, len(data) - pos)
+                pos += skipped
+                self._bin_remaining -= skipped
+                if self._bin_remaining:
+                    break
+            match = _TOKEN.search(data, pos)
+            if match is None:
+                break
+            if not final and match.start() > limit and data[match.start()] == "\\":
+                break
+            pos = match.end()
+            word, param, hex_byte, symbol, brace, text = match.groups()
+            if hex_byte is None and (word or symbol or brace or text):
+                self._flush_bytes(out)
+            if brace == "{":
+                self._stack.append((self._skip, self._uc))
+                self._star = False
+            elif brace == "}":
+                self._star = False
+                if self._stack:
+                    self._skip, self._uc = self._stack.pop()
+            elif word is not None:
+                self._control_word(word, param, out)
+            elif hex_byte is not None:
+                if self._skip:
+                    continue
+                if self._pending_skip:
+                    self._pending_skip -= 1
+                    continue
+                out.append(self._decode_byte(int(hex_byte, 16)))
+            elif symbol is not None:
+                if symbol == "*":
+                    self._star = True
+                elif not self._skip and symbol in CONTROL_SYMBOLS:
+                    out.append(CONTROL_SYMBOLS[symbol])
+            elif text is not None and not self._skip:
+                text = self._consume_fallback(text)
+                if text:
+                    # Bytes acima de 127 fora de \'hh: reinterpretados na página de código do documento
+                    if not text.isascii():
+                        text = text.encode("latin-1", errors="replace").decode(self._encoding, errors="replace")
+                    out.append(text)
+        if final:
+            self._flush_bytes(out)
+        self._buffer = data[pos:]
+        return "".join(out)
+
+    def feed(self, chunk):
+        return self._process(self._buffer + chunk, final=False)
+
+    def finish(self):
+        return self._process(self._buffer, final=True)
+
+
+def iter_rtf_text(file_path, read_bytes=READ_BYTES):
+    """Produz o texto do documento RTF em pedaços, sem carregar o arquivo inteiro."""
+    tokenizer = RtfTokenizer()
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(read_bytes)
+            if not block:
+                break
+            # RTF é ASCII de 7 bits; latin-1 mapeia cada byte em um caractere, sem erros
+            text = tokenizer.feed(block.decode("latin-1"))
+            if text:
+                yield text
+    tail = tokenizer.finish()
+    if tail:
+        yield tail
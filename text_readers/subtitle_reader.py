@@ -0,0 +1,48 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# text_readers/subtitle_reader.py
+# Legendas (.vtt, .srt) exportadas por ferramentas de reunião: mantém só o texto falado,
+# descartando numeração, tempos, blocos NOTE/STYLE e marcações de estilo.
+import re
+
+from text_readers import plain_reader
+
+_TIMING = re.compile(r"^\s*\d{1,2}:?\d{2}:\d{2}[.,]\d{3}\s*-->")
+_TIMING_SHORT = re.compile(r"^\s*\d{2}:\d{2}[.,]\d{3}\s*-->")
+_CUE_NUMBER = re.compile(r"^\s*\d+\s*$")
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _iter_lines(chunks):
+    """Linhas de um texto entregue em blocos, sem montar o texto inteiro."""
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_subtitle_text(file_path, chunk_bytes=plain_reader.DEFAULT_CHUNK_BYTES):
+    """Produz as falas da legenda, uma por linha, na ordem dos cues. Falas repetidas em sequência são omitidas."""
+    skipping_block = False
+    previous = None
+    for raw in _iter_lines(plain_reader.iter_text(file_path, chunk_bytes=chunk_bytes)):
+        line = raw.strip()
+        if not line:
+            skipping_block = False
+            continue
+        if skipping_block:
+            continue
+        if line.startswith("WEBVTT") or line.startswith(("NOTE", "STYLE", "REGION")):
+            skipping_block = True
+            continue
+        if _CUE_NUMBER.match(line) or _TIMING.match(line) or _TIMING_SHORT.match(line):
+            continue
+        text = _TAG.sub("", line).strip()
+        if text and text != previous:
+            yield text + "\n"
+            previous = text
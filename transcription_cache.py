@@ -0,0 +1,122 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# transcription_cache.py
+# Cache persistente de transcrições, endereçado pelo conteúdo do áudio e pelos parâmetros de decodificação.
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from app_cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_MB = int(os.environ.get("TRANSCRIPTION_CACHE_MAX_MB", "200"))
+CACHE_VERSION = 1
+
+def make_settings(model_size, beam_size, compute_type, language=None):
+    """Parâmetros de decodificação que influenciam o texto transcrito (e portanto a chave do cache)."""
+    return {
+        "model_size": model_size,
+        "beam_size": beam_size,
+        "compute_type": compute_type,
+        "language": language or "auto",
+    }
+
+class TranscriptionCache:
+    """
+    Guarda a lista de segmentos de cada transcrição em um arquivo JSON por chave,
+    onde chave = hash(hash do áudio + parâmetros de decodificação).
+    O uso mais recente é registrado no mtime do arquivo; quando o tamanho total passa de
+    max_size_mb, as entradas usadas há mais tempo são removidas (LRU).
+    """
+    def __init__(self, cache_dir=None, max_size_mb=DEFAULT_MAX_SIZE_MB):
+        self.cache_dir = cache_dir or get_cache_dir("transcriptions")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio_hash, settings):
+        payload = json.dumps({"audio_hash": audio_hash, "settings": settings, "version": CACHE_VERSION}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, audio_hash, settings):
+        """Retorna a lista de segmentos em cache ou None."""
+        path = self._entry_path(self.make_key(audio_hash, settings))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[transcription_cache] Entrada de cache corrompida '{path}': {e}. Descartando.")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        logger.info(f"[transcription_cache] Transcrição encontrada em cache ({len(entry['segments'])} segmentos).")
+        return entry["segments"]
+
+    def put(self, audio_hash, settings, segments):
+        key = self.make_key(audio_hash, settings)
+        path = self._entry_path(key)
+        entry = {
+            "version": CACHE_VERSION,
+            "audio_hash": audio_hash,
+            "settings": settings,
+            "created_at": time.time(),
+            "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in segments],
+        }
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            logger.info(f"[transcription_cache] Transcrição armazenada em cache: {key[:12]}...")
+        except Exception as e:
+            logger.warning(f"[transcription_cache] Não foi possível gravar o cache: {e}")
+            self._remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                logger.info(f"[transcription_cache] Entrada removida por limite de tamanho (LRU): {os.path.basename(path)}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# transcription_checkpoint.py
+# Checkpoint em disco (arquivo ao lado da saída) para retomar transcrições interrompidas.
+#
+# Formato JSON Lines: a primeira linha é o cabeçalho (hash do áudio e parâmetros de decodificação),
+# cada linha seguinte é um segmento já transcrito. O arquivo só cresce por append, então gravar um
+# segmento custa O(1); uma linha truncada por queda é descartada na leitura e cortada do arquivo
+# antes de retomar a gravação.
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+CHECKPOINT_VERSION = 1
+
+def checkpoint_path(output_path):
+    return output_path + CHECKPOINT_SUFFIX
+
+def load_checkpoint(output_path, audio_hash, settings):
+    """
+    Lê o checkpoint de output_path. Retorna a lista de segmentos [{"start", "end", "text"}]
+    se ele pertence ao mesmo áudio e aos mesmos parâmetros; caso contrário retorna None.
+    """
+    path = checkpoint_path(output_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if (header.get("version") != CHECKPOINT_VERSION
+                    or header.get("audio_hash") != audio_hash
+                    or header.get("settings") != settings):
+                logger.info(f"[transcription_checkpoint] Checkpoint em '{path}' é de outro áudio ou de outros parâmetros. Ignorando.")
+                return None
+            segments = []
+            for line in f:
+                if not line.endswith("\n"):
+                    # última linha incompleta (interrupção durante a gravação)
+                    break
+                try:
+                    segments.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        logger.info(f"[transcription_checkpoint] Checkpoint encontrado: {len(segments)} segmentos, até {segments[-1]['end'] if segments else 0:.1f}s.")
+        return segments
+    except Exception as e:
+        logger.warning(f"[transcription_checkpoint] Não foi possível ler o checkpoint '{path}': {e}")
+        return None
+
+def remove_checkpoint(output_path):
+    path = checkpoint_path(output_path)
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"[transcription_checkpoint] Checkpoint removido: {path}")
+    except OSError as e:
+        logger.warning(f"[transcription_checkpoint] Não foi possível remover o checkpoint '{path}': {e}")
+
+def _valid_length(path):
+    """Tamanho em bytes do trecho íntegro do checkpoint: até o fim da última linha JSON completa."""
+    valid = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+            valid += len(line)
+    return valid
+
+class CheckpointWriter:
+    """
+    Grava os segmentos no checkpoint à medida que são transcritos.
+    Com resume=True, continua um checkpoint válido existente (descartando uma linha final
+    incompleta); senão começa um novo.
+    """
+    def __init__(self, output_path, audio_hash, settings, resume=False, fsync_every_segments=20):
+        self.path = checkpoint_path(output_path)
+        self.audio_hash = audio_hash
+        self.settings = settings
+        self.resume = resume
+        self.fsync_every_segments = fsync_every_segments
+        self._file = None
+        self._pending = 0
+
+    def __enter__(self):
+        valid = _valid_length(self.path) if self.resume and os.path.exists(self.path) else 0
+        if valid:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid)
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            header = {
+                "version": CHECKPOINT_VERSION,
+                "audio_hash": self.audio_hash,
+                "settings": self.settings,
+                "created_at": time.time(),
+            }
+            self._file.write(json.dumps(header) + "\n")
+            self._file.flush()
+        return self
+
+    def add_segment(self, segment):
+        record = {"start": segment["start"], "end": segment["end"], "text": segment["text"]}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._pending += 1
+        if self._pending >= self.fsync_every_segments:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        return False
@@ -0,0 +1,187 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# transcription_process.py
+# Processo filho dedicado à transcrição. O modelo Whisper vive no filho e os segmentos chegam
+# ao processo principal por um Pipe. Cancelamento ou timeout encerram o filho imediatamente,
+# liberando CPU e memória do CTranslate2 na hora, sem esperar o fim do segmento em decodificação.
+import logging
+import multiprocessing
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (s) entre verificações de cancelamento enquanto se espera o próximo segmento
+POLL_INTERVAL_SECONDS = 0.2
+
+
+class TranscriptionCancelled(Exception):
+    """A transcrição no processo filho foi interrompida (cancelamento ou timeout)."""
+
+
+class TranscriptionProcessError(RuntimeError):
+    """O processo filho terminou sem ter sido cancelado (queda, falta de memória, pipe fechado)."""
+
+    def __init__(self, exitcode=None):
+        self.exitcode = exitcode
+        super().__init__(f"O processo de transcrição terminou inesperadamente (código de saída: {exitcode}).")
+
+
+def _serve(conn):
+    """Laço principal do processo filho: atende pedidos de pré-carga e de transcrição."""
+    from whisper_model_pool import WhisperModelPool
+
+    def load(model_size, device, compute_type, **load_kwargs):
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_size, device=device, compute_type=compute_type, **load_kwargs)
+
+    # Pool próprio do filho: modelos continuam "quentes" entre transcrições enquanto o filho viver
+    pool = WhisperModelPool(load)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        op = request["op"]
+        if op == "shutdown":
+            return
+        try:
+            with pool.borrow(request["model_size"], request["device"], request["compute_type"],
+                             **request["load_kwargs"]) as model:
+                if op == "preload":
+                    conn.send(("done", None))
+                    continue
+                segments, info = model.transcribe(request["audio_path"], beam_size=request["beam_size"],
+                                                  **request["transcribe_kwargs"])
+                conn.send(("info", info.duration))
+                for segment in segments:
+                    conn.send(("segment", {"start": segment.start, "end": segment.end, "text": segment.text}))
+                conn.send(("done", None))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class TranscriptionWorkerProcess:
+    """
+    Gerencia o processo filho de transcrição. O filho é criado sob demanda e reaproveitado
+    entre transcrições; terminate() o encerra à força e o próximo pedido cria um novo.
+    """
+    def __init__(self):
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(target=_serve, args=(child_conn,), name="TranscriptionWorker", daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        logger.info(f"[transcription_process] Processo de transcrição iniciado (pid={self._process.pid}).")
+
+    def terminate(self):
+        """Encerra o processo filho imediatamente (memória do modelo é devolvida ao sistema)."""
+        process, conn = self._process, self._conn
+        self._process, self._conn = None, None
+        if process is None:
+            return
+        if process.is_alive():
+            process.terminate()
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            logger.info(f"[transcription_process] Processo de transcrição encerrado à força (pid={process.pid}).")
+        if conn is not None:
+            conn.close()
+
+    def _receive(self, stop_event):
+        conn = self._conn
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                self.terminate()
+                raise TranscriptionCancelled("Transcrição cancelada.")
+            try:
+                if conn is None or conn.closed:
+                    raise OSError("pipe fechado")
+                if conn.poll(POLL_INTERVAL_SECONDS):
+                    return conn.recv()
+            except (EOFError, OSError):
+                # terminate() chamado por outra thread após acionar o stop_event (ex: timeout)
+                if stop_event is not None and stop_event.is_set():
+                    raise TranscriptionCancelled("Transcrição cancelada.")
+                raise TranscriptionProcessError(self._exit_code())
+
+    def _exit_code(self):
+        """Código de saída do filho que fechou o pipe (encerrando-o, se ainda estiver vivo)."""
+        process = self._process
+        exitcode = None
+        if process is not None:
+            process.join(1)
+            exitcode = process.exitcode
+        self.terminate()
+        return exitcode
+
+    def preload(self, model_size, device, compute_type, load_kwargs=None):
+        with self._lock:
+            self._ensure_started()
+            self._conn.send({"op": "preload", "model_size": model_size, "device": device,
+                             "compute_type": compute_type, "load_kwargs": load_kwargs or {}})
+            message = self._receive(None)
+        if message[0] == "error":
+            raise RuntimeError(message[1])
+
+    def iter_segments(self, audio_path, model_size, device, compute_type, beam_size,
+                      load_kwargs=None, transcribe_kwargs=None, stop_event=None):
+        """
+        Transcreve no processo filho, produzindo (duração, segmento) à medida que chegam.
+        Se stop_event for acionado, o filho é encerrado e TranscriptionCancelled é lançada.
+        Apenas uma transcrição por vez usa o processo filho; enquanto ele está ocupado (ex: pré-carga
+        do modelo), a espera pela vez também é interrompida pelo stop_event.
+        """
+        while not self._lock.acquire(timeout=POLL_INTERVAL_SECONDS):
+            if stop_event is not None and stop_event.is_set():
+                raise TranscriptionCancelled("Transcrição cancelada.")
+        try:
+            self._ensure_started()
+            self._conn.send({
+                "op": "transcribe", "audio_path": audio_path, "model_size": model_size, "device": device,
+                "compute_type": compute_type, "beam_size": beam_size,
+                "load_kwargs": load_kwargs or {}, "transcribe_kwargs": transcribe_kwargs or {},
+            })
+            duration = None
+            completed = False
+            try:
+                while True:
+                    kind, payload = self._receive(stop_event)
+                    if kind == "info":
+                        duration = payload
+                    elif kind == "segment":
+                        yield duration, payload
+                    elif kind == "done":
+                        completed = True
+                        return
+                    else:
+                        # Erro tratado no filho: ele continua apto a atender novos pedidos
+                        completed = True
+                        raise RuntimeError(payload)
+            finally:
+                # Consumidor parou no meio (ex: gerador fechado): o filho ainda está decodificando
+                if not completed:
+                    self.terminate()
+        finally:
+            self._lock.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                try:
+                    self._conn.send({"op": "shutdown"})
+                    self._process.join(5)
+                except (OSError, ValueError):
+                    pass
+            self.terminate()
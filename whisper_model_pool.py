@@ -0,0 +1,182 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# whisper_model_pool.py
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Quantidade aproximada de parâmetros (em milhões) de cada modelo Whisper.
+MODEL_PARAMS_MILLIONS = {
+    "tiny": 39,
+    "tiny.en": 39,
+    "base": 74,
+    "base.en": 74,
+    "small": 244,
+    "small.en": 244,
+    "medium": 769,
+    "medium.en": 769,
+    "large": 1550,
+    "large-v1": 1550,
+    "large-v2": 1550,
+    "large-v3": 1550,
+}
+
+BYTES_PER_PARAM = {
+    "float32": 4.0,
+    "float16": 2.0,
+    "bfloat16": 2.0,
+    "int8_float32": 1.1,
+    "int8_float16": 1.1,
+    "int8_bfloat16": 1.1,
+    "int8": 1.0,
+    "int16": 2.0,
+}
+
+# Margem para buffers do CTranslate2, tokenizer e extratores de features.
+MEMORY_OVERHEAD_FACTOR = 1.3
+
+DEFAULT_MAX_MODELS = int(os.environ.get("WHISPER_POOL_MAX_MODELS", "2"))
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get("WHISPER_POOL_MAX_MB", "6144"))
+
+
+def estimate_model_memory_mb(model_size, compute_type):
+    """
+    Estima a memória (MB) ocupada por um modelo carregado.
+    Modelos desconhecidos (ex: caminhos locais) são tratados como 'large' (pior caso).
+    """
+    params = MODEL_PARAMS_MILLIONS.get(model_size, MODEL_PARAMS_MILLIONS["large"])
+    bytes_per_param = BYTES_PER_PARAM.get(compute_type, BYTES_PER_PARAM["float32"])
+    return int(params * bytes_per_param * MEMORY_OVERHEAD_FACTOR)
+
+
+class WhisperModelPool:
+    """
+    Registro de modelos Whisper já carregados, indexado por (model_size, device, compute_type).
+    Mantém as instâncias "quentes" entre transcrições e descarta as menos usadas (LRU)
+    quando o número máximo de modelos ou o orçamento de memória é excedido.
+    Modelos emprestados (em uso) nunca são descartados.
+    """
+    def __init__(self, loader, max_models=DEFAULT_MAX_MODELS, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+        self._loader = loader
+        self.max_models = max(1, max_models)
+        self.memory_budget_mb = memory_budget_mb
+        self._models = OrderedDict()
+        self._loading_locks = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _make_key(model_size, device, compute_type, load_kwargs):
+        return (model_size, device, compute_type) + tuple(sorted(load_kwargs.items()))
+
+    def acquire(self, model_size, device, compute_type, **load_kwargs):
+        """
+        Retorna um modelo do pool (carregando-o se necessário) e o marca como em uso.
+        Todo acquire deve ser seguido de release (ou use borrow()).
+        """
+        key = self._make_key(model_size, device, compute_type, load_kwargs)
+        with self._lock:
+            model = self._checkout(key)
+            if model is not None:
+                return model
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+
+        # Um lock por chave evita que duas threads carreguem o mesmo modelo em paralelo.
+        with loading_lock:
+            with self._lock:
+                model = self._checkout(key)
+                if model is not None:
+                    return model
+                memory_mb = estimate_model_memory_mb(model_size, compute_type)
+                self._evict_for(memory_mb)
+
+            logger.info(f"[whisper_model_pool] Carregando modelo: {model_size} (device={device}, compute_type={compute_type}, ~{memory_mb} MB)")
+            start_time = time.time()
+            model = self._loader(model_size, device, compute_type, **load_kwargs)
+            logger.info(f"[whisper_model_pool] Modelo {model_size} carregado em {time.time() - start_time:.1f} segundos.")
+
+            with self._lock:
+                self._models[key] = {"model": model, "memory_mb": memory_mb, "in_use": 1}
+                self._loading_locks.pop(key, None)
+            return model
+
+    def release(self, model_size, device, compute_type, **load_kwargs):
+        """Devolve ao pool um modelo obtido com acquire()."""
+        key = self._make_key(model_size, device, compute_type, load_kwargs)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry["in_use"] > 0:
+                entry["in_use"] -= 1
+
+    @contextmanager
+    def borrow(self, model_size, device, compute_type, **load_kwargs):
+        """Empresta um modelo do pool durante o bloco 'with'."""
+        model = self.acquire(model_size, device, compute_type, **load_kwargs)
+        try:
+            yield model
+        finally:
+            self.release(model_size, device, compute_type, **load_kwargs)
+
+    def _checkout(self, key):
+        entry = self._models.get(key)
+        if entry is None:
+            return None
+        self._models.move_to_end(key)
+        entry["in_use"] += 1
+        logger.info(f"[whisper_model_pool] Reutilizando modelo já carregado: {key[0]} (device={key[1]}, compute_type={key[2]})")
+        return entry["model"]
+
+    def _used_memory_mb(self):
+        return sum(entry["memory_mb"] for entry in self._models.values())
+
+    def _evict_for(self, incoming_mb):
+        while self._models and (
+            len(self._models) >= self.max_models
+            or (self.memory_budget_mb and self._used_memory_mb() + incoming_mb > self.memory_budget_mb)
+        ):
+            idle_key = next((k for k, e in self._models.items() if e["in_use"] == 0), None)
+            if idle_key is None:
+                logger.warning("[whisper_model_pool] Limite do pool excedido, mas todos os modelos estão em uso. Carregando mesmo assim.")
+                break
+            self._drop(idle_key)
+
+    def _drop(self, key):
+        entry = self._models.pop(key)
+        logger.info(f"[whisper_model_pool] Descartando modelo (LRU): {key[0]} (device={key[1]}, compute_type={key[2]}, ~{entry['memory_mb']} MB)")
+        del entry
+        gc.collect()
+
+    def evict(self, model_size, device, compute_type, **load_kwargs):
+        """Remove um modelo ocioso do pool. Retorna True se ele foi descartado."""
+        key = self._make_key(model_size, device, compute_type, load_kwargs)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None or entry["in_use"] > 0:
+                return False
+            self._drop(key)
+            return True
+
+    def clear(self):
+        """Remove todos os modelos ociosos do pool."""
+        with self._lock:
+            for key in [k for k, e in self._models.items() if e["in_use"] == 0]:
+                self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "models": [
+                    {"key": key, "memory_mb": e["memory_mb"], "in_use": e["in_use"]}
+                    for key, e in self._models.items()
+                ],
+                "used_memory_mb": self._used_memory_mb(),
+                "memory_budget_mb": self.memory_budget_mb,
+                "max_models": self.max_models,
+            }
@@ -0,0 +1,186 @@
+# Copyright (c) 2025 Cesar Contipelli Neto
+# Todos os direitos reservados.
+# Proibida a modificação e distribuição sem autorização do autor.
+
+# whisper_tuning.py
+# Escolha automática de compute_type e número de threads do faster-whisper para a máquina atual.
+import json
+import logging
+import os
+import platform
+import threading
+import time
+
+from app_cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+AUTO_COMPUTE_TYPE = "auto"
+PROFILE_VERSION = 1
+
+# Ordem de preferência: o primeiro tipo suportado pelo CTranslate2 no dispositivo é escolhido.
+# Na CPU, int8 (pesos int8, ativações float32) é o mais rápido sem perda perceptível de qualidade;
+# float16 não tem implementação eficiente na CPU e é evitado.
+CPU_COMPUTE_PREFERENCE = ["int8_float32", "int8", "float32"]
+CUDA_COMPUTE_PREFERENCE = ["float16", "int8_float16", "float32"]
+
+# Fator de suavização da média móvel do RTF medido
+RTF_SMOOTHING = 0.3
+
+_profile = None
+_profile_lock = threading.Lock()
+
+
+def _profile_path():
+    return os.path.join(get_cache_dir("tuning"), "whisper_profile.json")
+
+
+def _cpu_flags():
+    """Lê as extensões de instrução da CPU (somente Linux; vazio nos demais sistemas)."""
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    return sorted(f for f in flags if f.startswith(("avx", "f16c", "fma", "sse4", "amx")))
+    except OSError:
+        pass
+    return []
+
+
+def _physical_cores():
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    except ImportError:
+        pass
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def _supported_compute_types(device):
+    try:
+        import ctranslate2
+        return set(ctranslate2.get_supported_compute_types(device))
+    except Exception as e:
+        logger.warning(f"[whisper_tuning] Não foi possível consultar os tipos suportados pelo CTranslate2 ({device}): {e}")
+        return {"float32"}
+
+
+def _host_signature():
+    try:
+        import ctranslate2
+        ct2_version = ctranslate2.__version__
+    except ImportError:
+        ct2_version = None
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "logical_cores": os.cpu_count(),
+        "ctranslate2": ct2_version,
+    }
+
+
+def _probe():
+    supported = {"cpu": sorted(_supported_compute_types("cpu"))}
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            supported["cuda"] = sorted(_supported_compute_types("cuda"))
+    except Exception:
+        pass
+    physical_cores = _physical_cores()
+    profile = {
+        "version": PROFILE_VERSION,
+        "host": _host_signature(),
+        "cpu_flags": _cpu_flags(),
+        "physical_cores": physical_cores,
+        "supported_compute_types": supported,
+        # Uma transcrição por vez usa todos os núcleos físicos; mais threads que isso só disputam cache
+        "cpu_threads": physical_cores,
+        "num_workers": 1,
+        "measurements": {},
+        "probed_at": time.time(),
+    }
+    logger.info(f"[whisper_tuning] Perfil detectado: {physical_cores} núcleos, tipos suportados={supported}, flags={profile['cpu_flags']}")
+    return profile
+
+
+def _save_profile(profile):
+    path = _profile_path()
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"[whisper_tuning] Não foi possível salvar o perfil de desempenho: {e}")
+
+
+def get_profile():
+    """
+    Retorna o perfil de desempenho da máquina, sondando o hardware apenas na primeira vez.
+    O perfil fica salvo em disco e é refeito se o hardware ou a versão do CTranslate2 mudarem.
+    """
+    global _profile
+    with _profile_lock:
+        if _profile is not None:
+            return _profile
+        path = _profile_path()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("version") == PROFILE_VERSION and stored.get("host") == _host_signature():
+                _profile = stored
+                return _profile
+        except (OSError, ValueError):
+            pass
+        _profile = _probe()
+        _save_profile(_profile)
+        return _profile
+
+
+def resolve_compute_type(compute_type, device):
+    """
+    Converte "auto" (ou None) no tipo mais rápido suportado pelo dispositivo.
+    Tipos escolhidos explicitamente pelo usuário são mantidos.
+    """
+    if compute_type not in (AUTO_COMPUTE_TYPE, None):
+        return compute_type
+    supported = set(get_profile()["supported_compute_types"].get(device, []))
+    preference = CUDA_COMPUTE_PREFERENCE if device == "cuda" else CPU_COMPUTE_PREFERENCE
+    chosen = next((ct for ct in preference if ct in supported), "float32")
+    logger.info(f"[whisper_tuning] compute_type automático para {device}: {chosen}")
+    return chosen
+
+
+def model_load_kwargs(device):
+    """Parâmetros de threads para o carregamento do WhisperModel no dispositivo."""
+    if device != "cpu":
+        return {}
+    profile = get_profile()
+    return {"cpu_threads": profile["cpu_threads"], "num_workers": profile["num_workers"]}
+
+
+def record_rtf(model_size, compute_type, device, audio_seconds, elapsed_seconds):
+    """Registra o fator de tempo real (tempo de processamento / duração do áudio) medido numa transcrição."""
+    if audio_seconds <= 0:
+        return
+    rtf = elapsed_seconds / audio_seconds
+    profile = get_profile()
+    with _profile_lock:
+        key = f"{device}/{model_size}/{compute_type}"
+        measurement = profile["measurements"].get(key)
+        if measurement is None:
+            measurement = {"rtf": rtf, "samples": 0}
+        else:
+            measurement["rtf"] = (1 - RTF_SMOOTHING) * measurement["rtf"] + RTF_SMOOTHING * rtf
+        measurement["samples"] += 1
+        measurement["last_rtf"] = rtf
+        profile["measurements"][key] = measurement
+        _save_profile(profile)
+    logger.info(f"[whisper_tuning] RTF medido para {key}: {rtf:.3f} (média {measurement['rtf']:.3f}, {measurement['samples']} amostras).")